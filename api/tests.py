@@ -0,0 +1,97 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from employees.models import Employee
+from enrollments.models import Enrollment
+from users.models import CustomUser
+from utils.testing import full_permissions_user, seed_sample_data
+
+
+class ResourceViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_sample_data(employees=7, groups=1, categories=2, students=3, enrollments=12)
+        cls.admin = full_permissions_user()
+        cls.employee = Employee.objects.filter(user__is_active=True).first()
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_sparse_fields_select_only_those_columns(self):
+        # Sesión, usuario, 2 de permisos, versiones de tabla (ETag) y filas
+        with self.assertNumQueries(6) as ctx:
+            response = self.client.get(reverse("api:employees"), {"fields": "reference,user__email"})
+        data = response.json()
+        self.assertEqual(set(data["results"][0]), {"id", "reference", "user__email"})
+        sql = ctx.captured_queries[-1]["sql"]
+        self.assertNotIn("address", sql)
+        self.assertIn('"employees_employee"."reference"', sql)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse("api:employees"), {"fields": "password"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_keyset_pagination_walks_every_row_once(self):
+        url, seen = reverse("api:enrollments") + "?limit=5&fields=reference", []
+        while url:
+            data = self.client.get(url).json()
+            seen += [row["id"] for row in data["results"]]
+            url = data["next"]
+        self.assertEqual(seen, list(Enrollment.objects.order_by("pk").values_list("pk", flat=True)))
+
+    def test_detail_field_types_are_serialized(self):
+        row = self.client.get(reverse("api:employees"), {"limit": 1}).json()["results"][0]
+        employee = Employee.objects.get(pk=row["id"])
+        self.assertEqual(row["birthdate"], employee.birthdate.isoformat())
+        self.assertEqual(row["picture"], employee.picture.url)
+        price = self.client.get(reverse("api:enrollments"), {"fields": "price"}).json()["results"][0]["price"]
+        self.assertIsInstance(price, str)
+
+    def test_conditional_get(self):
+        url = reverse("api:enrollments")
+        first = self.client.get(url)
+        # Enrollment no tiene versión de tabla: solo ETag
+        self.assertNotIn("Last-Modified", first)
+        response = self.client.get(url, headers={"if-none-match": first["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified_skips_the_rows_query(self):
+        url = reverse("api:employees") + "?fields=reference,user__email&limit=3"
+        first = self.client.get(url)
+        # Sesión, usuario, 2 de permisos y versiones de tabla
+        with self.assertNumQueries(5):
+            response = self.client.get(url, headers={"if-none-match": first["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], first["ETag"])
+        # Otra página u otros campos: otro ETag con las mismas versiones
+        self.assertNotEqual(self.client.get(url + "&after=1")["ETag"], first["ETag"])
+        self.assertNotEqual(self.client.get(url.replace("reference,", ""))["ETag"], first["ETag"])
+        # Un cambio en una tabla leída cambia el ETag
+        Employee.objects.filter(pk=self.employee.pk).archive()
+        self.assertEqual(self.client.get(url, headers={"if-none-match": first["ETag"]}).status_code, 200)
+
+    def test_last_modified_follows_related_tables(self):
+        url = reverse("api:employees") + "?fields=reference,user__email"
+        first = self.client.get(url)
+        response = self.client.get(url, headers={"if-modified-since": first["Last-Modified"]})
+        self.assertEqual(response.status_code, 304)
+        # Un cambio solo en users_customuser (desactivar en bloque) y un archivado cambian Last-Modified
+        for minutes, change in enumerate((
+            lambda: self.client.post(reverse("employees:list"), {"action": "deactivate", "selected": [self.employee.pk]}),
+            lambda: Employee.objects.filter(pk=self.employee.pk).archive(),
+        ), start=1):
+            with mock.patch("django.utils.timezone.now", return_value=timezone.now() + timedelta(minutes=minutes)):
+                change()
+            response = self.client.get(url, headers={"if-modified-since": first["Last-Modified"]})
+            self.assertEqual(response.status_code, 200)
+            first = response
+
+    def test_requires_permission(self):
+        self.client.force_login(CustomUser.objects.create_user(email="sin.permisos@aula.mx", password=None))
+        self.assertEqual(self.client.get(reverse("api:students")).status_code, 403)
+        self.assertFalse(Permission.objects.filter(user__email="sin.permisos@aula.mx").exists())
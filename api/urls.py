@@ -0,0 +1,17 @@
+from django.urls import path
+
+from employees.models import Employee
+from enrollments.models import Enrollment
+from modalities.models import Category, SubCategory
+from students.models import Student
+from .views import ResourceView
+
+app_name = "api"
+
+urlpatterns = [
+    path("employees/", ResourceView.as_view(model=Employee), name="employees"),
+    path("categories/", ResourceView.as_view(model=Category), name="categories"),
+    path("sub-categories/", ResourceView.as_view(model=SubCategory), name="sub_categories"),
+    path("students/", ResourceView.as_view(model=Student), name="students"),
+    path("enrollments/", ResourceView.as_view(model=Enrollment), name="enrollments"),
+]
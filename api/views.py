@@ -0,0 +1,149 @@
+import hashlib
+import json
+
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, urlencode
+from django.views import View
+
+from tracking.versions import TRACKED_MODELS, table_versions
+from utils.cache import model_label
+
+# Conversión a JSON por tipo de get_detail_fields; lo que no está se serializa tal cual
+CONVERTERS = {
+    "date": lambda value: value.isoformat(),
+    "datetime": lambda value: value.isoformat(),
+    "decimal": str,
+    "image": default_storage.url,
+}
+
+
+class ResourceView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """
+    Lista JSON de solo lectura de un modelo con detail_fields (utils.models.DetailFieldsMixin).
+    - ?fields=user__email,reference: solo esas columnas (values()); 'id' siempre va.
+    - ?after=<id>&limit=<n>: paginación por llave (id > after), sin OFFSET ni COUNT.
+    - ETag y Last-Modified de las versiones de tabla (tracking.versions) del modelo y de las
+      relaciones pedidas, más los parámetros: el 304 sale antes de consultar las filas.
+    - Con alguna tabla sin versión (Enrollment) solo ETag del cuerpo: el updated_at de las filas no
+      ve borrados, archivados ni cambios en tablas relacionadas.
+    """
+    model = None
+    permission_required = "auth.view_group"
+    raise_exception = True
+    default_limit = 50
+    max_limit = 500
+
+    def get_queryset(self):
+        qs = self.model._default_manager.all()
+        if hasattr(qs, "active"):
+            qs = qs.active()
+        # Sin Meta.ordering: el orden por id usa la llave primaria
+        return qs.order_by("pk")
+
+    def get_field_map(self):
+        """{nombre en la API: tipo}; el nombre es la ruta ORM de detail_fields."""
+        return {"id": "int", **{path: kind for _label, path, kind in self.model.detail_fields}}
+
+    def parse_params(self, params):
+        field_map = self.get_field_map()
+        fields = list(field_map)
+        if params.get("fields"):
+            requested = [name.strip() for name in params["fields"].split(",") if name.strip()]
+            unknown = [name for name in requested if name not in field_map]
+            if unknown:
+                raise ValueError(f"Campos desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(field_map)}")
+            fields = ["id"] + [name for name in requested if name != "id"]
+        try:
+            limit = min(self.max_limit, max(1, int(params.get("limit", self.default_limit))))
+            after = int(params["after"]) if params.get("after") else None
+        except ValueError:
+            raise ValueError("'limit' y 'after' deben ser enteros.")
+        return fields, after, limit
+
+    def get_version_labels(self, fields):
+        """Tablas que leen las columnas pedidas ('user__email' -> users.customuser)."""
+        labels = {model_label(self.model)}
+        for name in fields:
+            model = self.model
+            for relation in name.split("__")[:-1]:
+                model = model._meta.get_field(relation).related_model
+                labels.add(model_label(model))
+        return sorted(labels)
+
+    def get_versions(self, fields):
+        """{label: (versión, updated_at)} de las tablas leídas (una consulta); None si alguna no tiene versión."""
+        labels = self.get_version_labels(fields)
+        if not set(labels) <= set(TRACKED_MODELS):
+            return None
+        return table_versions(labels)
+
+    def get_etag(self, request, versions):
+        """Mismas versiones y misma URL (campos, after, limit): mismo cuerpo."""
+        key = [request.get_full_path(), sorted((label, version) for label, (version, _at) in versions.items())]
+        return '"%s"' % hashlib.md5(json.dumps(key).encode(), usedforsecurity=False).hexdigest()
+
+    def get_last_modified(self, versions):
+        timestamps = [updated_at for _version, updated_at in versions.values()]
+        return int(max(timestamps).timestamp()) if timestamps else None
+
+    def get_rows(self, fields, after, limit):
+        qs = self.get_queryset()
+        if after is not None:
+            qs = qs.filter(pk__gt=after)
+        # Una fila de más para saber si hay página siguiente
+        return list(qs.values(*fields)[:limit + 1])
+
+    def serialize(self, rows, fields):
+        field_map = self.get_field_map()
+        converters = [(name, CONVERTERS.get(field_map[name])) for name in fields]
+        results = []
+        for row in rows:
+            item = {}
+            for name, convert in converters:
+                value = row[name]
+                item[name] = convert(value) if convert and value not in (None, "") else value
+            results.append(item)
+        return results
+
+    def get(self, request, *args, **kwargs):
+        try:
+            fields, after, limit = self.parse_params(request.GET)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+        response = HttpResponse(content_type="application/json")
+        # El cliente debe revalidar siempre (If-None-Match); privado por ser autenticado
+        response["Cache-Control"] = "private, no-cache"
+        versions = self.get_versions(fields)
+        if versions is not None:
+            etag, last_modified = self.get_etag(request, versions), self.get_last_modified(versions)
+            self.set_validators(response, etag, last_modified)
+            conditional = get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+            if conditional is not response:
+                return conditional
+
+        rows = self.get_rows(fields, after, limit)
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            params = request.GET.copy()
+            params["after"] = rows[-1]["id"]
+            next_url = f"{request.path}?{urlencode(params, doseq=True)}"
+
+        response.content = json.dumps(
+            {"results": self.serialize(rows, fields), "next": next_url},
+            ensure_ascii=False, separators=(",", ":"),
+        )
+        if versions is not None:
+            return response
+        etag = '"%s"' % hashlib.md5(response.content, usedforsecurity=False).hexdigest()
+        self.set_validators(response, etag, None)
+        return get_conditional_response(request, etag=etag, response=response)
+
+    def set_validators(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
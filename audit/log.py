@@ -0,0 +1,181 @@
+# audit/log.py
+# Código en inglés; comentarios en español
+"""
+Captura de diferencias y escritura en lote de la bitácora.
+
+- snapshot()/diff(): valores por campo (texto) antes y después; los M2M como conjuntos.
+- record(): agrega el registro al buffer de la petición solo si la transacción confirma.
+- audit.middleware.AuditMiddleware vacía el buffer al terminar la petición con un bulk_create, o lo pasa
+  al hilo de fondo si AUDIT_FLUSH == "background" (perder el proceso pierde el buffer).
+"""
+import atexit
+import contextvars
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from utils.log import get_request_id
+
+logger = logging.getLogger(__name__)
+
+# Campos que no se auditan: ruido o datos sensibles
+IGNORED_FIELDS = {"last_login", "created_at", "updated_at"}
+MASKED_FIELDS = {"password"}
+MASK = "********"
+
+_buffer = contextvars.ContextVar("audit_buffer", default=None)
+
+
+# --- Diferencias ---
+def snapshot(instance, related=(), m2m=()):
+    """
+    {campo: texto} de los campos concretos; related ('user') con prefijo 'user.';
+    m2m ('permissions') como lista ordenada de 'app.codename' o pks.
+    """
+    data = {}
+    for field in instance._meta.concrete_fields:
+        if field.primary_key or field.name in IGNORED_FIELDS:
+            continue
+        data[field.name] = field.value_to_string(instance)
+    for name in related:
+        obj = getattr(instance, name, None)
+        if obj is not None:
+            data.update({f"{name}.{key}": value for key, value in snapshot(obj).items()})
+    for name in m2m:
+        data[name] = sorted(m2m_keys(getattr(instance, name).all()))
+    return data
+
+
+def m2m_keys(queryset):
+    if queryset.model._meta.label == "auth.Permission":
+        return [f"{app}.{codename}" for app, codename in queryset.values_list("content_type__app_label", "codename")]
+    return [str(pk) for pk in queryset.values_list("pk", flat=True)]
+
+
+def diff(before, after):
+    """{campo: [antes, después]}; listas como {'added': [...], 'removed': [...]}."""
+    changes = {}
+    for key in sorted(set(before) | set(after)):
+        old, new = before.get(key), after.get(key)
+        if old == new:
+            continue
+        if isinstance(old, list) or isinstance(new, list):
+            old_set, new_set = set(old or []), set(new or [])
+            # [] frente a un valor ausente (p. ej. al borrar) no es un cambio
+            if old_set != new_set:
+                changes[key] = {"added": sorted(new_set - old_set), "removed": sorted(old_set - new_set)}
+        elif key.rpartition(".")[2] in MASKED_FIELDS:
+            changes[key] = [MASK, MASK]
+        else:
+            changes[key] = [old, new]
+    return changes
+
+
+# --- Registro ---
+def record(request, action, instance=None, model=None, changes=None, object_pk="", object_repr=""):
+    """Encola un registro; se descarta si la transacción actual hace rollback."""
+    from .models import AuditEntry
+
+    model = model or type(instance)
+    user = getattr(request, "user", None)
+    entry = AuditEntry(
+        actor_id=user.pk if user is not None and user.is_authenticated else None,
+        actor_email=getattr(user, "email", "") or "",
+        request_id=get_request_id() or "",
+        action=action,
+        model_label=model._meta.label_lower,
+        object_pk=str(instance.pk) if instance is not None else object_pk,
+        object_repr=(str(instance) if instance is not None else object_repr)[:200],
+        changes=changes or {},
+    )
+    transaction.on_commit(lambda: enqueue([entry]))
+    return entry
+
+
+def enqueue(entries):
+    """Al buffer de la petición; fuera de una petición (comandos, shell) se escribe en el momento."""
+    buffer = _buffer.get()
+    if buffer is not None:
+        buffer.extend(entries)
+    elif getattr(settings, "AUDIT_FLUSH", "request") == "background":
+        flusher.put_many(entries)
+    else:
+        safe_write(entries)
+
+
+def start_buffer():
+    """Buffer de la petición actual; devuelve (lista, token para end_buffer)."""
+    entries = []
+    return entries, _buffer.set(entries)
+
+
+def end_buffer(entries, token):
+    """Cierra el buffer y escribe lo acumulado (o lo pasa al hilo de fondo)."""
+    _buffer.reset(token)
+    if entries:
+        enqueue(entries)
+
+
+def safe_write(entries):
+    try:
+        write(entries)
+    except Exception:
+        # La bitácora nunca debe tumbar la respuesta ya generada
+        logger.exception("No se pudo escribir la bitácora (%s registros)", len(entries))
+
+
+def write(entries):
+    from .models import AuditEntry
+
+    if entries:
+        AuditEntry.objects.bulk_create(entries, batch_size=500)
+
+
+class BackgroundFlusher:
+    """Hilo que escribe la bitácora cada AUDIT_FLUSH_INTERVAL segundos o al juntar batch_size."""
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        self.pending = []
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.pid = None
+
+    def put(self, entry):
+        self.put_many([entry])
+
+    def put_many(self, entries):
+        with self.lock:
+            self.pending.extend(entries)
+            size = len(self.pending)
+        self._ensure_thread()
+        if size >= self.batch_size:
+            self.wake.set()
+
+    def flush(self):
+        with self.lock:
+            entries, self.pending = self.pending, []
+        safe_write(entries)
+
+    def _ensure_thread(self):
+        # Tras un fork (gunicorn --preload) el hilo no existe en el hijo
+        if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+            self.pid = os.getpid()
+            self.thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        interval = getattr(settings, "AUDIT_FLUSH_INTERVAL", 2.0)
+        while True:
+            self.wake.wait(interval)
+            self.wake.clear()
+            self.flush()
+            close_old_connections()
+
+
+flusher = BackgroundFlusher()
+atexit.register(flusher.flush)
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from audit import partitions
+from audit.models import AuditEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Retención de la bitácora: en PostgreSQL crea las particiones de los próximos meses y "
+        "borra con DROP los meses vencidos; en otros motores DELETE por lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None,
+                            help="Días a conservar (por defecto AUDIT_RETENTION_DAYS).")
+        parser.add_argument("--months-ahead", type=int, default=3, help="Particiones futuras a crear.")
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else settings.AUDIT_RETENTION_DAYS
+        if days < 1:
+            raise CommandError("--days debe ser mayor que 0.")
+        now = timezone.now()
+        cutoff = now - timedelta(days=days)
+
+        if partitions.is_partitioned(connection):
+            with transaction.atomic():
+                created = partitions.ensure_partitions(connection, now.date(), options["months_ahead"])
+                # Solo meses completos antes del corte; el resto se borra fila por fila abajo
+                dropped = partitions.drop_partitions_before(connection, partitions.month_start(cutoff.date()))
+            for name in created:
+                self.stdout.write(f"Creada {name}")
+            for name in dropped:
+                self.stdout.write(f"Eliminada {name}")
+
+        deleted = self.delete_before(cutoff, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} registro(s) anteriores a {cutoff:%Y-%m-%d} eliminados."))
+
+    def delete_before(self, cutoff, batch_size):
+        """DELETE por lotes de id para no bloquear la tabla en una sola transacción larga."""
+        total = 0
+        while True:
+            ids = list(
+                AuditEntry.objects.filter(created_at__lt=cutoff).order_by().values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return total
+            total += AuditEntry.objects.filter(pk__in=ids).delete()[0]
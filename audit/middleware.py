@@ -0,0 +1,33 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .log import end_buffer, enqueue, start_buffer
+
+
+class AuditMiddleware:
+    """Un buffer de bitácora por petición; se escribe al final con un solo INSERT (o en segundo plano)."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        entries, token = start_buffer()
+        try:
+            return self.get_response(request)
+        finally:
+            end_buffer(entries, token)
+
+    async def __acall__(self, request):
+        entries, token = start_buffer()
+        try:
+            return await self.get_response(request)
+        finally:
+            # El token se restablece en este contexto; el INSERT va a un hilo
+            end_buffer([], token)
+            if entries:
+                await sync_to_async(enqueue)(entries)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 11:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha')),
+                ('actor_id', models.BigIntegerField(null=True, verbose_name='Usuario')),
+                ('actor_email', models.CharField(blank=True, max_length=255, verbose_name='Correo del usuario')),
+                ('request_id', models.CharField(blank=True, max_length=64)),
+                ('action', models.CharField(choices=[('create', 'Alta'), ('update', 'Cambio'), ('delete', 'Baja'), ('archive', 'Archivado'), ('permissions', 'Permisos'), ('bulk', 'Acción masiva')], max_length=20, verbose_name='Acción')),
+                ('model_label', models.CharField(max_length=100, verbose_name='Modelo')),
+                ('object_pk', models.CharField(blank=True, max_length=64)),
+                ('object_repr', models.CharField(blank=True, max_length=200, verbose_name='Objeto')),
+                ('changes', models.JSONField(default=dict, verbose_name='Cambios')),
+            ],
+            options={
+                'verbose_name': 'Registro de auditoría',
+                'verbose_name_plural': 'Bitácora de cambios',
+                'indexes': [models.Index(fields=['created_at'], name='audit_created_idx'), models.Index(fields=['model_label', 'object_pk'], name='audit_object_idx')],
+            },
+        ),
+    ]
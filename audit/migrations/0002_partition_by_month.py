@@ -0,0 +1,15 @@
+from django.db import migrations
+
+from audit.partitions import partition_table, unpartition_table
+
+
+class Migration(migrations.Migration):
+    """Tabla de bitácora particionada por mes en PostgreSQL; en otros motores no hace nada."""
+
+    dependencies = [
+        ('audit', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_table, unpartition_table),
+    ]
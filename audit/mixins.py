@@ -0,0 +1,42 @@
+from . import log
+from .models import AuditEntry
+
+
+class AuditMixin:
+    """
+    Audita altas y cambios hechos por la vista (CreateMixin/UpdateMixin).
+    - El 'antes' se toma al obtener el objeto en el POST, antes de que el form lo modifique.
+    - El 'después' se toma tras un POST exitoso (redirección), incluyendo lo que la vista
+      haga después de form_valid (p. ej. permissions.set en grupos).
+    - audit_related: FKs cuyos campos también se comparan ('user'); audit_m2m: conjuntos.
+    """
+    audit_related = ()
+    audit_m2m = ()
+
+    def get_object(self, queryset=None):
+        obj = super().get_object(queryset)
+        if self.request.method == "POST" and not hasattr(self, "_audit_before"):
+            self._audit_before = self.audit_snapshot(obj)
+        return obj
+
+    def audit_snapshot(self, obj):
+        return log.snapshot(obj, self.audit_related, self.audit_m2m)
+
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        if response.status_code in (301, 302, 303) and getattr(self, "object", None) is not None:
+            before = getattr(self, "_audit_before", None)
+            action = AuditEntry.CREATE if before is None else AuditEntry.UPDATE
+            changes = log.diff(before or {}, self.audit_snapshot(self.object))
+            if changes:
+                log.record(request, action, self.object, changes=changes)
+        return response
+
+    def audit(self, action, obj=None, changes=None):
+        """Para vistas con post propio (borrado/archivado, permisos)."""
+        obj = obj or self.object
+        if changes is None:
+            before = getattr(self, "_audit_before", None) or self.audit_snapshot(obj)
+            after = {} if action == AuditEntry.DELETE else self.audit_snapshot(obj)
+            changes = log.diff(before, after)
+        log.record(self.request, action, obj, changes=changes)
@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+
+
+class AuditEntry(models.Model):
+    """
+    Registro de solo inserción de quién cambió qué.
+    En PostgreSQL la tabla está particionada por mes (created_at); ver audit.partitions.
+    Sin FKs: el registro sobrevive al borrado del usuario o del objeto.
+    """
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    ARCHIVE = "archive"
+    PERMISSIONS = "permissions"
+    BULK = "bulk"
+    ACTION_CHOICES = [
+        (CREATE, "Alta"),
+        (UPDATE, "Cambio"),
+        (DELETE, "Baja"),
+        (ARCHIVE, "Archivado"),
+        (PERMISSIONS, "Permisos"),
+        (BULK, "Acción masiva"),
+    ]
+
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha")
+    actor_id = models.BigIntegerField(null=True, verbose_name="Usuario")
+    actor_email = models.CharField(max_length=255, blank=True, verbose_name="Correo del usuario")
+    request_id = models.CharField(max_length=64, blank=True)
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, verbose_name="Acción")
+    model_label = models.CharField(max_length=100, verbose_name="Modelo")
+    object_pk = models.CharField(max_length=64, blank=True)
+    object_repr = models.CharField(max_length=200, blank=True, verbose_name="Objeto")
+    changes = models.JSONField(default=dict, verbose_name="Cambios")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="audit_created_idx"),
+            models.Index(fields=["model_label", "object_pk"], name="audit_object_idx"),
+        ]
+        verbose_name = "Registro de auditoría"
+        verbose_name_plural = "Bitácora de cambios"
+
+    def __str__(self):
+        return f"{self.created_at:%Y-%m-%d %H:%M} {self.actor_email} {self.action} {self.model_label}:{self.object_pk}"
@@ -0,0 +1,146 @@
+"""
+Particiones mensuales de audit_auditentry (solo PostgreSQL).
+- Tabla padre PARTITION BY RANGE (created_at); una partición por mes 'audit_auditentry_pYYYYMM'
+  y una DEFAULT para lo que caiga fuera (p. ej. si prune_audit_log dejó de correr varios meses).
+- Crear un mes que ya tiene filas en la DEFAULT fallaría ("updated partition constraint for default
+  partition would be violated"): ensure_partitions() las mueve a su partición nueva.
+- La retención borra meses completos con DROP (sin VACUUM ni bloat), ver prune_audit_log.
+"""
+from datetime import date
+
+TABLE = "audit_auditentry"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def partition_sql(month):
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+def is_partitioned(connection):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [TABLE])
+        return cursor.fetchone() is not None
+
+
+def list_partitions(connection):
+    """{primer día del mes: nombre} de las particiones mensuales existentes."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    prefix = f"{TABLE}_p"
+    return {
+        date(int(name[-6:-2]), int(name[-2:]), 1): name
+        for name in names if name.startswith(prefix) and name[len(prefix):].isdigit()
+    }
+
+
+def default_months(connection):
+    """Meses que tienen filas en la partición DEFAULT."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT DISTINCT date_trunc('month', created_at)::date FROM {DEFAULT_PARTITION}")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def move_out_of_default_sql(month):
+    """Crea la partición de 'month' con la DEFAULT separada y le pasa las filas de ese mes."""
+    rows = f"created_at >= '{month:%Y-%m-%d}' AND created_at < '{add_months(month, 1):%Y-%m-%d}'"
+    return [
+        f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}",
+        partition_sql(month),
+        f"INSERT INTO {TABLE} SELECT * FROM {DEFAULT_PARTITION} WHERE {rows}",
+        f"DELETE FROM {DEFAULT_PARTITION} WHERE {rows}",
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+    ]
+
+
+def ensure_partitions(connection, today, months_ahead=3):
+    """
+    Crea las particiones del mes actual, los siguientes y los meses con filas en la DEFAULT
+    (así la retención también puede borrarlos con DROP); devuelve los nombres creados.
+    """
+    existing = list_partitions(connection)
+    stranded = default_months(connection)
+    months = {add_months(month_start(today), offset) for offset in range(months_ahead + 1)} | stranded
+    created = []
+    with connection.cursor() as cursor:
+        for month in sorted(months - existing.keys()):
+            for sql in move_out_of_default_sql(month) if month in stranded else [partition_sql(month)]:
+                cursor.execute(sql)
+            created.append(partition_name(month))
+    return created
+
+
+def drop_partitions_before(connection, cutoff):
+    """DETACH + DROP de los meses que terminan antes de cutoff; devuelve los nombres borrados."""
+    dropped = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(list_partitions(connection).items()):
+            if add_months(month, 1) <= cutoff:
+                cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+                cursor.execute(f"DROP TABLE {name}")
+                dropped.append(name)
+    return dropped
+
+
+def partition_table(apps, schema_editor):
+    """Convierte la tabla creada por 0001 en particionada (la bitácora está vacía al migrar)."""
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql" or is_partitioned(connection):
+        return
+    from django.utils import timezone
+
+    old = f"{TABLE}_old"
+    statements = [
+        f"ALTER TABLE {TABLE} RENAME TO {old}",
+        f"CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS INCLUDING IDENTITY) PARTITION BY RANGE (created_at)",
+        f"INSERT INTO {TABLE} SELECT * FROM {old}",
+        f"DROP TABLE {old}",
+        # En tablas particionadas la llave primaria debe incluir la columna de partición
+        f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at)",
+        f'CREATE INDEX audit_created_idx ON {TABLE} ("created_at")',
+        f'CREATE INDEX audit_object_idx ON {TABLE} ("model_label", "object_pk")',
+        f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT",
+    ]
+    for sql in statements:
+        schema_editor.execute(sql)
+    ensure_partitions(connection, timezone.now().date())
+
+
+def unpartition_table(apps, schema_editor):
+    connection = schema_editor.connection
+    if not is_partitioned(connection):
+        return
+    old = f"{TABLE}_old"
+    statements = [
+        f"ALTER TABLE {TABLE} RENAME TO {old}",
+        f"CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS INCLUDING IDENTITY)",
+        f"INSERT INTO {TABLE} SELECT * FROM {old}",
+        f"DROP TABLE {old} CASCADE",
+        f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id)",
+        f'CREATE INDEX audit_created_idx ON {TABLE} ("created_at")',
+        f'CREATE INDEX audit_object_idx ON {TABLE} ("model_label", "object_pk")',
+    ]
+    for sql in statements:
+        schema_editor.execute(sql)
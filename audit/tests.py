@@ -0,0 +1,149 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from modalities.models import Category
+from users.views import filtered_permissions_qs
+from utils.testing import full_permissions_user, postgres_only
+
+from . import partitions
+from .log import diff, record
+from .middleware import AuditMiddleware
+from .models import AuditEntry
+
+
+class AuditLogTests(TestCase):
+    """TestCase nunca confirma la transacción: captureOnCommitCallbacks ejecuta los on_commit."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = full_permissions_user()
+        cls.category = Category.objects.create(name="Música", is_active=True)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def post(self, url, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, data)
+
+    def test_update_records_field_diff(self):
+        url = reverse("modalities:category_update", args=[self.category.pk])
+        self.post(url, {"name": "Música clásica", "is_active": "on"})
+        entry = AuditEntry.objects.get()
+        self.assertEqual(entry.action, AuditEntry.UPDATE)
+        self.assertEqual(entry.model_label, "modalities.category")
+        self.assertEqual(entry.object_pk, str(self.category.pk))
+        self.assertEqual(entry.actor_id, self.admin.pk)
+        self.assertEqual(entry.changes, {"name": ["Música", "Música clásica"]})
+
+    def test_unchanged_update_records_nothing(self):
+        url = reverse("modalities:category_update", args=[self.category.pk])
+        self.post(url, {"name": "Música", "is_active": "on"})
+        self.assertFalse(AuditEntry.objects.exists())
+
+    def test_group_permissions_record_added_and_removed(self):
+        first, second = filtered_permissions_qs()[:2]
+        group = Group.objects.create(name="Recepción")
+        group.permissions.set([first])
+        self.post(reverse("users:group_update", args=[group.pk]), {"name": "Recepción", "permissions": [second.pk]})
+        changes = AuditEntry.objects.get().changes["permissions"]
+        key = lambda perm: f"{perm.content_type.app_label}.{perm.codename}"
+        self.assertEqual(changes, {"added": [key(second)], "removed": [key(first)]})
+
+    def test_bulk_action_is_recorded(self):
+        pks = [Category.objects.create(name=f"Danza {i}", is_active=True).pk for i in range(3)]
+        self.post(reverse("modalities:category_list"), {"action": "archive", "selected": pks})
+        entry = AuditEntry.objects.get()
+        self.assertEqual(entry.action, AuditEntry.BULK)
+        self.assertEqual(entry.changes["count"], 3)
+
+    def test_entries_are_written_in_one_insert_at_request_end(self):
+        request = RequestFactory().post("/")
+        request.user = self.admin
+
+        def view(request):
+            # Los on_commit corren dentro de la petición, como con autocommit
+            with self.captureOnCommitCallbacks(execute=True):
+                for _ in range(3):
+                    record(request, AuditEntry.UPDATE, self.category, changes={"name": ["a", "b"]})
+            # Confirmados pero aún en el buffer
+            self.assertFalse(AuditEntry.objects.exists())
+            return HttpResponse()
+
+        with CaptureQueriesContext(connection) as ctx:
+            AuditMiddleware(view)(request)
+        inserts = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "audit_auditentry"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AuditEntry.objects.count(), 3)
+
+    def test_archive_is_recorded(self):
+        self.post(reverse("modalities:category_delete", args=[self.category.pk]), {})
+        entry = AuditEntry.objects.get()
+        self.assertEqual(entry.action, AuditEntry.ARCHIVE)
+        self.assertIn("archived_at", entry.changes)
+
+    def test_rolled_back_change_is_not_recorded(self):
+        request = RequestFactory().post("/")
+        request.user = self.admin
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                record(request, AuditEntry.UPDATE, self.category, changes={"name": ["Música", "Teatro"]})
+                raise RuntimeError
+            # Control: lo confirmado sí se escribe
+            record(request, AuditEntry.UPDATE, self.category, changes={"name": ["Música", "Jazz"]})
+        self.assertEqual(list(AuditEntry.objects.values_list("changes", flat=True)), [{"name": ["Música", "Jazz"]}])
+
+    def test_group_delete_keeps_pk(self):
+        group = Group.objects.create(name="Recepción")
+        self.post(reverse("users:group_delete", args=[group.pk]), {})
+        entry = AuditEntry.objects.get()
+        self.assertEqual((entry.action, entry.object_pk), (AuditEntry.DELETE, str(group.pk)))
+        # Grupo sin permisos: [] frente a nada no es un cambio
+        self.assertEqual(entry.changes, {"name": ["Recepción", None]})
+
+    def test_password_is_masked(self):
+        changes = diff({"user.password": "a", "name": "x"}, {"user.password": "b", "name": "x"})
+        self.assertEqual(changes, {"user.password": ["********", "********"]})
+
+
+class PruneAuditLogTests(TestCase):
+    def test_deletes_entries_older_than_retention(self):
+        now = timezone.now()
+        AuditEntry.objects.bulk_create([
+            AuditEntry(created_at=now - timedelta(days=400), action=AuditEntry.UPDATE, model_label="a.b"),
+            AuditEntry(created_at=now - timedelta(days=10), action=AuditEntry.UPDATE, model_label="a.b"),
+        ])
+        call_command("prune_audit_log", days=365, stdout=StringIO())
+        self.assertEqual(AuditEntry.objects.count(), 1)
+
+    @postgres_only
+    def test_months_in_default_partition_get_their_own(self):
+        # prune_audit_log sin correr: un mes futuro y uno vencido cayeron en la DEFAULT
+        now = timezone.now()
+        later = now + timedelta(days=200)
+        old = now - timedelta(days=500)
+        AuditEntry.objects.bulk_create([
+            AuditEntry(created_at=later, action=AuditEntry.UPDATE, model_label="a.b"),
+            AuditEntry(created_at=old, action=AuditEntry.UPDATE, model_label="a.b"),
+        ])
+        self.assertEqual(partitions.default_months(connection), {
+            partitions.month_start(later.date()), partitions.month_start(old.date()),
+        })
+        call_command("prune_audit_log", days=365, months_ahead=3, stdout=StringIO())
+        self.assertEqual(partitions.default_months(connection), set())
+        existing = partitions.list_partitions(connection)
+        self.assertIn(partitions.month_start(later.date()), existing)
+        # El mes vencido se creó para sacarlo de la DEFAULT y la retención lo borró con DROP
+        self.assertNotIn(partitions.month_start(old.date()), existing)
+        self.assertEqual(list(AuditEntry.objects.values_list("created_at", flat=True)), [later])
+        # Las siguientes corridas ya no fallan al crear meses nuevos
+        call_command("prune_audit_log", days=365, months_ahead=8, stdout=StringIO())
@@ -0,0 +1,5 @@
+"""
+Benchmarks locales del proyecto.
+Se ejecutan como módulos desde la raíz: python -m benchmarks.<nombre> [--opciones]
+Requieren las mismas variables de entorno que manage.py (DJANGO_SECRET_KEY, ...).
+"""
@@ -0,0 +1,75 @@
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django(settings_module="config.settings"):
+    """Inicializa Django para scripts fuera de manage.py."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Crea la base de datos de tests (nunca toca la real) y la destruye al salir.
+    Con DJANGO_TEST_DB=sqlite es una base en memoria.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def percentiles(samples):
+    """Resumen en milisegundos (mean, p50, p95, p99, max) de una lista de segundos."""
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+
+    def pick(p):
+        idx = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[idx] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean": statistics.fmean(ordered) * 1000,
+        "p50": pick(50),
+        "p95": pick(95),
+        "p99": pick(99),
+        "max": ordered[-1] * 1000,
+    }
+
+
+@contextmanager
+def timer(samples):
+    """Agrega a 'samples' la duración del bloque (segundos)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - start)
+
+
+def print_table(title, rows):
+    """Imprime filas {'name': ..., métricas...} alineadas."""
+    print(f"\n== {title}")
+    if not rows:
+        return
+    keys = [k for k in rows[0] if k != "name"]
+    width = max(len(str(r["name"])) for r in rows)
+    print(" " * width + "  " + "  ".join(f"{k:>10}" for k in keys))
+    for row in rows:
+        cells = []
+        for k in keys:
+            value = row.get(k, "")
+            cells.append(f"{value:>10.3f}" if isinstance(value, float) else f"{value!s:>10}")
+        print(f"{row['name']:<{width}}  " + "  ".join(cells))
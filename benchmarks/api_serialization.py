@@ -0,0 +1,77 @@
+"""
+Throughput de serialización de la API JSON contra un model_to_dict ingenuo.
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.api_serialization --rows 5000 --limit 500 --repeat 20
+
+Usa la base de datos de tests (se crea y destruye). Compara, por página de 'limit' filas:
+- naive: objetos completos + model_to_dict + json.dumps(default=str) (FKs solo como id)
+- api: ResourceView (values() con todas las columnas de detail_fields)
+- api (fields=2): la misma vista con selección dispersa de dos columnas
+"""
+import argparse
+import io
+import json
+
+from benchmarks._common import percentiles, print_table, setup_django, test_database, timer
+
+
+def naive_page(model, limit):
+    from django.forms.models import model_to_dict
+
+    objects = model._default_manager.order_by("pk")[:limit]
+    return json.dumps([model_to_dict(obj) for obj in objects], default=str)
+
+
+def api_page(model, fields, limit, **view_kwargs):
+    from api.views import ResourceView
+
+    view = ResourceView(model=model, **view_kwargs)
+    rows = view.get_rows(fields, None, limit)
+    return json.dumps(view.serialize(rows, fields), ensure_ascii=False, separators=(",", ":"))
+
+
+def measure(label, func, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    samples = []
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(repeat):
+            with timer(samples):
+                size = len(func())
+    return {"name": label, **percentiles(samples), "queries": len(ctx.captured_queries) // repeat, "kB": size / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="inscripciones generadas")
+    parser.add_argument("--limit", type=int, default=500, help="filas por página")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from employees.models import Employee
+    from enrollments.models import Enrollment
+
+    with test_database():
+        call_command(
+            "generate_data", employees=args.limit, students=args.limit, categories=10, sub_per_category=3,
+            enrollments=args.rows, admin_email="", verbosity=0, stdout=io.StringIO(),
+        )
+        rows = []
+        for model, kwargs, sparse in (
+            (Employee, {}, ["id", "reference", "user__email"]),
+            (Enrollment, {"last_modified_field": "created_at"}, ["id", "reference", "price"]),
+        ):
+            name = model._meta.model_name
+            all_fields = ["id"] + [path for _label, path, _kind in model.detail_fields]
+            rows.append(measure(f"{name} naive", lambda: naive_page(model, args.limit), args.repeat))
+            rows.append(measure(f"{name} api", lambda: api_page(model, all_fields, args.limit, **kwargs), args.repeat))
+            rows.append(measure(f"{name} api (fields=2)",
+                                lambda: api_page(model, sparse, args.limit, **kwargs), args.repeat))
+        print_table(f"{args.limit} filas por página, {args.repeat} repeticiones (ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
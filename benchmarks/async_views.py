@@ -0,0 +1,154 @@
+"""
+Lista de empleados con una base de datos lenta: WSGI con un número fijo de hilos (gunicorn gthread)
+vs ASGI (uvicorn) con las vistas asíncronas de settings.ASYNC_VIEWS.
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.async_views --latency 20 --clients 64 --threads 8 --requests 640
+
+--latency agrega esos milisegundos a cada consulta (red/servidor de BD ocupado) sin usar CPU.
+WSGI: --clients hilos cliente compiten por --threads hilos de servidor (un semáforo), cada uno
+bloqueado durante sus consultas. ASGI: un solo event loop (config.asgi.application, el mismo
+handler que corre uvicorn) atiende a todos los clientes; cada petición espera sus consultas en
+su propio hilo de sync_to_async. Usa la base de datos de tests.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from benchmarks._common import percentiles, print_table, setup_django, test_database, timer
+
+# URLconf del benchmark (ROOT_URLCONF="benchmarks.async_views"); las rutas las fija main()
+urlpatterns = []
+
+
+def slow_queries(latency):
+    """Cada consulta tarda 'latency' segundos más (time.sleep libera el GIL, como esperar la red)."""
+    from django.db.backends.utils import CursorWrapper
+
+    execute = CursorWrapper._execute
+
+    def _execute(self, *args, **kwargs):
+        time.sleep(latency)
+        return execute(self, *args, **kwargs)
+
+    return mock.patch.object(CursorWrapper, "_execute", _execute)
+
+
+def run_wsgi(user, path, requests, clients, threads):
+    from django.db import connection
+    from django.test import Client
+
+    # Sesiones creadas antes de los hilos: SQLite en memoria no admite escrituras concurrentes
+    sessions = [Client() for _ in range(clients)]
+    for client in sessions:
+        client.force_login(user)
+    server = threading.Semaphore(threads)
+
+    def worker(offset):
+        samples = []
+        try:
+            for _ in range(offset, requests, clients):
+                with timer(samples):
+                    with server:
+                        response = sessions[offset].get(path)
+                assert response.status_code == 200, response.status_code
+        finally:
+            connection.close()
+        return samples
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(worker, range(clients)))
+    elapsed = time.perf_counter() - start
+    return {**percentiles([s for chunk in results for s in chunk]), "pet/s": requests / elapsed}
+
+
+async def asgi_get(application, path, cookie):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 50000), "server": ("localhost", 80),
+    }
+    pending = [{"type": "http.request", "body": b"", "more_body": False}]
+    status = []
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # Sin desconexión del cliente: Django cancela esta espera al terminar la respuesta
+        await asyncio.Future()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+def run_asgi(user, path, requests, clients):
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+    from django.test import Client
+
+    client = Client()
+    client.force_login(user)
+    cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+    application = get_asgi_application()
+    samples = []
+
+    async def worker(offset):
+        for _ in range(offset, requests, clients):
+            with timer(samples):
+                status = await asgi_get(application, path, cookie)
+            assert status == 200, status
+
+    async def main():
+        await asyncio.gather(*(worker(offset) for offset in range(clients)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    return {**percentiles(samples), "pet/s": requests / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=20, help="ms agregados a cada consulta")
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=8, help="hilos de servidor WSGI")
+    parser.add_argument("--requests", type=int, default=640)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+    from django.urls import include, path
+
+    from employees.views import EmployeeAsyncListView, EmployeeListView
+    from utils.testing import full_permissions_user, seed_sample_data
+
+    with test_database():
+        seed_sample_data(employees=60, groups=3, categories=2, students=5, enrollments=20)
+        user = full_permissions_user("bench-async@example.com")
+        urlpatterns[:] = [
+            path("sync/", EmployeeListView.as_view()),
+            path("async/", EmployeeAsyncListView.as_view()),
+            path("", include("config.urls")),
+        ]
+        rows = []
+        with override_settings(ROOT_URLCONF=__name__, ALLOWED_HOSTS=["*"], DEBUG=False), \
+                slow_queries(args.latency / 1000):
+            rows.append({"name": f"WSGI, {args.threads} hilos",
+                         **run_wsgi(user, "/sync/", args.requests, args.clients, args.threads)})
+            rows.append({"name": f"WSGI, {args.clients} hilos",
+                         **run_wsgi(user, "/sync/", args.requests, args.clients, args.clients)})
+            rows.append({"name": "ASGI, vistas asíncronas",
+                         **run_asgi(user, "/async/", args.requests, args.clients)})
+    print_table(f"{args.requests} peticiones, {args.clients} clientes, +{args.latency:g} ms por consulta (ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
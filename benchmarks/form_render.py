@@ -0,0 +1,83 @@
+"""
+Render de formularios con cientos de grupos y categorías: ModelChoiceField vs CachedModelChoiceField.
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.form_render --groups 500 --categories 500 --renders 300
+
+Usa la base de datos de tests (se crea y destruye). Mide el render completo del <select>
+y las consultas por render; con caché solo el primer render consulta la BD.
+"""
+import argparse
+
+from benchmarks._common import percentiles, print_table, setup_django, test_database, timer
+
+
+def seed(groups, categories):
+    from django.contrib.auth.models import Group
+    from modalities.models import Category
+    from utils.testing import CATEGORY_NAMES
+
+    Group.objects.bulk_create([Group(name=f"Grupo {CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i}") for i in range(groups)])
+    Category.objects.bulk_create([
+        Category(name=f"{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i}", is_active=i % 5 != 0) for i in range(categories)
+    ])
+
+
+def uncached_forms():
+    """Mismos forms con ModelChoiceField normal (comportamiento anterior)."""
+    from django import forms
+    from django.contrib.auth.models import Group
+    from employees.forms import EmployeeCreationForm
+    from modalities.forms import SubCategoryForm
+
+    class PlainEmployeeForm(EmployeeCreationForm):
+        group = forms.ModelChoiceField(queryset=Group.objects.order_by("name"),
+                                       widget=forms.Select(attrs={"class": "form-control"}))
+
+    class PlainSubCategoryForm(SubCategoryForm):
+        class Meta(SubCategoryForm.Meta):
+            field_classes = {"category": forms.ModelChoiceField}
+
+    return {"group": PlainEmployeeForm, "category": PlainSubCategoryForm}
+
+
+def cached_forms():
+    from employees.forms import EmployeeCreationForm
+    from modalities.forms import SubCategoryForm
+
+    return {"group": EmployeeCreationForm, "category": SubCategoryForm}
+
+
+def run(form_class, field, renders):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    samples = []
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(renders):
+            with timer(samples):
+                str(form_class()[field])
+    return {**percentiles(samples), "queries": len(ctx.captured_queries)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=500)
+    parser.add_argument("--categories", type=int, default=500)
+    parser.add_argument("--renders", type=int, default=300)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+
+    with test_database():
+        seed(args.groups, args.categories)
+        rows = []
+        for variant, forms_by_field in (("sin caché", uncached_forms()), ("con caché", cached_forms())):
+            cache.clear()
+            for field, form_class in forms_by_field.items():
+                rows.append({"name": f"{field} ({variant})", **run(form_class, field, args.renders)})
+        print_table(f"{args.groups} grupos, {args.categories} categorías, {args.renders} renders (ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Dashboards abiertos con contadores en vivo (enrollments.live, /dashboard/events/) vs recargar el dashboard.
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.live_dashboard --clients 1000 --events 20
+
+Abre --clients streams SSE contra config.asgi.application en un solo event loop (como un worker
+de uvicorn) y publica --events deltas: reporta cuánto tarda cada delta en llegar a todos,
+la memoria de Python por dashboard abierto y las consultas SQL. Como referencia, el mismo número
+de clientes recargando el dashboard una vez (cada recarga repite los agregados).
+Con SQLite se publica desde el proceso (broadcaster.publish); en PostgreSQL el reparto es el mismo,
+lo que cambia es que el delta llega por el LISTEN del worker.
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+from unittest import mock
+
+from benchmarks._common import percentiles, print_table, setup_django, test_database
+from benchmarks.async_views import asgi_get
+
+
+class SSEClient:
+    """Un EventSource: guarda cuándo llega cada evento."""
+
+    def __init__(self, application, cookie):
+        self.application = application
+        self.cookie = cookie
+        self.events = []
+        self.arrived = asyncio.Event()
+        self.disconnect = asyncio.get_running_loop().create_future()
+
+    async def run(self):
+        path = "/dashboard/events/"
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(b"host", b"localhost"), (b"cookie", self.cookie.encode()), (b"accept", b"text/event-stream")],
+            "client": ("127.0.0.1", 50000), "server": ("localhost", 80),
+        }
+        pending = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if pending:
+                return pending.pop()
+            await self.disconnect
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body", b"").startswith(b"event:"):
+                self.events.append((time.perf_counter(), message["body"]))
+                self.arrived.set()
+
+        await self.application(scope, receive, send)
+
+    async def wait_events(self, count):
+        while len(self.events) < count:
+            self.arrived.clear()
+            await self.arrived.wait()
+
+
+def count_queries():
+    """Cuenta las consultas de todos los hilos (cada petición ASGI usa su propia conexión)."""
+    from django.db.backends.utils import CursorWrapper
+
+    calls = []
+    execute = CursorWrapper._execute
+
+    def _execute(self, *args, **kwargs):
+        # list.append es atómico entre hilos
+        calls.append(None)
+        return execute(self, *args, **kwargs)
+
+    mock.patch.object(CursorWrapper, "_execute", _execute).start()
+    return lambda: len(calls)
+
+
+async def run_live(application, cookie, clients, events, queries):
+    from enrollments import live
+
+    tracemalloc.start()
+    baseline, _peak = tracemalloc.get_traced_memory()
+    sessions = [SSEClient(application, cookie) for _ in range(clients)]
+    tasks = [asyncio.create_task(client.run()) for client in sessions]
+    start = time.perf_counter()
+    await asyncio.gather(*(client.wait_events(1) for client in sessions))
+    connect = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    queries_before = queries()
+    fanout, latencies = [], []
+    for n in range(events):
+        sent = time.perf_counter()
+        live.broadcaster.publish(delta={"first_id": n + 1, "enrollments": 1, "revenue": "150.00"})
+        await asyncio.gather(*(client.wait_events(n + 2) for client in sessions))
+        arrivals = [client.events[n + 1][0] - sent for client in sessions]
+        fanout.append(max(arrivals))
+        latencies.extend(arrivals)
+    event_queries = queries() - queries_before
+
+    for client in sessions:
+        client.disconnect.set_result(None)
+    await asyncio.gather(*tasks)
+    return {
+        "conectar s": connect,
+        "KB/cliente": (current - baseline) / clients / 1024,
+        "delta p50": percentiles(latencies)["p50"],
+        "a todos p95": percentiles(fanout)["p95"],
+        "SQL/evento": event_queries / events,
+        "suscritos": len(live.broadcaster.subscribers),
+    }
+
+
+async def run_reload(application, cookie, clients, queries):
+    queries_before = queries()
+    start = time.perf_counter()
+    statuses = await asyncio.gather(*(asgi_get(application, "/", cookie) for _ in range(clients)))
+    assert set(statuses) == {200}, set(statuses)
+    return {"recargar s": time.perf_counter() - start, "SQL": queries() - queries_before}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+    from django.test import Client
+    from django.test.utils import override_settings
+
+    from utils.testing import full_permissions_user, seed_sample_data
+
+    with test_database():
+        seed_sample_data(employees=20, groups=3, categories=2, students=20, enrollments=500)
+        user = full_permissions_user("bench-live@example.com")
+        client = Client()
+        client.force_login(user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        with override_settings(ALLOWED_HOSTS=["*"], DEBUG=False, ASYNC_VIEWS=True,
+                               LIVE_MAX_CLIENTS=args.clients, LIVE_HEARTBEAT=60):
+            application = get_asgi_application()
+            queries = count_queries()
+            live_row = asyncio.run(run_live(application, cookie, args.clients, args.events, queries))
+            reload_row = asyncio.run(run_reload(application, cookie, args.clients, queries))
+            mock.patch.stopall()
+    print_table(f"{args.clients} dashboards abiertos, {args.events} inscripciones (ms salvo indicado)",
+                [{"name": "SSE (enrollments.live)", **live_row}])
+    print_table(f"{args.clients} dashboards recargando una vez", [{"name": "GET /", **reload_row}])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Prueba de carga local contra un servidor en ejecución (runserver, gunicorn, uvicorn...).
+
+    python manage.py generate_data --scale 1
+    gunicorn config.wsgi -w 4 &
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --clients 16 --duration 30
+
+Cada cliente inicia sesión y recorre: lista, búsqueda con acentos, detalle y formulario.
+Reporta throughput y p50/p95/p99 por escenario y escribe un JSON de referencia (--output).
+"""
+import argparse
+import http.cookiejar
+import json
+import platform
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks._common import percentiles, print_table, setup_django
+
+SEARCH_TERMS = ["José", "núñez", "MARÍA", "peña", "Ángel", "ibáñez", "999", "mérida"]
+_CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Client:
+    """Cliente HTTP con cookies propias (una sesión por cliente)."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    def request(self, path, data=None, referer=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body)
+        if referer:
+            req.add_header("Referer", self.base_url + referer)
+        try:
+            with self.opener.open(req, timeout=30) as resp:
+                return resp.status, resp.read().decode("utf-8", "replace")
+        except urllib.error.HTTPError as exc:
+            return exc.code, ""
+
+    def login(self, email, password):
+        from django.conf import settings
+
+        session_cookie = settings.SESSION_COOKIE_NAME
+        _, html = self.request("/accounts/login/")
+        match = _CSRF_INPUT.search(html)
+        if not match:
+            raise RuntimeError("No se encontró el token CSRF en la página de login.")
+        data = {"csrfmiddlewaretoken": match.group(1), "username": email, "password": password}
+        status, _ = self.request("/accounts/login/", data=data, referer="/accounts/login/")
+        # Credenciales incorrectas: 200 con el formulario otra vez y sin cookie de sesión
+        if status >= 400 or not any(cookie.name == session_cookie for cookie in self.cookies):
+            raise RuntimeError(f"No se pudo iniciar sesión como {email} (HTTP {status}).")
+        return status
+
+
+def sample_pks(limit=1000):
+    """Ids existentes para las vistas de detalle (misma BD que el servidor)."""
+    from employees.models import Employee
+    from employees.views import EmployeeListView
+    from modalities.models import Category, SubCategory
+
+    return {
+        "employee_pages": max(1, Employee.objects.count() // EmployeeListView.paginate_by),
+        "employee": list(Employee.objects.order_by("?").values_list("pk", flat=True)[:limit]),
+        "category": list(Category.objects.order_by("?").values_list("pk", flat=True)[:limit]),
+        "sub_category": list(SubCategory.objects.order_by("?").values_list("pk", flat=True)[:limit]),
+    }
+
+
+def build_scenarios(pks):
+    rnd = random.Random()
+    scenarios = {
+        "employees:list": lambda: f"/employees/?page={rnd.randint(1, pks['employee_pages'])}",
+        "employees:search": lambda: "/employees/?" + urllib.parse.urlencode({"q": rnd.choice(SEARCH_TERMS)}),
+        "employees:create": lambda: "/employees/new/",
+        "categories:search": lambda: "/categories/?" + urllib.parse.urlencode({"q": rnd.choice(SEARCH_TERMS)}),
+        "sub_categories:create": lambda: "/sub-categories/new/",
+    }
+    if pks["employee"]:
+        scenarios["employees:detail"] = lambda: f"/employees/view/{rnd.choice(pks['employee'])}/"
+        scenarios["employees:update"] = lambda: f"/employees/edit/{rnd.choice(pks['employee'])}/"
+    if pks["category"]:
+        scenarios["categories:detail"] = lambda: f"/categories/{rnd.choice(pks['category'])}/"
+    if pks["sub_category"]:
+        scenarios["sub_categories:detail"] = lambda: f"/sub-categories/{rnd.choice(pks['sub_category'])}/"
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", default="carga@aula.mx")
+    parser.add_argument("--password", default="aula-286")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="segundos de carga tras el login")
+    parser.add_argument("--output", default="benchmarks/results/load_baseline.json")
+    args = parser.parse_args()
+
+    setup_django()
+    scenarios = build_scenarios(sample_pks())
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    login_samples = []
+    lock = threading.Lock()
+    abort = threading.Event()
+
+    def worker(_):
+        client = Client(args.base_url)
+        start = time.perf_counter()
+        try:
+            client.login(args.email, args.password)
+        except RuntimeError:
+            # Sin sesión cada escenario mediría la redirección al login: se aborta la corrida
+            abort.set()
+            raise
+        with lock:
+            login_samples.append(time.perf_counter() - start)
+        names = list(scenarios)
+        deadline = time.perf_counter() + args.duration
+        while time.perf_counter() < deadline and not abort.is_set():
+            name = random.choice(names)
+            start = time.perf_counter()
+            status, _ = client.request(scenarios[name]())
+            elapsed = time.perf_counter() - start
+            with lock:
+                samples[name].append(elapsed)
+                if status >= 400:
+                    errors[name] += 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        futures = [pool.submit(worker, n) for n in range(args.clients)]
+    failed = [future.exception() for future in futures if future.exception()]
+    if failed:
+        raise SystemExit(f"{failed[0]} Prueba abortada: {len(failed)} de {args.clients} clientes sin sesión.")
+    wall = time.perf_counter() - wall_start
+
+    results = {"login": {**percentiles(login_samples), "errors": errors["login"]}}
+    for name in sorted(samples):
+        results[name] = {**percentiles(samples[name]), "rps": len(samples[name]) / args.duration, "errors": errors[name]}
+    total = sum(len(v) for v in samples.values())
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "clients": args.clients,
+        "duration_s": args.duration,
+        "wall_s": wall,
+        "python": platform.python_version(),
+        "throughput_rps": total / args.duration,
+        "requests": total,
+        "scenarios": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    print_table(f"{args.clients} clientes, {args.duration:.0f} s, {report['throughput_rps']:.1f} req/s (ms)",
+                [{"name": name, **stats} for name, stats in results.items()])
+    print(f"\nReferencia guardada en {output}")
+
+
+if __name__ == "__main__":
+    main()
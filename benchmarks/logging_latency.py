@@ -0,0 +1,89 @@
+"""
+Latencia de petición con mucho logging: FileHandler síncrono vs cola + listener.
+
+    python -m benchmarks.logging_latency --requests 2000 --threads 8 --lines 50
+"""
+import argparse
+import logging
+import logging.config
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks._common import percentiles, print_table, setup_django, timer
+
+
+def sync_config(log_dir):
+    # Equivalente a la configuración anterior (FileHandler + consola, sin cola)
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {"verbose": {"format": "{levelname} {asctime} {module} {message}", "style": "{"}},
+        "handlers": {
+            "file": {"class": "logging.FileHandler", "filename": os.path.join(log_dir, "sync.log"), "formatter": "verbose"},
+            "console": {"class": "logging.StreamHandler", "stream": open(os.devnull, "w"), "formatter": "verbose"},
+        },
+        "root": {"handlers": ["file", "console"], "level": "INFO"},
+    }
+
+
+def queue_config(log_dir):
+    from django.conf import settings
+
+    config = {**settings.LOGGING, "handlers": dict(settings.LOGGING["handlers"])}
+    config["handlers"]["console"] = {**config["handlers"]["console"], "stream": open(os.devnull, "w")}
+    config["handlers"]["file"] = {**config["handlers"]["file"], "filename": os.path.join(log_dir, "queue-{pid}.log")}
+    return config
+
+
+def run(config, requests, threads, lines):
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from utils.middleware.request_id import RequestIdMiddleware
+
+    logging.config.dictConfig(config)
+    app_log = logging.getLogger("benchmarks.app")
+    noisy_log = logging.getLogger("django.db.backends")
+
+    def view(request):
+        for i in range(lines):
+            app_log.info("procesando registro %s de %s", i, request.path)
+            noisy_log.info("SELECT ... WHERE id = %s", i)
+        return HttpResponse("ok")
+
+    handler = RequestIdMiddleware(view)
+    factory = RequestFactory()
+    samples = []
+
+    def one(_):
+        request = factory.get("/employees/")
+        with timer(samples):
+            handler(request)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(requests)))
+
+    for h in logging.getLogger().handlers:
+        if hasattr(h, "stop"):
+            h.stop()
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--lines", type=int, default=50, help="líneas de log por petición (x2 con el logger ruidoso)")
+    args = parser.parse_args()
+
+    setup_django()
+    rows = []
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name, build in (("sync FileHandler", sync_config), ("queue + listener", queue_config)):
+            stats = run(build(log_dir), args.requests, args.threads, args.lines)
+            rows.append({"name": name, **stats})
+    print_table(f"Latencia por petición (ms), {args.threads} hilos, {args.lines * 2} logs/petición", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Throughput del login (POST válidos e inválidos) y llamadas a authenticate() por POST.
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.login_throughput --requests 20
+
+El costo lo domina el hash de la contraseña: cada authenticate() extra por POST
+(p. ej. validar el form en su constructor y volver a construirlo) lo duplica.
+"""
+import argparse
+import time
+from unittest import mock
+
+from benchmarks._common import percentiles, print_table, setup_django, test_database, timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import authenticate
+    from django.test import Client
+    from django.urls import reverse
+    from users.models import CustomUser
+
+    with test_database():
+        CustomUser.objects.create_user(email="bench@aula.mx", password="contraseña-segura")
+        url = reverse("login")
+        rows = []
+        for name, password in (("login válido", "contraseña-segura"), ("login inválido", "incorrecta")):
+            samples = []
+            with mock.patch("django.contrib.auth.forms.authenticate", wraps=authenticate) as spy:
+                start = time.perf_counter()
+                for _ in range(args.requests):
+                    client = Client()
+                    with timer(samples):
+                        client.post(url, {"username": "bench@aula.mx", "password": password})
+                elapsed = time.perf_counter() - start
+            rows.append({
+                "name": name,
+                **percentiles(samples),
+                "req/s": args.requests / elapsed,
+                "auth/POST": spy.call_count / args.requests,
+            })
+    print_table("Login (ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Throughput de imágenes protegidas con clientes concurrentes (hilos en el mismo proceso):
+django.views.static.serve sin permisos (lo que agregaba static() en DEBUG) vs utils.views.MediaView
+con FileResponse, con un rango y con X-Accel-Redirect (el cuerpo lo enviaría nginx).
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.media_serving --files 50 --size 200 --clients 16 --requests 2000
+
+Usa la base de datos de tests y un MEDIA_ROOT temporal con --files archivos de --size KB.
+El cliente de pruebas lee el cuerpo en Python: el sendfile de gunicorn (wsgi.file_wrapper)
+solo se nota contra un servidor real (benchmarks.load_test).
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks._common import percentiles, print_table, setup_django, test_database, timer
+
+# URLconf del benchmark (ROOT_URLCONF="benchmarks.media_serving"); las rutas las fija main()
+urlpatterns = []
+
+
+def run(user, urls, requests, clients, **headers):
+    from django.db import connection
+    from django.test import Client
+
+    # Sesiones creadas antes de los hilos: SQLite en memoria no admite escrituras concurrentes
+    sessions = [Client() for _ in range(clients)]
+    if user is not None:
+        for client in sessions:
+            client.force_login(user)
+
+    def worker(offset):
+        client = sessions[offset]
+        samples, sent = [], 0
+        try:
+            for i in range(offset, requests, clients):
+                with timer(samples):
+                    response = client.get(urls[i % len(urls)], headers=headers)
+                    body = b"".join(response.streaming_content) if response.streaming else response.content
+                    response.close()
+                sent += len(body)
+        finally:
+            connection.close()
+        return samples, sent
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        results = list(pool.map(worker, range(clients)))
+    elapsed = time.perf_counter() - start
+    samples = [sample for chunk, _sent in results for sample in chunk]
+    sent = sum(sent for _chunk, sent in results)
+    return {**percentiles(samples), "pet/s": requests / elapsed, "MB/s": sent / elapsed / 2**20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--size", type=int, default=200, help="KB por archivo")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import Permission
+    from django.test.utils import override_settings
+    from django.urls import path
+    from django.views.static import serve
+
+    from users.models import CustomUser
+    from utils.views import MediaView
+
+    with test_database(), tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "employees"))
+        urls = []
+        for i in range(args.files):
+            with open(os.path.join(tmp, "employees", f"empleado{i}.jpg"), "wb") as fh:
+                fh.write(os.urandom(args.size * 1024))
+            urls.append(f"/media/employees/empleado{i}.jpg")
+        user = CustomUser.objects.create_user("bench-media@example.com", "x")
+        user.user_permissions.add(Permission.objects.get(codename="view_group"))
+
+        urlpatterns[:] = [
+            path("static-serve/<path:path>", serve, {"document_root": tmp}),
+            path("media/<path:path>", MediaView.as_view()),
+        ]
+        common = {"MEDIA_ROOT": tmp, "ROOT_URLCONF": __name__, "ALLOWED_HOSTS": ["*"], "DEBUG": False}
+        unprotected = [url.replace("/media/", "/static-serve/") for url in urls]
+        rows = []
+        with override_settings(**common, MEDIA_ACCEL=""):
+            rows.append({"name": "static serve (sin permisos)", **run(None, unprotected, args.requests, args.clients)})
+            rows.append({"name": "MediaView FileResponse", **run(user, urls, args.requests, args.clients)})
+            rows.append({"name": "MediaView Range 64 KB", **run(user, urls, args.requests, args.clients,
+                                                                 range="bytes=0-65535")})
+        with override_settings(**common, MEDIA_ACCEL="nginx"):
+            rows.append({"name": "MediaView X-Accel-Redirect", **run(user, urls, args.requests, args.clients)})
+    print_table(f"{args.files} archivos de {args.size} KB, {args.clients} clientes, {args.requests} peticiones (ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
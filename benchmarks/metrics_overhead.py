@@ -0,0 +1,74 @@
+"""
+Sobrecosto de ServerTimingMiddleware sobre la lista de empleados (consultas SQL + plantilla).
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.metrics_overhead --requests 1000 --rounds 5
+
+Compara la pila de MIDDLEWARE de settings con y sin el middleware de métricas,
+intercalando rondas para reducir ruido. La lista hace varias consultas por petición, así
+se mide también el connection.execute_wrapper del middleware. Usa la base de datos de tests.
+Objetivo: < 2 % de sobrecosto.
+"""
+import argparse
+import time
+
+from benchmarks._common import setup_django, test_database
+
+
+def run(client, path, middleware, requests):
+    """(segundos por petición, consultas por petición)."""
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import CaptureQueriesContext
+
+    with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=["testserver"], DEBUG=False):
+        # Calentamiento: carga de middleware y plantillas
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(path)
+        assert response.status_code == 200, response.status_code
+        # Antes de las demás peticiones: request_started vacía connection.queries
+        queries = len(ctx.captured_queries)
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get(path)
+        return (time.perf_counter() - start) / requests, queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+    from django.urls import reverse
+
+    from utils.testing import full_permissions_user, seed_sample_data
+
+    with_timing = list(settings.MIDDLEWARE)
+    without_timing = [m for m in with_timing if not m.endswith("ServerTimingMiddleware")]
+
+    with test_database():
+        seed_sample_data(employees=60, groups=3, categories=2, students=5, enrollments=20)
+        client = Client()
+        client.force_login(full_permissions_user("bench-metrics@example.com"))
+        path = reverse("employees:list")
+
+        base, instrumented = [], []
+        for _ in range(args.rounds):
+            seconds, queries = run(client, path, without_timing, args.requests)
+            base.append(seconds)
+            seconds, _queries = run(client, path, with_timing, args.requests)
+            instrumented.append(seconds)
+
+    best_base, best_inst = min(base), min(instrumented)
+    overhead = (best_inst - best_base) / best_base * 100
+    print(f"{path}: {queries} consultas por petición")
+    print(f"sin métricas:  {best_base * 1e6:8.1f} µs/petición")
+    print(f"con métricas:  {best_inst * 1e6:8.1f} µs/petición")
+    print(f"sobrecosto:    {overhead:8.2f} %")
+
+
+if __name__ == "__main__":
+    main()
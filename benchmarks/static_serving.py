@@ -0,0 +1,108 @@
+"""
+Servir estáticos a través de toda la pila de Django: django.views.static.serve por URL
+(lo que agregan staticfiles_urlpatterns/static()) vs utils.middleware.static_files.StaticFilesMiddleware.
+
+    python -m benchmarks.static_serving --files 10 --requests 500
+
+Copia los --files archivos CSS/JS más grandes de STATIC_ROOT (o de static/ si no hay collectstatic)
+a un directorio temporal con sus hermanos .gz/.br, y mide latencia por petición y bytes enviados:
+sin compresión, precomprimido según Accept-Encoding y revalidación 304. No usa la base de datos.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks._common import percentiles, print_table, setup_django, timer
+
+# URLconf del benchmark (ROOT_URLCONF="benchmarks.static_serving"); STATIC_ROOT lo fija main()
+urlpatterns = []
+
+
+def pick_files(root, count):
+    candidates = []
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            if name.endswith((".css", ".js")):
+                path = os.path.join(dirpath, name)
+                candidates.append((os.path.getsize(path), os.path.relpath(path, root)))
+    return [relative for _size, relative in sorted(candidates, reverse=True)[:count]]
+
+
+def copy_with_variants(root, relatives, target):
+    from utils.static import compress
+
+    for relative in relatives:
+        destination = os.path.join(target, relative)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        shutil.copyfile(os.path.join(root, relative), destination)
+        compress(destination)
+
+
+def run(requests, urls, etags=None, **headers):
+    """Peticiones con un Client nuevo (carga MIDDLEWARE con los settings vigentes)."""
+    from django.test import Client
+
+    client = Client()
+    samples, sent = [], 0
+    for i in range(requests):
+        url = urls[i % len(urls)]
+        extra = {"if_none_match": etags[url]} if etags else {}
+        with timer(samples):
+            response = client.get(url, headers={**headers, **extra})
+            body = b"".join(response.streaming_content) if response.streaming else response.content
+            response.close()
+        sent += len(body)
+    return {**percentiles(samples), "kb/pet": round(sent / requests / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.conf.urls.static import static
+    from django.http import HttpResponse
+    from django.test.utils import override_settings
+
+    from utils.middleware.static_files import StaticFilesMiddleware
+
+    source = str(settings.STATIC_ROOT) if os.path.isdir(settings.STATIC_ROOT) else str(settings.STATICFILES_DIRS[0])
+    with tempfile.TemporaryDirectory() as tmp:
+        relatives = pick_files(source, args.files)
+        copy_with_variants(source, relatives, tmp)
+        urls = [f"/static/{relative}" for relative in relatives]
+        common = {"STATIC_ROOT": tmp, "STATIC_URL": "/static/", "ROOT_URLCONF": __name__, "ALLOWED_HOSTS": ["*"]}
+
+        # static() solo agrega la URL con DEBUG; se arma a mano para medirla sin DEBUG
+        with override_settings(DEBUG=True):
+            urlpatterns[:] = static("/static/", document_root=tmp)
+        with override_settings(**common, STATIC_SERVE=False):
+            rows = [{"name": "URL + django.views.static.serve", **run(args.requests, urls)}]
+
+        with override_settings(**common, STATIC_SERVE=True):
+            index = StaticFilesMiddleware(lambda request: HttpResponse()).index
+            etags = {url: index[url].etag() for url in urls}
+            rows += [
+                {"name": "middleware (sin compresión)", **run(args.requests, urls)},
+                {"name": "middleware (gzip)", **run(args.requests, urls, accept_encoding="gzip")},
+                {"name": "middleware (br, o gzip sin brotli)", **run(args.requests, urls, accept_encoding="br, gzip")},
+                {"name": "middleware (304)", **run(args.requests, urls, etags=etags)},
+            ]
+    print_table(f"{len(urls)} archivos de {source}, {args.requests} peticiones (ms)", rows)
+
+    # Costo del índice al arrancar con el STATIC_ROOT real
+    if os.path.isdir(settings.STATIC_ROOT):
+        start = time.perf_counter()
+        with override_settings(STATIC_SERVE=True):
+            middleware = StaticFilesMiddleware(lambda request: HttpResponse())
+        print(f"\nÍndice de {settings.STATIC_ROOT}: {len(middleware.index)} archivos en "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
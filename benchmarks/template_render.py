@@ -0,0 +1,155 @@
+"""
+Render de plantillas de listas y detalles: componentes con {% include %} vs tags compilados
+(utils.templatetags.components) y cargador con caché vs sin caché.
+
+    DJANGO_TEST_DB=sqlite python -m benchmarks.template_render --rows 500 --fields 200 --renders 100
+
+No usa la base de datos: los empleados se arman en memoria. Mide:
+- componentes aislados: un encabezado de --fields columnas y un detalle de --fields campos;
+- páginas completas employees/list.html (--rows filas) y employees/detail.html con cada cargador.
+"""
+import argparse
+from datetime import date
+
+from benchmarks._common import percentiles, print_table, setup_django, timer
+
+# Copia de los componentes anteriores (components/list/th.html y components/detail/field.html)
+LEGACY_TH = """<th{% if th_class %} class="{{ th_class }}"{% endif %}>
+    {% if current_order == field %}
+        <a href="?{% if querystring_no_ordering %}{{ querystring_no_ordering }}&{% endif %}ordering=-{{field}}">{{ label }} ▲</a>
+    {% elif current_order == '-'|add:field %}
+        <a href="?{% if querystring_no_ordering %}{{ querystring_no_ordering }}&{% endif %}ordering={{field}}">{{ label }} ▼</a>
+    {% else %}
+        <a href="?{% if querystring_no_ordering %}{{ querystring_no_ordering }}&{% endif %}ordering={{field}}">{{ label }}</a>
+    {% endif %}
+</th>"""
+LEGACY_FIELD = """<div class="form-group row pb-4">
+    <label class="col-lg-4 control-label text-lg-end pt-2">{{ label }}</label>
+    <label class="col-lg-8 control-label pt-2">
+        {% if type == "date" %}{{ value|date:"d/m/Y" }}
+        {% elif type == "datetime" %}{{ value|date:"d/m/Y H:i" }}
+        {% elif type == "boolean" %}{{ value|yesno:"Sí,No" }}
+        {% elif type == "decimal" %}{{ value|stringformat:".2f"|default_if_none:"" }}
+        {% else %}{{ value|default_if_none:"" }}{% endif %}
+    </label>
+</div>"""
+KINDS = ["text", "date", "boolean", "decimal"]
+
+
+def engine(cached, templates=None):
+    from django.conf import settings
+    from django.template import Engine
+    from django.template.backends.django import get_installed_libraries
+
+    loaders = [
+        "django.template.loaders.filesystem.Loader",
+        "django.template.loaders.app_directories.Loader",
+    ]
+    if templates:
+        loaders.insert(0, ("django.template.loaders.locmem.Loader", templates))
+    return Engine(
+        dirs=[settings.BASE_DIR / "templates"],
+        app_dirs=False,
+        loaders=[("django.template.loaders.cached.Loader", loaders)] if cached else loaders,
+        context_processors=settings.TEMPLATES[0]["OPTIONS"]["context_processors"],
+        libraries={**get_installed_libraries(), **settings.TEMPLATES[0]["OPTIONS"]["libraries"]},
+    )
+
+
+def build_employees(rows):
+    from employees.models import Employee
+    from users.models import CustomUser
+
+    employees = []
+    for i in range(1, rows + 1):
+        user = CustomUser(pk=i, email=f"empleado{i}@aula.mx", first_name="María José", last_name="Núñez Peña")
+        employees.append(Employee(
+            pk=i, user=user, reference=f"R{i:05d}", address="Calle Peñón 12", birthdate=date(1990, 1, 1),
+            commission_general_public=i % 2 == 0, phone_number="9990000000",
+        ))
+    return employees
+
+
+def request(user):
+    from django.test import RequestFactory
+
+    req = RequestFactory().get("/employees/", {"ordering": "reference"})
+    req.user = user
+    return req
+
+
+def measure(render, renders):
+    render()  # calienta (compila en el cargador con caché)
+    samples = []
+    for _ in range(renders):
+        with timer(samples):
+            html = render()
+    return {**percentiles(samples), "kb": round(len(html) / 1024, 1)}
+
+
+def component_rows(fields, renders):
+    from django.template import Context
+
+    columns = [(f"campo_{i}", f"Columna {i}") for i in range(fields)]
+    values = [(f"Campo {i}", [None, date(2024, 5, 1), True, 12.5][i % 4], KINDS[i % 4]) for i in range(fields)]
+    ctx = {"columns": columns, "values": values, "current_order": "campo_1", "querystring_no_ordering": "q=ana"}
+
+    include = engine(True, {"legacy/th.html": LEGACY_TH, "legacy/field.html": LEGACY_FIELD})
+    th_include = include.from_string(
+        '{% for field, label in columns %}{% include "legacy/th.html" with field=field label=label %}{% endfor %}')
+    field_include = include.from_string(
+        '{% for label, value, type in values %}{% include "legacy/field.html" %}{% endfor %}')
+    tags = engine(True)
+    th_tag = tags.from_string('{% load components %}{% for field, label in columns %}{% sort_th field label %}{% endfor %}')
+    field_tag = tags.from_string(
+        '{% load components %}{% for label, value, type in values %}{% detail_field label value type %}{% endfor %}')
+    return [
+        {"name": f"th x{fields} (include)", **measure(lambda: th_include.render(Context(ctx)), renders)},
+        {"name": f"th x{fields} (tag)", **measure(lambda: th_tag.render(Context(ctx)), renders)},
+        {"name": f"campo x{fields} (include)", **measure(lambda: field_include.render(Context(ctx)), renders)},
+        {"name": f"campo x{fields} (tag)", **measure(lambda: field_tag.render(Context(ctx)), renders)},
+    ]
+
+
+def page_rows(rows, renders):
+    from django.core.paginator import Paginator
+    from django.template import RequestContext
+
+    from employees.forms import EmployeeSearchForm
+    from users.models import CustomUser
+
+    admin = CustomUser(pk=0, email="admin@aula.mx", is_superuser=True, is_active=True)
+    employees = build_employees(rows)
+    page = Paginator(employees, rows).page(1)
+    list_ctx = {
+        "objects": employees, "page_obj": page, "is_paginated": False, "search_form": EmployeeSearchForm(),
+        "querystring": "ordering=reference", "querystring_no_ordering": "", "current_order": "reference",
+        "bulk_actions": [("activate", "Activar"), ("deactivate", "Desactivar")], "active_menu": "employees",
+    }
+    detail_ctx = {"item": employees[0], "object": employees[0], "active_menu": "employees"}
+    results = []
+    for cached in (False, True):
+        variant = "con caché" if cached else "sin caché"
+        eng = engine(cached)
+        for name, ctx in (("employees/list.html", list_ctx), ("employees/detail.html", detail_ctx)):
+            def render(name=name, ctx=ctx):
+                return eng.get_template(name).render(RequestContext(request(admin), ctx))
+            label = f"{name} ({variant}{f', {rows} filas' if 'list' in name else ''})"
+            results.append({"name": label, **measure(render, renders)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="Filas de la lista completa.")
+    parser.add_argument("--fields", type=int, default=200, help="Columnas/campos de los componentes aislados.")
+    parser.add_argument("--renders", type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+    print_table(f"Componentes, {args.renders} renders (ms)", component_rows(args.fields, args.renders))
+    print_table(f"Páginas completas, {args.renders} renders (ms)", page_rows(args.rows, args.renders))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Subidas concurrentes de imágenes de ~10 MB: manejadores de Django (memoria/temporal) + FileSystemStorage
+vs utils.uploads.StreamingUploadHandler + utils.storage.ContentAddressedStorage.
+
+    python -m benchmarks.upload_handling --clients 8 --uploads 32 --megabytes 10
+
+Cada petición: parseo multipart (request.FILES), validación de forms.ImageField (Pillow) y
+default_storage.save() en un MEDIA_ROOT temporal. Reporta latencia, pico de memoria de Python
+(tracemalloc, sin contar el cuerpo ya codificado que comparten todas las peticiones) y el costo
+de rechazar una imagen que excede UPLOAD_MAX_BYTES. --megabytes 2 cabe en MemoryFileUploadHandler
+(FILE_UPLOAD_MAX_MEMORY_SIZE = 2.5 MB): ahí Django retiene el archivo completo en memoria.
+No usa la base de datos.
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks._common import percentiles, print_table, setup_django, timer
+
+DEFAULT_HANDLERS = [
+    "django.core.files.uploadhandler.MemoryFileUploadHandler",
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+
+def make_jpeg(megabytes):
+    """JPEG de ruido (no se comprime) de aproximadamente 'megabytes' MB."""
+    from PIL import Image
+
+    side = int((megabytes * 2**20 / 1.4) ** 0.5)
+    buffer = io.BytesIO()
+    Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def multipart_body(payload):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+    return encode_multipart(BOUNDARY, {"picture": SimpleUploadedFile("foto.jpg", payload)}), MULTIPART_CONTENT
+
+
+def upload_once(body, content_type):
+    from django import forms
+    from django.core.files.storage import default_storage
+    from django.core.handlers.wsgi import WSGIRequest
+    from django.test import RequestFactory
+
+    # BytesIO comparte el buffer de 'body': la memoria medida es la del servidor, no la del cliente
+    environ = RequestFactory()._base_environ(
+        PATH_INFO="/upload/", REQUEST_METHOD="POST", CONTENT_TYPE=content_type,
+        CONTENT_LENGTH=str(len(body)), **{"wsgi.input": io.BytesIO(body)},
+    )
+    request = WSGIRequest(environ)
+    upload = request.FILES.get("picture")
+    if upload is None:
+        return getattr(request, "upload_errors", {}).get("picture", "sin archivo")
+    try:
+        forms.ImageField().clean(upload)
+        default_storage.save("employees/foto.jpg", upload)
+    finally:
+        upload.close()
+    return None
+
+
+def run(payload, uploads, clients):
+    body, content_type = multipart_body(payload)
+    samples, errors = [], []
+
+    def worker(_index):
+        with timer(samples):
+            error = upload_once(body, content_type)
+        if error:
+            errors.append(error)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _peak = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(worker, range(uploads)))
+    elapsed = time.perf_counter() - start
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        **percentiles(samples),
+        "MB/s": len(payload) * uploads / elapsed / 2**20,
+        "pico MB": (peak - baseline) / 2**20,
+        "rechazos": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--uploads", type=int, default=32)
+    parser.add_argument("--megabytes", type=float, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.files.storage import storages
+    from django.test.utils import override_settings
+
+    payload = make_jpeg(args.megabytes)
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        common = {"MEDIA_ROOT": tmp, "UPLOAD_MAX_BYTES": len(payload) + 1, "UPLOAD_MAX_PIXELS": 10**9}
+        scenarios = [
+            ("Django (memoria/temporal) + FileSystemStorage", DEFAULT_HANDLERS,
+             "django.core.files.storage.FileSystemStorage", {}),
+            ("StreamingUploadHandler + ContentAddressed", ["utils.uploads.StreamingUploadHandler"],
+             "utils.storage.ContentAddressedStorage", {}),
+            ("Streaming, rechazo por UPLOAD_MAX_BYTES", ["utils.uploads.StreamingUploadHandler"],
+             "utils.storage.ContentAddressedStorage", {"UPLOAD_MAX_BYTES": len(payload) // 2}),
+        ]
+        for name, handlers, backend, extra in scenarios:
+            storage_settings = {"default": {"BACKEND": backend}, "staticfiles": {"BACKEND": "utils.storage.StaticStorage"}}
+            with override_settings(**{**common, **extra}, FILE_UPLOAD_HANDLERS=handlers, STORAGES=storage_settings):
+                storages._storages = {}
+                rows.append({"name": name, **run(payload, args.uploads, args.clients)})
+    print_table(f"{args.uploads} subidas de {len(payload) / 2**20:.1f} MB, {args.clients} clientes (ms)", rows)
+
+
+if __name__ == "__main__":
+    main()
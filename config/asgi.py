@@ -13,4 +13,11 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from utils.middleware.concurrency import ConcurrencyLimitMiddleware  # noqa: E402
+
+application = ConcurrencyLimitMiddleware(
+    django_application, settings.ASGI_MAX_REQUESTS, settings.ASGI_STREAMING_PATHS,
+)
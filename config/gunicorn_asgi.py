@@ -0,0 +1,40 @@
+# config/gunicorn_asgi.py
+# Código en inglés; comentarios en español
+"""
+gunicorn con workers de uvicorn (ASGI) y las vistas asíncronas activas.
+
+    gunicorn -c config/gunicorn_asgi.py
+
+Cada worker atiende muchas peticiones a la vez en un event loop: mientras una espera a la BD
+(acount/aiterator) las demás avanzan. Lo síncrono (formularios, POST, render de plantillas)
+corre en el hilo de sync_to_async de cada petición.
+"""
+import multiprocessing
+import os
+
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+os.environ.setdefault("DJANGO_ASYNC_VIEWS", "1")
+
+
+class UvicornWorker(BaseUvicornWorker):
+    # El ORM asíncrono usa conexiones síncronas en hilos (una por petición en curso): el tope que
+    # protege max_connections de PostgreSQL es settings.ASGI_MAX_REQUESTS (config.asgi), que no
+    # cuenta los dashboards en vivo (SSE) ya abiertos. limit_concurrency de uvicorn cuenta sockets
+    # sin distinguirlos: aquí es solo un tope de sockets (peticiones normales + streams)
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        "limit_concurrency": int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+        + int(os.getenv("DJANGO_LIVE_MAX_CLIENTS", "2000")),
+    }
+
+
+wsgi_app = "config.asgi:application"
+worker_class = "config.gunicorn_asgi.UvicornWorker"
+bind = os.getenv("GUNICORN_BIND", "127.0.0.1:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
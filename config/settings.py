@@ -42,6 +42,9 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.postgres',
+    'api',
+    'audit',
+    'tracking',
     'employees',
     'enrollments',
     'modalities',
@@ -50,6 +53,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'utils.middleware.request_id.RequestIdMiddleware',
+    # Antes de las métricas: los estáticos no cuentan como peticiones de la app
+    'utils.middleware.static_files.StaticFilesMiddleware',
+    'utils.middleware.timing.ServerTimingMiddleware',
+    'utils.middleware.cache_fence.CacheFenceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -57,16 +65,29 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'audit.middleware.AuditMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Bus de invalidación de la caché local entre workers (utils.invalidation; PostgreSQL + LocMemCache).
+# Tras escribir, el mismo cliente ve sus cambios durante CACHE_FENCE_SECONDS aunque caiga en otro worker
+CACHE_BUS = os.getenv('DJANGO_CACHE_BUS', '1') == '1'
+CACHE_BUS_RECONNECT = 5
+CACHE_FENCE_COOKIE = 'cache_fence'
+CACHE_FENCE_SECONDS = 10
+CACHE_FENCE_TIMEOUT = 1.0
+
 ROOT_URLCONF = 'config.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / "templates"],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -74,12 +95,31 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Plantillas compiladas una vez por proceso; en desarrollo se leen de disco en cada render
+            'loaders': TEMPLATE_LOADERS if DEBUG else [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)],
+            'libraries': {
+                'bundles': 'utils.templatetags.bundles',
+                'components': 'utils.templatetags.components',
+            },
         },
     },
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
 ASGI_APPLICATION = 'config.asgi.application'
+# Vistas de lectura con el ORM asíncrono (utils.mixins.async_crud); activar solo al servir con ASGI
+# (gunicorn -c config/gunicorn_asgi.py): con WSGI cada petición tendría que abrir un event loop
+ASYNC_VIEWS = os.getenv('DJANGO_ASYNC_VIEWS', '0') == '1'
+# Dashboard en vivo (enrollments.live, /dashboard/events/): comentario SSE cada LIVE_HEARTBEAT s
+# (mantiene abiertos proxies/balanceadores), dashboards abiertos por proceso y espera para reconectar LISTEN
+LIVE_HEARTBEAT = int(os.getenv('DJANGO_LIVE_HEARTBEAT', '15'))
+LIVE_MAX_CLIENTS = int(os.getenv('DJANGO_LIVE_MAX_CLIENTS', '2000'))
+LIVE_RECONNECT = 5
+
+# Peticiones en curso por worker ASGI (cada una con su hilo y su conexión a la BD); arriba, 503.
+# Los streams de ASGI_STREAMING_PATHS cuentan solo hasta enviar cabeceras (utils.middleware.concurrency)
+ASGI_MAX_REQUESTS = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '100'))
+ASGI_STREAMING_PATHS = ['/dashboard/events/']
 
 
 # Database
@@ -96,6 +136,19 @@ DATABASES = {
     }
 }
 
+# Tests rápidos en memoria: DJANGO_TEST_DB=sqlite python manage.py test
+# Los tests marcados con utils.testing.postgres_only se omiten en este modo.
+if os.getenv('DJANGO_TEST_DB') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+
+# Cierra los hilos de LISTEN (utils.listen) antes de borrar la BD de prueba
+TEST_RUNNER = 'utils.testing.TestRunner'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -134,9 +187,82 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
+# Qué se publica con collectstatic_incremental (DJANGO_STATIC_PROFILE); exclude/include son
+# prefijos relativos a static/ ('assets/sound') o patrones fnmatch
+STATIC_PROFILES = {
+    'production': {
+        'exclude': ['assets/sound', 'administration/video'],
+    },
+    'full': {},
+}
+STATIC_PROFILE = os.getenv('DJANGO_STATIC_PROFILE', 'production')
+
+# StaticFilesMiddleware sirve STATIC_ROOT en producción (DJANGO_STATIC_SERVE=0 si lo sirve nginx)
+STATIC_SERVE = os.getenv('DJANGO_STATIC_SERVE', '1') == '1'
+
+STORAGES = {
+    # Subidas con nombre por contenido (deduplicadas); huérfanos: manage.py gc_media
+    'default': {'BACKEND': 'utils.storage.ContentAddressedStorage'},
+    # Nombres con hash para caché inmutable; sin manifest sirve los nombres originales
+    'staticfiles': {'BACKEND': 'utils.storage.StaticStorage'},
+}
+
+# Paquetes de base.html (python manage.py build_static); el orden es el de carga
+STATIC_BUNDLES = {
+    'base.css': [
+        'administration/vendor/bootstrap/css/bootstrap.css',
+        'administration/vendor/animate/animate.compat.css',
+        'administration/vendor/font-awesome/css/all.min.css',
+        'administration/vendor/boxicons/css/boxicons.min.css',
+        'administration/vendor/magnific-popup/magnific-popup.css',
+        'administration/vendor/bootstrap-datepicker/css/bootstrap-datepicker3.css',
+        'administration/css/theme.css',
+        'administration/css/skins/default.css',
+    ],
+    # Después de {% block extra_css %}: sus reglas ganan a las de cada página
+    'custom.css': [
+        'administration/css/custom.css',
+    ],
+    'vendor.js': [
+        'administration/vendor/modernizr/modernizr.js',
+        'administration/vendor/jquery/jquery.js',
+        'administration/vendor/jquery-browser-mobile/jquery.browser.mobile.js',
+        'administration/vendor/popper/umd/popper.min.js',
+        'administration/vendor/bootstrap/js/bootstrap.bundle.min.js',
+        'administration/vendor/bootstrap-datepicker/js/bootstrap-datepicker.js',
+        'administration/vendor/bootstrap-datepicker/locales/bootstrap-datepicker.es.min.js',
+        'administration/vendor/common/common.js',
+        'administration/vendor/nanoscroller/nanoscroller.js',
+        'administration/vendor/magnific-popup/jquery.magnific-popup.js',
+        'administration/vendor/jquery-placeholder/jquery.placeholder.js',
+    ],
+    # Después de {% block extra_js %}: theme.init inicializa los plugins de cada página
+    'app.js': [
+        'administration/js/theme.js',
+        'administration/js/custom.js',
+        'administration/js/theme.init.js',
+    ],
+}
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Subidas de imágenes a disco con hash y tipo detectado al vuelo (utils.uploads); límites antes de
+# leer todo el archivo. Solo en las vistas con StreamingUploadMixin: FILE_UPLOAD_HANDLERS queda por defecto
+UPLOAD_MAX_BYTES = int(os.getenv('DJANGO_UPLOAD_MAX_BYTES', 5 * 1024 * 1024))
+UPLOAD_MAX_PIXELS = int(os.getenv('DJANGO_UPLOAD_MAX_PIXELS', 25_000_000))
+UPLOAD_ALLOWED_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
+
+# utils.views.MediaView: permiso requerido por carpeta de upload_to (lo demás es 404)
+MEDIA_PERMISSIONS = {
+    'employees': 'auth.view_group',
+    'students': 'students.view_student',
+}
+# Quién envía el archivo tras validar el permiso: '' (Django), 'nginx' (X-Accel-Redirect) o
+# 'sendfile' (X-Sendfile). Con nginx:  location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+MEDIA_ACCEL = os.getenv('DJANGO_MEDIA_ACCEL', '')
+MEDIA_ACCEL_PREFIX = os.getenv('DJANGO_MEDIA_ACCEL_PREFIX', '/protected-media/')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -144,39 +270,76 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOG_DIR = BASE_DIR / 'logs'
 LOG_DIR.mkdir(exist_ok=True)
-LOG_FILE = LOG_DIR / 'app.log'
+# Un archivo por proceso ({pid}) para que los workers no escriban el mismo archivo
+LOG_FILE = LOG_DIR / 'app-{pid}.log'
+LOG_LEVEL = os.getenv('DJANGO_LOG_LEVEL', 'INFO')
+LOG_MAX_BYTES = int(os.getenv('DJANGO_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv('DJANGO_LOG_BACKUP_COUNT', '5'))
 
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'request_id': {
+            '()': 'utils.log.RequestIdFilter',
+        },
+        # Fracción de registros (< WARNING) que se conserva de loggers ruidosos
+        'sampling': {
+            '()': 'utils.log.SamplingFilter',
+            'rates': {
+                'django.db.backends': 0.01,
+                'django.template': 0.1,
+            },
+        },
+    },
     'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {message}',
-            'style': '{',
+        'json': {
+            '()': 'utils.log.JsonFormatter',
         },
         'simple': {
-            'format': '{levelname} {message}',
+            'format': '{levelname} [{request_id}] {message}',
             'style': '{',
         },
     },
     'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
         'file': {
-            'class': 'logging.FileHandler',
+            '()': 'utils.log.ProcessRotatingFileHandler',
             'filename': str(LOG_FILE),
-            'formatter': 'verbose',
+            'maxBytes': LOG_MAX_BYTES,
+            'backupCount': LOG_BACKUP_COUNT,
+            'formatter': 'json',
             'level': 'DEBUG',
         },
-        'console': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'simple',
+        # Las peticiones solo encolan; un hilo por proceso escribe en consola/archivo.
+        # Debe ordenarse después de 'console' y 'file' (dictConfig configura en orden alfabético).
+        'queue': {
+            '()': 'utils.log.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console', 'cfg://handlers.file'],
+            'queue_size': 10000,
+            'filters': ['request_id', 'sampling'],
         },
     },
     'root': {
-        'handlers': ['file', 'console'],
-        'level': 'INFO',
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
     },
 }
 
+# Server-Timing y métricas por ruta (/metrics/, solo staff)
+METRICS_ENABLED = os.getenv('DJANGO_METRICS_ENABLED', 'True') == 'True'
+
+# Bitácora: 'request' escribe al final de cada petición; 'background' en un hilo cada N segundos
+AUDIT_FLUSH = os.getenv('DJANGO_AUDIT_FLUSH', 'request')
+AUDIT_FLUSH_INTERVAL = float(os.getenv('DJANGO_AUDIT_FLUSH_INTERVAL', '2'))
+AUDIT_RETENTION_DAYS = int(os.getenv('DJANGO_AUDIT_RETENTION_DAYS', '365'))
+
+# Cambia los ETag de las páginas en cada despliegue (plantillas nuevas)
+RELEASE = os.getenv('DJANGO_RELEASE', '')
+
 AUTH_USER_MODEL = 'users.CustomUser'
 
 # --- Auth redirects ---
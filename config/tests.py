@@ -0,0 +1,573 @@
+import asyncio
+import collections
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.template import Context, Template
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from utils import invalidation
+from utils.cache import bump_version, get_or_build, get_version
+from utils.media import parse_range
+from utils.middleware.cache_fence import CacheFenceMiddleware
+from utils.middleware.concurrency import ConcurrencyLimitMiddleware
+from utils.storage import ContentAddressedStorage
+from utils.middleware.static_files import StaticFilesMiddleware
+from utils.static import build_bundle, minify_css, rewrite_css_urls
+from utils.testing import full_permissions_user, iter_named_urls, postgres_only, seed_sample_data, template_time_ms
+
+BUDGETS_FILE = Path(__file__).resolve().parent / "query_budgets.json"
+
+# URLs que no se renderizan con GET (o no son del proyecto); media sirve archivos (MediaViewTests)
+SKIPPED_NAMESPACES = {"admin"}
+SKIPPED_NAMES = {"logout", "media"}
+
+# Argumentos para las URLs que los requieren
+URL_KWARGS = {
+    "employees:detail": lambda d: {"pk": d["employee"].pk},
+    "employees:update": lambda d: {"pk": d["employee"].pk},
+    "employees:delete": lambda d: {"pk": d["employee"].pk},
+    "employees:permissions": lambda d: {"pk": d["employee"].pk},
+    "users:group_update": lambda d: {"pk": d["group"].pk},
+    "users:group_delete": lambda d: {"pk": d["group"].pk},
+    "users:group_detail": lambda d: {"pk": d["group"].pk},
+    "modalities:category_update": lambda d: {"pk": d["category"].pk},
+    "modalities:category_detail": lambda d: {"pk": d["category"].pk},
+    "modalities:category_delete": lambda d: {"pk": d["category"].pk},
+    "modalities:sub_category_update": lambda d: {"pk": d["sub_category"].pk},
+    "modalities:sub_category_detail": lambda d: {"pk": d["sub_category"].pk},
+    "modalities:sub_category_delete": lambda d: {"pk": d["sub_category"].pk},
+    "password_reset_confirm": lambda d: {
+        "uidb64": urlsafe_base64_encode(force_bytes(d["user"].pk)),
+        "token": default_token_generator.make_token(d["user"]),
+    },
+}
+
+
+def project_url_names():
+    names = []
+    for name, _pattern in iter_named_urls():
+        if name.split(":")[0] in SKIPPED_NAMESPACES or name in SKIPPED_NAMES or name in names:
+            continue
+        names.append(name)
+    return names
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Renderiza cada URL de config/urls.py como usuario autorizado y compara
+    consultas SQL y tiempo de plantillas contra config/query_budgets.json.
+    - UPDATE_QUERY_BUDGETS=1 reescribe el archivo con los valores medidos.
+    - QUERY_BUDGET_TIME_FACTOR multiplica el presupuesto de tiempo (CI lento).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_sample_data()
+        cls.data["user"] = full_permissions_user()
+
+    def setUp(self):
+        # Las opciones cacheadas de un test no deben ahorrar consultas en otro
+        cache.clear()
+        self.client.force_login(self.data["user"])
+        self.budgets = json.loads(BUDGETS_FILE.read_text(encoding="utf-8"))
+
+    def measure(self, name):
+        kwargs = URL_KWARGS[name](self.data) if name in URL_KWARGS else {}
+        url = reverse(name, kwargs=kwargs)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertLess(response.status_code, 400, f"{name} ({url}) respondió {response.status_code}")
+        return url, ctx.captured_queries, template_time_ms(response)
+
+    def test_every_url_has_a_budget(self):
+        missing = [name for name in project_url_names() if name not in self.budgets]
+        self.assertEqual(missing, [], f"Agrega presupuesto en {BUDGETS_FILE.name} para: {missing}")
+
+    def test_query_and_render_budgets(self):
+        time_factor = float(os.getenv("QUERY_BUDGET_TIME_FACTOR", "1"))
+        measured = {}
+        for name in project_url_names():
+            url, queries, render_ms = self.measure(name)
+            measured[name] = {"queries": len(queries), "render_ms": render_ms}
+            budget = self.budgets.get(name)
+            if budget is None or os.getenv("UPDATE_QUERY_BUDGETS"):
+                continue
+            with self.subTest(url=name):
+                if len(queries) > budget["queries"]:
+                    sql = "\n".join(f"  {i}. {q['sql']}" for i, q in enumerate(queries, 1))
+                    self.fail(
+                        f"{name} ({url}) ejecutó {len(queries)} consultas; presupuesto {budget['queries']}:\n{sql}"
+                    )
+                self.assertLessEqual(
+                    render_ms, budget["render_ms"] * time_factor,
+                    f"{name} ({url}) tardó {render_ms:.1f} ms en plantillas; presupuesto {budget['render_ms']} ms",
+                )
+
+        if os.getenv("UPDATE_QUERY_BUDGETS"):
+            updated = {
+                name: {
+                    "queries": values["queries"],
+                    # margen para no fallar por ruido de la máquina
+                    "render_ms": self.budgets.get(name, {}).get("render_ms", max(100, round(values["render_ms"] * 5))),
+                }
+                for name, values in sorted(measured.items())
+            }
+            BUDGETS_FILE.write_text(json.dumps(updated, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+class ComponentTagTests(SimpleTestCase):
+    """Los tags de utils.templatetags.components producen lo mismo que los includes que reemplazan."""
+
+    def render(self, source, **context):
+        return Template("{% load components %}" + source).render(Context(context))
+
+    def test_sort_th_toggles_direction_and_keeps_querystring(self):
+        source = '{% sort_th "reference" "Referencia" th_class="text-center" %}'
+        html = self.render(source, current_order="reference", querystring_no_ordering="q=ana")
+        self.assertHTMLEqual(html, '<th class="text-center"><a href="?q=ana&amp;ordering=-reference">Referencia ▲</a></th>')
+        html = self.render(source, current_order="-reference")
+        self.assertHTMLEqual(html, '<th class="text-center"><a href="?ordering=reference">Referencia ▼</a></th>')
+
+    def test_detail_field_formats_and_escapes(self):
+        html = self.render("{% detail_field 'Fecha' value 'date' %}", value=date(2024, 5, 1))
+        self.assertIn("01/05/2024", html)
+        self.assertIn("&lt;b&gt;", self.render("{% detail_field 'Nombre' value 'text' %}", value="<b>"))
+        self.assertIn(">Sí<", self.render("{% detail_field 'Activo' True 'boolean' %}"))
+        self.assertIn("12.50", self.render("{% detail_field 'Monto' value 'decimal' %}", value=Decimal("12.5")))
+
+
+class StaticBundleTests(SimpleTestCase):
+    def test_css_urls_are_rewritten_relative_to_bundle(self):
+        css = "a{background:url('../img/x.png')} b{src:url(../fonts/f.eot?#iefix)} c{background:url(data:image/png;base64,AA)}"
+        rewritten = rewrite_css_urls(css, "administration/css/theme.css", "bundles/base.css")
+        self.assertIn("url('../administration/img/x.png')", rewritten)
+        self.assertIn("url(../administration/fonts/f.eot?#iefix)", rewritten)
+        self.assertIn("url(data:image/png;base64,AA)", rewritten)
+
+    def test_minify_css_keeps_strings_and_license(self):
+        css = '/*! MIT */\n.a ,\n.b {\n  content: "/* x */  y" ; /* fuera */\n}\n'
+        self.assertEqual(minify_css(css), '/*! MIT */ .a,.b{content: "/* x */  y";}')
+
+    def test_bundle_tag_falls_back_to_sources_without_manifest(self):
+        html = Template('{% load bundles %}{% bundle "app.js" %}').render(Context())
+        self.assertEqual(html.count("<script"), len(settings.STATIC_BUNDLES["app.js"]))
+        self.assertIn('src="/static/administration/js/theme.init.js" defer', html)
+
+    def test_build_bundle_has_single_charset(self):
+        css = build_bundle("base.css", settings.STATIC_BUNDLES["base.css"][:2])
+        self.assertTrue(css.startswith('@charset "UTF-8";'))
+        self.assertEqual(css.count("@charset"), 1)
+
+
+class StaticFilesMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        (root / "bundles").mkdir()
+        (root / "bundles" / "app.0123456789ab.css").write_text("body{color:red}" * 100)
+        (root / "bundles" / "app.0123456789ab.css.gz").write_bytes(gzip.compress(b"x"))
+        (root / "bundles" / "app.0123456789ab.css.br").write_bytes(b"br")
+        (root / "robots.txt").write_text("User-agent: *")
+        with self.settings(STATIC_ROOT=root, STATIC_URL="/static/", DEBUG=False, STATIC_SERVE=True):
+            self.middleware = StaticFilesMiddleware(lambda request: HttpResponse("app"))
+        self.factory = RequestFactory()
+
+    def get(self, path, **headers):
+        return self.middleware(self.factory.get(path, headers=headers))
+
+    def test_hashed_file_is_immutable_and_precompressed(self):
+        response = self.get("/static/bundles/app.0123456789ab.css", accept_encoding="gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(b"".join(response.streaming_content), b"br")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertNotIn("Content-Disposition", response)
+        response = self.get("/static/bundles/app.0123456789ab.css", accept_encoding="gzip, br;q=0")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Encoding", self.get("/static/bundles/app.0123456789ab.css"))
+
+    def test_unhashed_file_revalidates_with_etag(self):
+        response = self.get("/static/robots.txt")
+        self.assertIn("must-revalidate", response["Cache-Control"])
+        self.assertEqual(self.get("/static/robots.txt", if_none_match=response["ETag"]).status_code, 304)
+
+    def test_unknown_paths_fall_through(self):
+        self.assertEqual(self.get("/static/missing.css").content, b"app")
+        self.assertEqual(self.get("/static/../config/settings.py").content, b"app")
+
+
+class ConcurrencyLimitMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        # Una puerta por ruta, compartida por sus peticiones
+        self.gates = collections.defaultdict(asyncio.Event)
+
+        async def app(scope, receive, send):
+            # Cabeceras, espera a que el test abra la puerta y cierra el cuerpo
+            gate = self.gates[scope["path"]]
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await gate.wait()
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        self.middleware = ConcurrencyLimitMiddleware(app, 1, ["/dashboard/events/"])
+
+    async def request(self, path):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        task = asyncio.create_task(self.middleware({"type": "http", "path": path}, None, send))
+        await asyncio.sleep(0)
+        return task, messages
+
+    async def test_requests_over_the_limit_get_503(self):
+        first, messages = await self.request("/empleados/")
+        second, rejected = await self.request("/modalidades/")
+        await second
+        self.assertEqual(rejected[0]["status"], 503)
+        self.gates["/empleados/"].set()
+        await first
+        self.assertEqual(messages[-1]["body"], b"ok")
+        third, messages = await self.request("/modalidades/")
+        self.gates["/modalidades/"].set()
+        await third
+        self.assertEqual(messages[0]["status"], 200)
+
+    async def test_streams_release_their_slot_after_headers(self):
+        streams = [await self.request("/dashboard/events/") for _ in range(3)]
+        self.assertEqual([messages[0]["status"] for _task, messages in streams], [200] * 3)
+        task, messages = await self.request("/empleados/")
+        self.gates["/empleados/"].set()
+        await task
+        self.assertEqual(messages[0]["status"], 200)
+        self.gates["/dashboard/events/"].set()
+        await asyncio.gather(*(task for task, _messages in streams))
+
+
+class IncrementalCollectstaticTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source = Path(tmp.name) / "src"
+        self.root = Path(tmp.name) / "root"
+        (self.source / "css").mkdir(parents=True)
+        (self.source / "img").mkdir()
+        (self.source / "video").mkdir()
+        (self.source / "css" / "site.css").write_text("body{background:url(../img/logo.png)}")
+        (self.source / "img" / "logo.png").write_bytes(b"png")
+        (self.source / "video" / "intro.mp4").write_bytes(b"mp4")
+        overrides = self.settings(
+            STATICFILES_DIRS=[self.source], STATIC_ROOT=self.root,
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATIC_PROFILES={"production": {"exclude": ["video"]}, "full": {}}, STATIC_PROFILE="production",
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def collect(self, **options):
+        out = io.StringIO()
+        call_command("collectstatic_incremental", interactive=False, stdout=out, **options)
+        return out.getvalue()
+
+    def manifest(self):
+        return json.loads((self.root / "staticfiles.json").read_text())["paths"]
+
+    def test_only_changed_files_are_copied(self):
+        self.collect()
+        self.assertTrue((self.root / "css" / "site.css").exists())
+        self.assertFalse((self.root / "video").exists())
+        first = self.manifest()
+        self.assertIn("0 copiado(s), 2 sin cambios", self.collect())
+
+        # Un touch sin cambio de contenido no copia; cambiar la imagen reprocesa el CSS que la usa
+        os.utime(self.source / "css" / "site.css")
+        (self.source / "img" / "logo.png").write_bytes(b"png2")
+        self.assertIn("1 copiado(s), 1 sin cambios", self.collect())
+        second = self.manifest()
+        self.assertNotEqual(first["img/logo.png"], second["img/logo.png"])
+        self.assertNotEqual(first["css/site.css"], second["css/site.css"])
+        self.assertIn(second["img/logo.png"].rpartition("/")[2], (self.root / second["css/site.css"]).read_text())
+
+    def test_profile_and_removed_sources(self):
+        self.collect(profile="full")
+        self.assertTrue((self.root / "video" / "intro.mp4").exists())
+        (self.source / "img" / "logo.png").unlink()
+        (self.source / "css" / "site.css").write_text("body{}")
+        self.collect()
+        self.assertFalse((self.root / "video").exists())
+        self.assertFalse((self.root / "img" / "logo.png").exists())
+        self.assertEqual(set(self.manifest()), {"css/site.css"})
+
+
+class MediaViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from users.models import CustomUser
+
+        cls.user = CustomUser.objects.create_user("media@example.com", "x")
+        cls.user.user_permissions.add(Permission.objects.get(codename="view_group"))
+        cls.stranger = CustomUser.objects.create_user("stranger@example.com", "x")
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        (Path(tmp.name) / "employees").mkdir()
+        (Path(tmp.name) / "employees" / "foto.jpg").write_bytes(bytes(range(100)))
+        (Path(tmp.name) / "secret.txt").write_text("x")
+        overrides = self.settings(MEDIA_ROOT=tmp.name, MEDIA_ACCEL="")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.client.force_login(self.user)
+        self.url = reverse("media", kwargs={"path": "employees/foto.jpg"})
+
+    def test_permission_is_checked(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.stranger)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.user)
+        for path in ("secret.txt", "employees/../secret.txt", "employees/otra.jpg"):
+            self.assertEqual(self.client.get(f"/media/{path}").status_code, 404, path)
+
+    def test_file_with_etag_and_ranges(self):
+        response = self.client.get(self.url)
+        self.assertEqual(b"".join(response.streaming_content), bytes(range(100)))
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertNotIn("Content-Disposition", response)
+        etag = response["ETag"]
+        self.assertEqual(self.client.get(self.url, headers={"if_none_match": etag}).status_code, 304)
+
+        response = self.client.get(self.url, headers={"range": "bytes=10-19"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 10-19/100")
+        self.assertEqual(b"".join(response.streaming_content), bytes(range(10, 20)))
+        response = self.client.get(self.url, headers={"range": "bytes=10-19", "if_range": '"otro"'})
+        self.assertEqual(response.status_code, 200)
+        # Consumir en vez de response.close(): request_finished cerraría la conexión del TestCase
+        self.assertEqual(b"".join(response.streaming_content), bytes(range(100)))
+        self.assertEqual(self.client.get(self.url, headers={"range": "bytes=500-"}).status_code, 416)
+
+    def test_proxy_sends_the_file(self):
+        with self.settings(MEDIA_ACCEL="nginx", MEDIA_ACCEL_PREFIX="/protected-media/"):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], "/protected-media/employees/foto.jpg")
+        self.assertEqual(response.content, b"")
+        with self.settings(MEDIA_ACCEL="sendfile"):
+            response = self.client.get(self.url)
+        self.assertTrue(response["X-Sendfile"].endswith("employees/foto.jpg"))
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range("bytes=0-", 10), (0, 9))
+        self.assertEqual(parse_range("bytes=-3", 10), (7, 9))
+        self.assertEqual(parse_range("bytes=5-50", 10), (5, 9))
+        self.assertIsNone(parse_range("bytes=0-1,4-5", 10))
+        self.assertIsNone(parse_range("items=0-1", 10))
+        with self.assertRaises(ValueError):
+            parse_range("bytes=10-", 10)
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        overrides = self.settings(MEDIA_ROOT=tmp.name)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.storage = ContentAddressedStorage()
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.storage.save("employees/foto.JPG", ContentFile(b"imagen"))
+        second = self.storage.save("employees/otra.jpg", ContentFile(b"imagen"))
+        self.assertEqual(first, second)
+        self.assertRegex(first, r"^employees/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$")
+        self.assertNotEqual(self.storage.save("employees/foto.jpg", ContentFile(b"otra")), first)
+        self.assertEqual(len([p for p in self.root.rglob("*") if p.is_file()]), 2)
+
+    def test_referenced_blob_survives_delete_and_gc(self):
+        from employees.models import Employee
+
+        data = seed_sample_data(employees=2, groups=1, categories=1, sub_per_category=1, students=0, enrollments=0)
+        shared = self.storage.save("employees/a.jpg", ContentFile(b"compartida"))
+        orphan = self.storage.save("employees/b.jpg", ContentFile(b"reemplazada"))
+        Employee.objects.update(picture=shared)
+        self.assertEqual(self.storage.reference_count(shared), 2)
+
+        data["employee"].delete()
+        self.storage.delete(shared)
+        self.assertTrue(self.storage.exists(shared))
+        (self.root / "employees" / ".upload-interrumpida").write_bytes(b"x")
+
+        out = io.StringIO()
+        call_command("gc_media", grace_minutes=0, stdout=out)
+        self.assertIn("Eliminados 2 archivo(s)", out.getvalue())
+        self.assertTrue(self.storage.exists(shared))
+        self.assertFalse(self.storage.exists(orphan))
+
+    def test_reused_orphan_is_not_collected(self):
+        name = self.storage.save("employees/a.jpg", ContentFile(b"huerfana"))
+        path = self.root / name
+        old = time.time() - 2 * 3600
+        os.utime(path, (old, old))
+        # Misma imagen subida otra vez; su fila aún no se confirma
+        self.assertEqual(self.storage.save("employees/b.jpg", ContentFile(b"huerfana")), name)
+        self.assertGreater(path.stat().st_mtime, old)
+        call_command("gc_media", grace_minutes=60, stdout=io.StringIO())
+        self.assertTrue(path.exists())
+
+    def test_content_addressed_media_is_immutable(self):
+        from users.models import CustomUser
+
+        name = self.storage.save("employees/foto.jpg", ContentFile(b"imagen"))
+        (self.root / "employees" / "anterior.jpg").write_bytes(b"imagen")
+        user = CustomUser.objects.create_user("cas@example.com", "x")
+        user.user_permissions.add(Permission.objects.get(codename="view_group"))
+        self.client.force_login(user)
+        response = self.client.get(f"/media/{name}")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(b"".join(response.streaming_content), b"imagen")
+        response = self.client.get("/media/employees/anterior.jpg")
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertEqual(b"".join(response.streaming_content), b"imagen")
+
+
+class CacheInvalidationBusTests(SimpleTestCase):
+    """utils.invalidation sin PostgreSQL: el listener y el fence simulados."""
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(invalidation, "enabled", return_value=True),
+            mock.patch.object(invalidation.listener, "ensure_started"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Con PostgreSQL el listener real pudo quedar conectado por tests anteriores: se restaura
+        connected = invalidation.listener.connected.is_set()
+        self.addCleanup(invalidation.listener.connected.set if connected else invalidation.listener.connected.clear)
+        invalidation.listener.connected.set()
+
+    def build(self, builder):
+        return get_or_build(Permission, "bus-test", builder)
+
+    def test_notification_evicts_local_entry(self):
+        builder = mock.Mock(side_effect=[1, 2])
+        self.assertEqual((self.build(builder), self.build(builder)), (1, 1))
+        version = get_version("auth.permission")
+        invalidation.listener.handle("auth.permission")
+        self.assertEqual(get_version("auth.permission"), version + 1)
+        self.assertEqual(self.build(builder), 2)
+
+    def test_local_cache_unused_while_disconnected(self):
+        invalidation.listener.connected.clear()
+        builder = mock.Mock(side_effect=[1, 2])
+        self.assertEqual((self.build(builder), self.build(builder)), (1, 2))
+
+    def test_sync_token_wakes_waiter(self):
+        waiter = invalidation.listener.waiters["sync:1:abc"] = mock.Mock()
+        invalidation.listener.handle("sync:1:abc")
+        waiter.set.assert_called_once_with()
+        self.assertNotIn("sync:1:abc", invalidation.listener.waiters)
+
+    def test_fence_cookie_after_write(self):
+        def view(request):
+            # Lo que hace publish() dentro de bump_version
+            invalidation._writes.get().add("auth.group")
+            return HttpResponse()
+
+        response = CacheFenceMiddleware(view)(RequestFactory().get("/"))
+        self.assertEqual(response.cookies[settings.CACHE_FENCE_COOKIE]["max-age"], settings.CACHE_FENCE_SECONDS)
+        response = CacheFenceMiddleware(lambda request: HttpResponse())(RequestFactory().get("/"))
+        self.assertNotIn(settings.CACHE_FENCE_COOKIE, response.cookies)
+
+    def test_unconfirmed_fence_bypasses_local_cache(self):
+        request = RequestFactory().get("/")
+        request.COOKIES[settings.CACHE_FENCE_COOKIE] = "1"
+        usable = []
+
+        def view(request):
+            usable.append(invalidation.local_cache_usable())
+            return HttpResponse()
+
+        with mock.patch.object(invalidation.listener, "sync", return_value=False) as sync:
+            CacheFenceMiddleware(view)(request)
+        sync.assert_called_once_with(settings.CACHE_FENCE_TIMEOUT)
+        with mock.patch.object(invalidation.listener, "sync", return_value=True):
+            CacheFenceMiddleware(view)(request)
+        self.assertEqual(usable, [False, True])
+        self.assertTrue(invalidation.local_cache_usable())
+
+
+# Un worker: espera a que el label cambie en su caché local e imprime cuándo
+BUS_WORKER = """
+import sys, time
+import django
+django.setup()
+from django.db import connections
+connections["default"].settings_dict["NAME"] = sys.argv[1]
+from utils import invalidation
+from utils.cache import get_version
+invalidation.listener.ensure_started()
+if not invalidation.listener.connected.wait(10):
+    sys.exit("sin listener")
+before = get_version(sys.argv[2])
+print("ready", flush=True)
+while get_version(sys.argv[2]) == before:
+    time.sleep(0.0005)
+print(time.time(), flush=True)
+"""
+
+
+class CacheInvalidationPropagationTests(TransactionTestCase):
+    @postgres_only
+    def test_invalidation_reaches_other_processes(self):
+        label = "modalities.category"
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-c", BUS_WORKER, connection.settings_dict["NAME"], label],
+                cwd=settings.BASE_DIR, stdout=subprocess.PIPE, text=True,
+            )
+            for _ in range(3)
+        ]
+        try:
+            for worker in workers:
+                self.assertEqual(worker.stdout.readline().strip(), "ready")
+            sent = time.time()
+            bump_version(label)
+            latencies = [float(worker.communicate(timeout=10)[0]) - sent for worker in workers]
+        finally:
+            for worker in workers:
+                worker.kill()
+        # Típicamente ~1 ms en local; el margen es para máquinas de CI cargadas
+        self.assertLess(max(latencies), 0.5, latencies)
+
+    @postgres_only
+    def test_sync_confirms_read_your_writes(self):
+        invalidation.listener.ensure_started()
+        self.assertTrue(invalidation.listener.connected.wait(10))
+        self.assertTrue(invalidation.listener.sync(1))
@@ -15,17 +15,20 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path, reverse_lazy
-from employees.views import DashboardView
+from employees.views import AsyncDashboardView, DashboardEventsView, DashboardView
 from users.forms import LoginForm
+from utils.views import MediaView, MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('',DashboardView.as_view(), name='dashboard'),
+    path('', (AsyncDashboardView if settings.ASYNC_VIEWS else DashboardView).as_view(), name='dashboard'),
+    path('dashboard/events/', DashboardEventsView.as_view(), name='dashboard_events'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path(f'{settings.MEDIA_URL.strip("/")}/<path:path>', MediaView.as_view(), name='media'),
 
     path('accounts/login/', auth_views.LoginView.as_view(
         template_name='registration/login.html',
@@ -50,6 +53,7 @@ urlpatterns = [
     path('accounts/reset/done/', auth_views.PasswordResetCompleteView.as_view(
         template_name='registration/password_reset_complete.html'
     ), name='password_reset_complete'),
+    path('api/', include('api.urls')),
     path('employees/', include('employees.urls')),
     # path('', include('enrollments.urls')),
     path('accounts/', include('django.contrib.auth.urls')),
@@ -60,4 +64,3 @@ urlpatterns = [
 
 if settings.DEBUG:
     urlpatterns += staticfiles_urlpatterns()
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employees'
+
+    def ready(self):
+        from utils.db_functions import register_sqlite_functions
+
+        # unaccent() para SQLite (modo de tests en memoria)
+        connection_created.connect(register_sqlite_functions, dispatch_uid='utils.sqlite_unaccent')
@@ -4,22 +4,47 @@ from django import forms
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.models import Group, Permission
 from django.db import transaction
+from django.db.models import CharField, Value
 from django.forms import ModelForm
 
 from .models import Employee
 from users.models import CustomUser
+from utils.forms import CachedModelChoiceField
 
 
-def copy_group_permissions(user: CustomUser, group: Group) -> None:
+def copy_group_permissions(user: CustomUser, group: Group, new_user: bool = False) -> None:
     """
     Copia TODOS los permisos del grupo al usuario (sin asignar el grupo).
     Nota: set() reemplaza cualquier permiso previo del usuario.
+    - new_user=True: el usuario no tiene permisos todavía; se insertan
+      directamente en un solo INSERT sin leer los existentes.
     """
     if group is None:
         return
-    perms = group.permissions.all()
-    user.user_permissions.set(perms)
-    user.save(update_fields=[])
+    if new_user:
+        through = CustomUser.user_permissions.through
+        through.objects.bulk_create([
+            through(customuser_id=user.pk, permission_id=perm_id)
+            for perm_id in group.permissions.values_list("id", flat=True)
+        ])
+        return
+    user.user_permissions.set(group.permissions.all())
+
+
+def find_unique_conflicts(checks) -> set:
+    """
+    Resuelve varias validaciones de unicidad en UNA consulta (UNION ALL).
+    - checks: lista de (nombre_campo, queryset_que_no_debe_tener_filas).
+    - Devuelve el conjunto de nombres de campo con conflicto.
+    """
+    queries = [
+        qs.order_by().annotate(conflict_field=Value(name, output_field=CharField())).values_list("conflict_field", flat=True)
+        for name, qs in checks
+    ]
+    if not queries:
+        return set()
+    combined = queries[0].union(*queries[1:], all=True) if len(queries) > 1 else queries[0]
+    return set(combined)
 
 class BaseEmployeeForm(ModelForm):
     """
@@ -65,18 +90,16 @@ class BaseEmployeeForm(ModelForm):
         if self.instance and self.instance.pk and self.instance.birthdate:
             self.initial["birthdate"] = self.instance.birthdate.strftime("%Y-%m-%d")
 
+    # Mensajes para campos únicos (validación y IntegrityError)
+    unique_error_messages = {
+        "reference": "Esta referencia ya existe.",
+        "email": "Este correo ya está registrado.",
+    }
+
     # --- Validaciones de Employee ---
     def clean_reference(self):
-        ref = (self.cleaned_data.get("reference") or "").strip()
-        if not ref:
-            return ref
-        qs = Employee.objects.filter(reference=ref)
-        # Si es edición, excluir la instancia actual
-        if self.instance and self.instance.pk:
-            qs = qs.exclude(pk=self.instance.pk)
-        if qs.exists():
-            raise forms.ValidationError("Esta referencia ya existe.")
-        return ref
+        # La unicidad se valida en validate_unique() junto con los demás campos únicos
+        return (self.cleaned_data.get("reference") or "").strip()
 
     def clean_birthdate(self):
         birthdate = self.cleaned_data.get("birthdate")
@@ -84,6 +107,48 @@ class BaseEmployeeForm(ModelForm):
             raise forms.ValidationError("La fecha de nacimiento no puede ser futura.")
         return birthdate
 
+    # --- Unicidad en una sola consulta ---
+    def get_unique_checks(self):
+        """(campo, queryset) por cada campo único a validar; las subclases agregan los suyos."""
+        ref = self.cleaned_data.get("reference")
+        if not ref:
+            return []
+        # Única solo entre activos (employee_active_reference_uniq)
+        qs = Employee.objects.active().filter(reference=ref)
+        # Si es edición, excluir la instancia actual
+        if self.instance and self.instance.pk:
+            qs = qs.exclude(pk=self.instance.pk)
+        return [("reference", qs)]
+
+    def add_unique_errors(self, checks=None) -> bool:
+        """Agrega el error de cada campo en conflicto; devuelve True si hubo alguno."""
+        checks = self.get_unique_checks() if checks is None else checks
+        conflicts = find_unique_conflicts(checks)
+        for name in conflicts:
+            self.add_error(name, self.unique_error_messages[name])
+        return bool(conflicts)
+
+    def _get_validation_exclusions(self):
+        # La restricción parcial de reference ya la resuelve get_unique_checks (sin otra consulta)
+        return super()._get_validation_exclusions() | {"reference"}
+
+    def validate_unique(self):
+        checks = [(name, qs) for name, qs in self.get_unique_checks() if name not in self.errors]
+        self.add_unique_errors(checks)
+        # El resto de restricciones únicas del modelo, sin repetir las ya validadas
+        exclude = self._get_validation_exclusions() | {name for name, _ in checks}
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except forms.ValidationError as e:
+            self._update_errors(e)
+
+    def handle_integrity_error(self) -> bool:
+        """
+        Tras un IntegrityError en save() (dos envíos simultáneos pasaron la validación),
+        traduce la restricción violada a errores de campo. True si se pudo traducir.
+        """
+        return self.add_unique_errors()
+
 
 class UserFieldsMixin(forms.Form):
     """
@@ -133,16 +198,20 @@ class UserFieldsMixin(forms.Form):
             self.fields[name].widget.attrs["autocomplete"] = "off"
 
     def clean_email(self):
-        # Normalizar y validar unicidad respetando edición
-        email = (self.cleaned_data.get("email") or "").strip().lower()
-        qs = CustomUser.objects.filter(email=email)
-        instance = getattr(self, "instance", None)
-        # Si estamos editando y el employee tiene user, excluirlo
-        if instance and getattr(instance, "user_id", None):
-            qs = qs.exclude(pk=instance.user_id)
-        if qs.exists():
-            raise forms.ValidationError("Este correo ya está registrado.")
-        return email
+        # Solo normaliza; la unicidad se valida junto con la referencia (validate_unique)
+        return (self.cleaned_data.get("email") or "").strip().lower()
+
+    def get_unique_checks(self):
+        checks = super().get_unique_checks()
+        email = self.cleaned_data.get("email")
+        if email:
+            qs = CustomUser.objects.filter(email=email)
+            instance = getattr(self, "instance", None)
+            # Si estamos editando y el employee tiene user, excluirlo
+            if instance and getattr(instance, "user_id", None):
+                qs = qs.exclude(pk=instance.user_id)
+            checks.append(("email", qs))
+        return checks
 
 
 class PasswordAndGroupMixin(forms.Form):
@@ -154,9 +223,10 @@ class PasswordAndGroupMixin(forms.Form):
         label="Confirmar contraseña",
         widget=forms.PasswordInput(attrs={"class": "form-control", "autocomplete": "off"}),
     )
-    group = forms.ModelChoiceField(
+    group = CachedModelChoiceField(
         label="Grupo",
-        queryset=Group.objects.all(),
+        queryset=Group.objects.order_by("name"),
+        cache_key="groups",
         required=True,
         help_text="Selecciona un grupo para copiar sus permisos al usuario",
         widget=forms.Select(attrs={"class": "form-control"}),
@@ -206,10 +276,14 @@ class EmployeeCreationForm(UserFieldsMixin, PasswordAndGroupMixin, BaseEmployeeF
         pwd = self.cleaned_data["password1"]
         is_active = self.cleaned_data.get("is_active", True)
 
-        user = CustomUser.objects.create_user(email=email, password=pwd, is_active=is_active)
-        user.first_name = (self.cleaned_data.get("first_name") or "").strip()
-        user.last_name = (self.cleaned_data.get("last_name") or "").strip()
-        user.save()
+        # Un solo INSERT con nombres incluidos
+        user = CustomUser.objects.create_user(
+            email=email,
+            password=pwd,
+            is_active=is_active,
+            first_name=(self.cleaned_data.get("first_name") or "").strip(),
+            last_name=(self.cleaned_data.get("last_name") or "").strip(),
+        )
 
         # 2) Crear el empleado asociado (aún sin commitear si commit=False)
         emp = super().save(commit=False)  # ModelForm.save(commit=False)
@@ -219,7 +293,7 @@ class EmployeeCreationForm(UserFieldsMixin, PasswordAndGroupMixin, BaseEmployeeF
 
         # 3) Copiar permisos desde el grupo seleccionado
         selected_group = self.cleaned_data.get("group")
-        copy_group_permissions(user, selected_group)
+        copy_group_permissions(user, selected_group, new_user=True)
 
         return emp
 
@@ -256,7 +330,8 @@ class EmployeeUpdateForm(UserFieldsMixin, BaseEmployeeForm):
         user.first_name = (self.cleaned_data.get("first_name") or "").strip()
         user.last_name = (self.cleaned_data.get("last_name") or "").strip()
         user.is_active = self.cleaned_data.get("is_active", True)
-        user.full_clean()  # valida campos del User
+        # valida campos del User; el email único ya se validó en validate_unique()
+        user.full_clean(validate_unique=False)
         user.save()
 
         # 3) Guardar Employee
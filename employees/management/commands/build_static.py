@@ -0,0 +1,49 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from utils.static import BUNDLE_DIR, build_bundle, compress, find_source
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera los paquetes CSS/JS de settings.STATIC_BUNDLES en static/bundles/, corre collectstatic_incremental "
+        "(nombres con hash) y escribe hermanos .gz/.br. Reporta bytes y peticiones de la primera carga."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--no-collect", action="store_true",
+                            help="Solo genera los paquetes, sin collectstatic ni compresión.")
+
+    def handle(self, *args, **options):
+        bundle_dir = settings.STATICFILES_DIRS[0] / BUNDLE_DIR
+        bundle_dir.mkdir(parents=True, exist_ok=True)
+        before = {"requests": 0, "bytes": 0}
+        for name, sources in settings.STATIC_BUNDLES.items():
+            (bundle_dir / name).write_text(build_bundle(name, sources), encoding="utf-8")
+            before["requests"] += len(sources)
+            before["bytes"] += sum(os.path.getsize(find_source(source)) for source in sources)
+            self.stdout.write(f"{BUNDLE_DIR}/{name}: {len(sources)} archivo(s)")
+        if options["no_collect"]:
+            return
+
+        call_command("collectstatic_incremental", interactive=False, verbosity=0)
+        staticfiles_storage.load_manifest()
+        after = {"requests": 0, "bytes": 0, "minified": 0}
+        for name in settings.STATIC_BUNDLES:
+            hashed = staticfiles_storage.stored_name(f"{BUNDLE_DIR}/{name}")
+            path = staticfiles_storage.path(hashed)
+            sizes = compress(path)
+            after["requests"] += 1
+            after["minified"] += os.path.getsize(path)
+            # Lo que viaja: brotli si está disponible, si no gzip
+            after["bytes"] += sizes.get("br", sizes["gz"])
+            self.stdout.write(f"{hashed}: " + ", ".join(f"{ext} {size:,} B" for ext, size in sizes.items()))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Primera carga (CSS/JS de base.html): {before['requests']} peticiones, {before['bytes']:,} B sin comprimir "
+            f"-> {after['requests']} peticiones, {after['minified']:,} B minificados, {after['bytes']:,} B comprimidos."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.indexes import sort_index_plan
+
+
+class Command(BaseCommand):
+    help = (
+        "Revisa que cada campo ordenable de las listas (allowed_sort_fields y default_ordering) "
+        "tenga un índice que lo encabece. Termina con error si falta alguno."
+    )
+
+    def handle(self, *args, **options):
+        missing = 0
+        for view, path, model, name, index in sort_index_plan():
+            target = f"{model._meta.db_table}.{name}"
+            if index:
+                self.stdout.write(f"{view.__qualname__:<24} {path:<28} {target:<44} {index}")
+            else:
+                missing += 1
+                self.stdout.write(self.style.ERROR(f"{view.__qualname__:<24} {path:<28} {target:<44} SIN ÍNDICE"))
+        if missing:
+            raise CommandError(f"{missing} campo(s) ordenable(s) sin índice.")
+        self.stdout.write(self.style.SUCCESS("Todos los campos ordenables tienen índice."))
@@ -0,0 +1,179 @@
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.contrib.staticfiles.management.commands import collectstatic
+from django.core.management.base import CommandError
+
+STATE_FILE = ".collectstatic-state.json"
+
+
+def file_digest(path):
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+class Command(collectstatic.Command):
+    help = (
+        "collectstatic incremental: guarda tamaño, mtime y hash de cada archivo fuente en STATIC_ROOT "
+        "y solo copia y post-procesa lo que cambió. Aplica el perfil de settings.STATIC_PROFILES "
+        "(include/exclude) y borra del destino lo que el perfil excluye."
+    )
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument("--profile", default=None,
+                            help="Perfil de settings.STATIC_PROFILES (por defecto STATIC_PROFILE).")
+
+    def set_options(self, **options):
+        super().set_options(**options)
+        name = options.get("profile") or settings.STATIC_PROFILE
+        try:
+            profile = settings.STATIC_PROFILES[name]
+        except KeyError:
+            raise CommandError(f"Perfil desconocido '{name}'. Disponibles: {', '.join(settings.STATIC_PROFILES)}.")
+        self.profile_name = name
+        self.includes = list(profile.get("include", []))
+        self.excludes = list(profile.get("exclude", []))
+        # Los finders comparan los patrones con la ruta completa de cada archivo
+        self.ignore_patterns += [f"{prefix.rstrip('/')}/*" for prefix in self.excludes]
+
+    def included(self, prefixed_path):
+        return not self.includes or any(
+            prefixed_path.startswith(f"{prefix.rstrip('/')}/") or fnmatch.fnmatch(prefixed_path, prefix)
+            for prefix in self.includes
+        )
+
+    # --- Estado ---
+    def state_path(self):
+        return os.path.join(self.storage.location, STATE_FILE)
+
+    def load_state(self):
+        if self.clear:
+            return {}
+        try:
+            with open(self.state_path(), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, state):
+        if not self.dry_run:
+            with open(self.state_path(), "w", encoding="utf-8") as fh:
+                json.dump(state, fh, sort_keys=True)
+
+    # --- Recolección ---
+    def collect(self):
+        if self.symlink:
+            raise CommandError("collectstatic_incremental no soporta --link.")
+        if not self.is_local_storage():
+            raise CommandError("collectstatic_incremental requiere STATIC_ROOT local.")
+        started = time.perf_counter()
+        if self.clear:
+            self.clear_dir("")
+        state = self.load_state()
+
+        found = {}
+        for finder in get_finders():
+            for path, storage in finder.list(self.ignore_patterns):
+                prefixed = os.path.join(storage.prefix, path) if getattr(storage, "prefix", None) else path
+                if prefixed not in found and self.included(prefixed):
+                    found[prefixed] = (storage, path)
+
+        changed = {}
+        for prefixed, (storage, path) in found.items():
+            source = storage.path(path)
+            stat = os.stat(source)
+            entry = state.get(prefixed)
+            shipped = self.storage.exists(prefixed)
+            if entry and shipped and (entry[:2] == [stat.st_size, stat.st_mtime_ns] or self.same_content(entry, source, prefixed)):
+                state[prefixed] = [stat.st_size, stat.st_mtime_ns, entry[2]]
+                self.unmodified_files.append(prefixed)
+                continue
+            # Archivo nuevo o distinto: el hash se calcula hasta que su mtime cambie
+            state[prefixed] = [stat.st_size, stat.st_mtime_ns, None]
+            self.copy_changed(source, prefixed)
+            changed[prefixed] = (storage, path)
+
+        removed = self.remove_stale(state, found)
+        if self.post_process and hasattr(self.storage, "post_process") and (changed or removed):
+            self.post_process_changed(found, changed, removed)
+        self.save_state(state)
+        self.log(
+            f"Perfil '{self.profile_name}': {len(changed)} copiado(s), {len(self.unmodified_files)} sin cambios, "
+            f"{len(removed)} eliminado(s) en {time.perf_counter() - started:.2f} s.",
+            level=1,
+        )
+        return {
+            "modified": self.copied_files,
+            "unmodified": self.unmodified_files,
+            "post_processed": self.post_processed_files,
+        }
+
+    def same_content(self, entry, source, prefixed):
+        """Cambió el mtime (checkout, touch): el hash decide; sin hash previo se compara con la copia."""
+        digest = file_digest(source)
+        previous = entry[2] or file_digest(self.storage.path(prefixed))
+        entry[2] = digest
+        return digest == previous
+
+    def copy_changed(self, source, prefixed):
+        self.log(f"Copying '{source}'", level=2)
+        if not self.dry_run:
+            target = self.storage.path(prefixed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # copyfile usa copy_file_range/sendfile del kernel
+            shutil.copyfile(source, target)
+        self.copied_files.append(prefixed)
+
+    def remove_stale(self, state, found):
+        """Quita del destino lo que ya no es fuente o que el perfil excluye (con su versión con hash)."""
+        hashed = getattr(self.storage, "hashed_files", {})
+        removed = [name for name in state if name not in found]
+        for name in removed:
+            del state[name]
+            for target in {name, hashed.get(name, name)}:
+                for suffix in ("", ".gz", ".br"):
+                    if not self.dry_run and self.storage.exists(target + suffix):
+                        self.storage.delete(target + suffix)
+        for prefix in self.excludes:
+            directory = self.storage.path(prefix.rstrip("/"))
+            if os.path.isdir(directory) and not self.dry_run:
+                shutil.rmtree(directory)
+        return removed
+
+    def post_process_changed(self, found, changed, removed):
+        """
+        Post-procesa lo copiado y los CSS/JS que lo referencian (su url() con hash cambia);
+        el resto del manifest se conserva.
+        """
+        previous = {name: hashed for name, hashed in getattr(self.storage, "hashed_files", {}).items()
+                    if name not in removed}
+        adjustable = tuple(pattern.lstrip("*") for pattern, _ in getattr(self.storage, "patterns", ()))
+        changed_names = {os.path.basename(name) for name in changed}
+        targets = dict(changed)
+        if any(not name.endswith(adjustable) for name in changed):
+            for name, (storage, path) in found.items():
+                if name in targets or not name.endswith(adjustable):
+                    continue
+                with storage.open(path) as fh:
+                    content = fh.read().decode("utf-8", errors="ignore")
+                if any(basename in content for basename in changed_names):
+                    targets[name] = (storage, path)
+
+        for original_path, processed_path, processed in self.storage.post_process(targets, dry_run=self.dry_run):
+            if isinstance(processed, Exception):
+                self.stderr.write("Post-processing '%s' failed!" % original_path)
+                self.stderr.write()
+                raise processed
+            if processed:
+                self.log("Post-processed '%s' as '%s'" % (original_path, processed_path), level=2)
+                self.post_processed_files.append(original_path)
+        if not self.dry_run and hasattr(self.storage, "save_manifest"):
+            self.storage.hashed_files = {**previous, **self.storage.hashed_files}
+            self.storage.save_manifest()
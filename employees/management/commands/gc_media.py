@@ -0,0 +1,62 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.storage import TEMP_PREFIX, ContentAddressedStorage, is_content_addressed, referenced_names
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra de MEDIA_ROOT los blobs por contenido que ninguna fila referencia (imágenes reemplazadas "
+        "o de formularios que fallaron) y los temporales de subidas interrumpidas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-minutes", type=int, default=60,
+                            help="No toca archivos más recientes: su fila puede no estar confirmada aún.")
+        parser.add_argument("--legacy", action="store_true",
+                            help="También borra archivos sin referencia con nombre anterior (no por contenido).")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError("STORAGES['default'] no es utils.storage.ContentAddressedStorage.")
+        root = str(settings.MEDIA_ROOT)
+        cutoff = time.time() - options["grace_minutes"] * 60
+        # Después del corte: lo que se sube mientras tanto es más reciente y no se toca
+        referenced = referenced_names()
+
+        removed, freed, kept = 0, 0, 0
+        for dirpath, _dirs, files in os.walk(root):
+            for filename in files:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                orphan = filename.startswith(TEMP_PREFIX) or (
+                    name not in referenced and (options["legacy"] or is_content_addressed(name))
+                )
+                if not orphan:
+                    kept += 1
+                    continue
+                if not options["dry_run"]:
+                    # Justo antes de borrar: store() renueva el mtime de un blob que vuelve a subirse
+                    try:
+                        if os.stat(path).st_mtime > cutoff:
+                            kept += 1
+                            continue
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        continue
+                self.stdout.write(f"Eliminando {name}", self.style.WARNING)
+                removed += 1
+                freed += stat.st_size
+
+        verb = "Se eliminarían" if options["dry_run"] else "Eliminados"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {removed} archivo(s), {freed / 2**20:.1f} MB; {kept} referenciado(s) o anteriores conservados."
+        ))
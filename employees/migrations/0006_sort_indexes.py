@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 11:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_timestamps'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='employee',
+            options={'verbose_name': 'Empleado', 'verbose_name_plural': 'Empleados'},
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['phone_number', 'id'], name='employee_phone_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['commission_general_public', 'id'], name='employee_commission_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 12:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_sort_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employee',
+            name='reference',
+            field=models.CharField(max_length=6, verbose_name='Referencia'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(condition=models.Q(('archived_at__isnull', True)), fields=('reference',), name='employee_active_reference_uniq', violation_error_message='Esta referencia ya existe.'),
+        ),
+    ]
@@ -1,8 +1,61 @@
 from django.conf import settings
 from django.db import models, transaction
+from django.db.models import CharField, F, Q, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
 
+from utils.deletion import raw_cascade_delete
+from tracking.versions import mark_changed
+from utils.models import ArchivableModel, ArchivableQuerySet, DetailFieldsMixin, TimestampedModel, touch
 
-class Employee(models.Model):
+
+# Correo de un usuario archivado: "archived:<id>" deja libre el original para otra cuenta y cabe
+# siempre en max_length; el original queda en CustomUser.archived_email hasta restaurarlo
+ARCHIVED_EMAIL_PREFIX = "archived:"
+
+
+def archived_email():
+    return Concat(Value(ARCHIVED_EMAIL_PREFIX), Cast("id", CharField()), output_field=CharField())
+
+
+class EmployeeQuerySet(ArchivableQuerySet):
+    @transaction.atomic
+    def archive(self, when=None):
+        """Archiva, desactiva el usuario (no puede iniciar sesión) y libera su correo."""
+        from users.models import CustomUser
+
+        when = when or timezone.now()
+        CustomUser.objects.filter(employee__in=self.active()).update(
+            # El SET lee los valores previos a la actualización: archived_email recibe el correo original
+            is_active=False, archived_email=F("email"), email=archived_email(), **touch(CustomUser, when)
+        )
+        mark_changed(CustomUser)
+        return super().archive(when)
+
+    @transaction.atomic
+    def restore(self):
+        """Recupera el correo del usuario (IntegrityError si otra cuenta ya lo usa); sigue inactivo."""
+        from users.models import CustomUser
+
+        CustomUser.objects.filter(
+            employee__in=self.archived(), archived_email__isnull=False,
+        ).update(email=F("archived_email"), archived_email=None, **touch(CustomUser))
+        mark_changed(CustomUser)
+        return super().restore()
+
+    @transaction.atomic
+    def hard_delete(self):
+        """Borra empleados, sus usuarios y dependientes (inscripciones) sin Collector."""
+        from users.models import CustomUser
+
+        # Ids materializados: la subconsulta dejaría de encontrarlos al borrar empleados
+        user_ids = list(self.values_list("user_id", flat=True))
+        count = super().hard_delete()
+        raw_cascade_delete(CustomUser.objects.filter(pk__in=user_ids))
+        return count
+
+
+class Employee(DetailFieldsMixin, TimestampedModel, ArchivableModel):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -17,33 +70,54 @@ class Employee(models.Model):
     picture = models.ImageField(upload_to='employees', verbose_name="Imagen")
     reference = models.CharField(
         max_length=6,
-        unique=True,
         verbose_name="Referencia"
     )
 
+    objects = EmployeeQuerySet.as_manager()
+
+    detail_fields = [
+        ("Imagen", "picture", "image"),
+        ("Correo electrónico", "user__email", "text"),
+        ("Nombre(s)", "user__first_name", "text"),
+        ("Apellidos", "user__last_name", "text"),
+        ("Referencia", "reference", "text"),
+        ("Dirección", "address", "text"),
+        ("Fecha de nacimiento", "birthdate", "date"),
+        ("Número telefónico", "phone_number", "text"),
+        ("Número telefónico 2", "phone_number_2", "text"),
+        ("Recibe comisión por público en general", "commission_general_public", "boolean"),
+        ("Activo", "user__is_active", "boolean"),
+    ]
+
     class Meta:
-        ordering = ['user__first_name', 'user__last_name']
+        # Única solo entre activos: un empleado archivado no retiene su referencia
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reference"], condition=Q(archived_at__isnull=True), name="employee_active_reference_uniq",
+                violation_error_message="Esta referencia ya existe.",
+            ),
+        ]
+        # Sin Meta.ordering: obligaba un JOIN con users_customuser en cada consulta (también en
+        # conteos y agrupaciones); las listas ordenan explícitamente con default_ordering
+        indexes = [
+            # Conteo y paginación de activos con index-only scan
+            models.Index(fields=["id"], condition=Q(archived_at__isnull=True), name="employee_active_idx"),
+            # Ordenamientos de la lista (utils.indexes); reference usa employee_active_reference_uniq
+            models.Index(fields=["phone_number", "id"], condition=Q(archived_at__isnull=True), name="employee_phone_idx"),
+            models.Index(
+                fields=["commission_general_public", "id"], condition=Q(archived_at__isnull=True),
+                name="employee_commission_idx",
+            ),
+        ]
         verbose_name = "Empleado"
         verbose_name_plural = "Empleados"
 
-    def get_detail_fields(self):
-        return [
-            ("Imagen", self.picture, "image"),
-            ("Correo electrónico", self.user.email, "text"),
-            ("Nombre(s)", self.user.first_name, "text"),
-            ("Apellidos", self.user.last_name, "text"),
-            ("Referencia", self.reference, "text"),
-            ("Dirección", self.address, "text"),
-            ("Fecha de nacimiento", self.birthdate, "date"),
-            ("Número telefónico", self.phone_number, "text"),
-            ("Número telefónico 2", self.phone_number_2, "text"),
-            ("Recibe comisión por público en general", self.commission_general_public, "boolean"),
-            ("Activo", self.user.is_active, "boolean"),
-        ]
+    def archive(self):
+        super().archive()
+        # EmployeeQuerySet.archive ya desactivó al usuario y cambió su correo en la BD
+        self.user.refresh_from_db(fields=["is_active", "email", "archived_email", "updated_at"])
 
     @transaction.atomic
     def delete(self, *args, **kwargs):
-        related_user = self.user
-        super().delete(*args, **kwargs)
-        if related_user:
-            related_user.delete()
+        # Borrar el usuario arrastra al empleado (CASCADE): una sola recolección
+        return self.user.delete(*args, **kwargs)
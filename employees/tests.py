@@ -1,3 +1,430 @@
-from django.test import TestCase
+import io
+import tempfile
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Group, Permission
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections
+from django.db.models.functions import Lower
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path, reverse
+from PIL import Image
+
+from employees.forms import EmployeeCreationForm, EmployeeUpdateForm
+from employees.models import Employee
+from employees.views import EmployeeAsyncDetailView, EmployeeAsyncListView, EmployeeDetailView, EmployeeListView
+from enrollments.models import Enrollment
+from users.models import CustomUser
+from utils.db_functions import Unaccent, unaccent
+from utils.indexes import missing_sort_indexes
+from utils.testing import full_permissions_user, postgres_only, seed_sample_data
+
+
+class UnaccentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_sample_data(employees=16, groups=1, categories=1, students=1, enrollments=0)
+
+    def test_python_unaccent(self):
+        self.assertEqual(unaccent("Ñandú Ibáñez Óscar"), "Nandu Ibanez Oscar")
+        self.assertIsNone(unaccent(None))
+
+    def test_unaccent_annotation_matches_without_accents(self):
+        qs = Employee.objects.annotate(ln_norm=Lower(Unaccent("user__last_name")))
+        self.assertTrue(qs.filter(ln_norm="nunez").exists())
+        self.assertTrue(qs.filter(ln_norm__contains="ibane").exists())
+
+    def test_list_search_is_accent_and_case_insensitive(self):
+        self.client.force_login(full_permissions_user())
+        response = self.client.get(reverse("employees:list"), {"q": "NUÑEZ"})
+        self.assertEqual(response.status_code, 200)
+        emails = {e.user.email for e in response.context["objects"]}
+        expected = set(
+            Employee.objects.filter(user__last_name__in=["Núñez"]).values_list("user__email", flat=True)
+        )
+        self.assertTrue(emails)
+        self.assertTrue(emails <= expected)
+
+    def test_invalid_search_keeps_default_ordering(self):
+        self.client.force_login(full_permissions_user())
+        response = self.client.get(reverse("employees:list"), {"is_active": "foo", "page_size": 5})
+        self.assertFalse(response.context["search_form"].is_valid())
+        view = EmployeeListView(request=RequestFactory().get("/", {"is_active": "foo"}))
+        self.assertTrue(view.get_queryset().ordered)
+        expected = list(Employee.objects.active().order_by("user__email").values_list("pk", flat=True)[:5])
+        self.assertEqual([e.pk for e in response.context["objects"]], expected)
+
+    @postgres_only
+    def test_postgres_unaccent_extension(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT unaccent(%s)", ["Ñandú"])
+            self.assertEqual(cursor.fetchone()[0], "Nandu")
+
+
+def picture_upload(name="foto.gif"):
+    """Imagen mínima válida para el campo picture."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (1, 1)).save(buffer, format="GIF")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/gif")
+
+
+def creation_data(group, reference="NUEVA1", email="nuevo@aula.mx"):
+    return {
+        "email": email,
+        "first_name": "Begoña",
+        "last_name": "Ibáñez",
+        "reference": reference,
+        "address": "Calle Ñandú #1",
+        "birthdate": "1990-05-10",
+        "phone_number": "9991234567",
+        "password1": "contraseña-segura",
+        "password2": "contraseña-segura",
+        "group": group.pk,
+        "is_active": "on",
+    }
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix="aula-tests-"))
+class EmployeeUniquenessTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_sample_data(employees=2, groups=1, categories=0, students=0, enrollments=0)
+        cls.group = cls.data["group"]
+        cls.existing = cls.data["employee"]
+
+    def test_unique_fields_validated_in_one_query(self):
+        form = EmployeeCreationForm(data=creation_data(self.group), files={"picture": picture_upload()})
+        # 1 consulta para el grupo + 1 para toda la unicidad (referencia y correo)
+        with self.assertNumQueries(2):
+            self.assertTrue(form.is_valid(), form.errors)
+
+    def test_duplicate_reference_and_email(self):
+        data = creation_data(self.group, reference=self.existing.reference, email=self.existing.user.email.upper())
+        form = EmployeeCreationForm(data=data, files={"picture": picture_upload()})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["reference"], ["Esta referencia ya existe."])
+        self.assertEqual(form.errors["email"], ["Este correo ya está registrado."])
+
+    def test_update_ignores_own_values(self):
+        data = creation_data(self.group, reference=self.existing.reference, email=self.existing.user.email)
+        form = EmployeeUpdateForm(data=data, files={"picture": picture_upload()}, instance=self.existing)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_archived_employee_frees_reference_and_email(self):
+        email = self.existing.user.email
+        self.existing.archive()
+        self.assertTrue(self.existing.user.email.startswith("archived:"))
+        data = creation_data(self.group, reference=self.existing.reference, email=email)
+        form = EmployeeCreationForm(data=data, files={"picture": picture_upload()})
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        # Restaurar choca con la cuenta nueva: el correo ya no está libre
+        with self.assertRaises(IntegrityError):
+            Employee.objects.filter(pk=self.existing.pk).restore()
+
+    def test_archive_keeps_longest_email(self):
+        # 255 caracteres: "archived:<id>:<correo>" no cabía en la columna (DataError en PostgreSQL)
+        email = f"{'x' * 243}@example.com"
+        CustomUser.objects.filter(pk=self.existing.user_id).update(email=email)
+        self.client.force_login(full_permissions_user())
+        self.client.post(reverse("employees:delete", args=[self.existing.pk]))
+        user = CustomUser.objects.get(pk=self.existing.user_id)
+        self.assertEqual(user.email, f"archived:{user.pk}")
+        self.assertEqual(user.archived_email, email)
+        Employee.objects.filter(pk=self.existing.pk).restore()
+        user.refresh_from_db()
+        self.assertEqual((user.email, user.archived_email), (email, None))
+
+    def test_restore_recovers_email(self):
+        email = self.existing.user.email
+        self.existing.archive()
+        Employee.objects.filter(pk=self.existing.pk).restore()
+        self.existing.user.refresh_from_db()
+        self.assertEqual(self.existing.user.email, email)
+        self.assertFalse(self.existing.user.is_active)
+
+    def test_save_creates_user_in_single_insert(self):
+        form = EmployeeCreationForm(data=creation_data(self.group), files={"picture": picture_upload()})
+        self.assertTrue(form.is_valid(), form.errors)
+        with CaptureQueriesContext(connection) as ctx:
+            employee = form.save()
+        statements = [q["sql"] for q in ctx.captured_queries]
+        # Solo cuenta las tablas del modelo; tracking_tableversion sube su versión en cada escritura
+        self.assertFalse([sql for sql in statements if sql.startswith("UPDATE") and "tracking_tableversion" not in sql])
+        self.assertEqual(employee.user.first_name, "Begoña")
+        self.assertEqual(
+            set(employee.user.user_permissions.values_list("id", flat=True)),
+            set(self.group.permissions.values_list("id", flat=True)),
+        )
+
+    def test_integrity_error_maps_to_field_error(self):
+        # Simula la carrera: la validación no ve la fila que otro envío ya insertó
+        self.client.force_login(full_permissions_user())
+        data = creation_data(self.group, reference=self.existing.reference)
+        data["picture"] = picture_upload()
+        with mock.patch("employees.forms.find_unique_conflicts", side_effect=[set(), {"reference"}]):
+            response = self.client.post(reverse("employees:create"), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["form"].errors["reference"], ["Esta referencia ya existe."])
+        self.assertEqual(Employee.objects.filter(reference=self.existing.reference).count(), 1)
+        self.assertFalse(CustomUser.objects.filter(email="nuevo@aula.mx").exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix="aula-tests-"), UPLOAD_MAX_BYTES=200_000, UPLOAD_MAX_PIXELS=1_000_000)
+class PictureUploadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = seed_sample_data(employees=1, groups=1, categories=0, students=0, enrollments=0)["group"]
+        cls.user = full_permissions_user()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def post(self, upload):
+        data = creation_data(self.group)
+        data["picture"] = upload
+        return self.client.post(reverse("employees:create"), data)
+
+    def image(self, size, format="JPEG", name="foto.png"):
+        buffer = io.BytesIO()
+        Image.new("RGB", size, "white").save(buffer, format=format)
+        return SimpleUploadedFile(name, buffer.getvalue())
+
+    def test_upload_is_hashed_and_named_by_content(self):
+        response = self.post(self.image((40, 30)))
+        self.assertEqual(response.status_code, 302)
+        name = Employee.objects.get(user__email="nuevo@aula.mx").picture.name
+        # Extensión por el contenido (JPEG), no por el nombre que mandó el navegador
+        self.assertRegex(name, r"^employees/[0-9a-f]{2}/[0-9a-f]{64}\.jpg$")
+
+    def test_limits_are_enforced_while_streaming(self):
+        cases = [
+            (self.image((2000, 1000)), "excede el máximo de 1 megapíxeles"),
+            (SimpleUploadedFile("foto.jpg", b"%PDF-1.7" + b"x" * 100), "no es una imagen válida"),
+            (SimpleUploadedFile("foto.jpg", b"\xff\xd8\xff\xe0" + b"\x00" * 300_000), "excede el tamaño máximo"),
+        ]
+        for upload, message in cases:
+            with self.subTest(message):
+                response = self.post(upload)
+                self.assertEqual(response.status_code, 200)
+                errors = response.context["form"].errors["picture"]
+                self.assertEqual(len(errors), 1)
+                self.assertIn(message, errors[0])
+                # Los demás campos se conservan (el resto del archivo se descartó sin leerlo a disco)
+                self.assertEqual(response.context["form"].data["reference"], "NUEVA1")
+        self.assertFalse(Employee.objects.filter(user__email="nuevo@aula.mx").exists())
+
+    def test_csrf_is_still_enforced(self):
+        # La vista está exenta para CsrfViewMiddleware y valida el token ella misma
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        data = creation_data(self.group)
+        data["picture"] = self.image((40, 30))
+        self.assertEqual(client.post(reverse("employees:create"), data).status_code, 403)
+
+    def test_other_views_keep_default_handlers(self):
+        # Un archivo que no es imagen fuera de las vistas de empleados no genera upload_errors
+        attachment = SimpleUploadedFile("notas.pdf", b"%PDF-1.7" + b"x" * 100)
+        response = self.client.post(reverse("users:group_create"), {"name": "Con adjunto", "attachment": attachment})
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Group.objects.filter(name="Con adjunto").exists())
+
+    def test_header_dimensions(self):
+        from utils.uploads import image_size, sniff_type
+
+        for format, content_type in (("JPEG", "image/jpeg"), ("PNG", "image/png"), ("GIF", "image/gif"), ("WEBP", "image/webp")):
+            head = self.image((321, 123), format=format).read()
+            self.assertEqual(sniff_type(head[:16])[0], content_type)
+            self.assertEqual(image_size(head, content_type), (321, 123), format)
+
+
+class EmployeeBulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_sample_data(employees=10, groups=1, categories=1, students=1, enrollments=5)
+        cls.admin = full_permissions_user()
+        cls.pks = list(Employee.objects.order_by("pk").values_list("pk", flat=True))
+
+    def post(self, action, pks):
+        return self.client.post(reverse("employees:list"), {"action": action, "selected": pks}, follow=True)
+
+    def test_deactivate_is_one_update(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse("employees:list"), {"action": "deactivate", "selected": self.pks})
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('UPDATE "users_customuser"')]
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(CustomUser.objects.filter(employee__in=self.pks, is_active=True).exists())
+
+    def test_summary_message_counts_changed_rows(self):
+        self.client.force_login(self.admin)
+        response = self.post("activate", self.pks[:5])
+        # seed_sample_data deja inactivo a uno de cada cinco
+        self.assertEqual([str(m) for m in response.context["messages"]], ["Activar: 1 de 5 registro(s) seleccionados."])
+
+    def test_hard_delete_cascades_without_loading_rows(self):
+        self.client.force_login(self.admin)
+        user_ids = list(Employee.objects.filter(pk__in=self.pks[:2]).values_list("user_id", flat=True))
+        with CaptureQueriesContext(connection) as ctx:
+            self.post("delete", self.pks[:2])
+        selects = [q["sql"] for q in ctx.captured_queries if "enrollments_enrollment" in q["sql"] and q["sql"].startswith("SELECT")]
+        self.assertEqual(selects, [])
+        self.assertEqual(Employee.objects.count(), 8)
+        self.assertFalse(Enrollment.objects.filter(registered_by__in=self.pks[:2]).exists())
+        self.assertFalse(CustomUser.objects.filter(pk__in=user_ids).exists())
+
+    def test_bulk_delete_removes_login(self):
+        employee = Employee.objects.select_related("user").get(pk=self.pks[0])
+        employee.user.set_password("aula-286")
+        employee.user.save(update_fields=["password"])
+        self.client.force_login(self.admin)
+        self.post("delete", [employee.pk])
+        self.client.logout()
+        # queryset.delete() dejaría al usuario activo: el borrado masivo debe llevárselo
+        self.assertFalse(CustomUser.objects.filter(pk=employee.user_id).exists())
+        self.assertFalse(self.client.login(email=employee.user.email, password="aula-286"))
+
+    def test_delete_view_archives(self):
+        self.client.force_login(self.admin)
+        employee = Employee.objects.get(pk=self.pks[0])
+        enrollments = Enrollment.objects.filter(registered_by=employee).count()
+        self.client.post(reverse("employees:delete", args=[employee.pk]))
+        employee.refresh_from_db()
+        self.assertTrue(employee.is_archived)
+        self.assertFalse(employee.user.is_active)
+        self.assertEqual(Enrollment.objects.filter(registered_by=employee).count(), enrollments)
+        response = self.client.get(reverse("employees:list"))
+        self.assertNotIn(employee, response.context["paginator"].object_list)
+        self.assertEqual([str(m) for m in response.context["messages"]], ["Empleado archivado correctamente."])
+        # Archivado = borrado para la UI
+        for name in ("employees:detail", "employees:update", "employees:delete", "employees:permissions"):
+            self.assertEqual(self.client.get(reverse(name, args=[employee.pk])).status_code, 404, name)
+
+    def test_requires_action_permission(self):
+        viewer = CustomUser.objects.create_user(email="lector@aula.mx", password=None)
+        viewer.user_permissions.add(Permission.objects.get(codename="view_group"))
+        self.client.force_login(viewer)
+        response = self.client.post(reverse("employees:list"), {"action": "delete", "selected": self.pks})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Employee.objects.count(), 10)
+
+
+# ROOT_URLCONF de AsyncViewTests: las vistas sync y async lado a lado, más las del proyecto (menú)
+urlpatterns = [
+    path("sync/", EmployeeListView.as_view()),
+    path("async/", EmployeeAsyncListView.as_view()),
+    path("sync/<int:pk>/", EmployeeDetailView.as_view()),
+    path("async/<int:pk>/", EmployeeAsyncDetailView.as_view()),
+    path("", include("config.urls")),
+]
+
+
+@override_settings(ROOT_URLCONF="employees.tests")
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_sample_data(employees=7, groups=1, categories=1, students=1, enrollments=0)
+        cls.admin = full_permissions_user()
+        cls.viewer = CustomUser.objects.create_user(email="lector@aula.mx", password=None)
+        cls.employee = Employee.objects.select_related("user").order_by("pk").first()
+
+    async def test_list_matches_sync_view(self):
+        await self.async_client.aforce_login(self.admin)
+        for params in ({}, {"page": "last"}, {"page_size": "3", "page": "2", "q": "a"}):
+            sync = await self.async_client.get("/sync/", params)
+            response = await self.async_client.get("/async/", params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context["objects"]), list(sync.context["objects"]))
+            self.assertEqual(response.context["paginator"].count, sync.context["paginator"].count)
+            self.assertEqual(response.context["page_obj"].number, sync.context["page_obj"].number)
+
+    async def test_conditional_get(self):
+        await self.async_client.aforce_login(self.admin)
+        # La primera respuesta fija la cookie CSRF, que forma parte del ETag
+        await self.async_client.get("/async/")
+        response = await self.async_client.get("/async/")
+        response = await self.async_client.get("/async/", headers={"if-none-match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_detail(self):
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(f"/async/{self.employee.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["object"], self.employee)
+        self.assertContains(response, self.employee.user.email)
+        response = await self.async_client.get("/async/999999/")
+        self.assertEqual(response.status_code, 404)
+
+    async def test_access(self):
+        response = await self.async_client.get("/async/")
+        self.assertEqual(response.status_code, 302)
+        await self.async_client.aforce_login(self.viewer)
+        response = await self.async_client.get("/async/")
+        self.assertEqual(response.status_code, 403)
+
+    def test_sync_client_and_post(self):
+        # Con WSGI (Client) también funcionan; el POST de acciones masivas corre en un hilo
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get("/async/").status_code, 200)
+        self.client.post("/async/", {"action": "deactivate", "selected": [self.employee.pk]})
+        self.assertFalse(CustomUser.objects.get(employee=self.employee).is_active)
+
+
+class SortIndexTests(TestCase):
+    def test_every_declared_sort_field_has_index(self):
+        call_command("check_sort_indexes", stdout=io.StringIO())
+
+    def test_sort_field_without_index_is_flagged(self):
+        # Clase suelta, no subclase de ListMixin: no debe aparecer en list_views()
+        view = type("AddressListView", (), {
+            "model": Employee, "allowed_sort_fields": ["address", "user__email"], "default_ordering": ["-address"],
+        })
+        missing = [(path, model, name) for _view, path, model, name, _index in missing_sort_indexes([view])]
+        self.assertEqual(missing, [("address", Employee, "address")])
+
+    def test_dashboard_count_does_not_join_users(self):
+        seed_sample_data()
+        self.client.force_login(full_permissions_user(email="conteo@aula.mx"))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("dashboard"))
+        counts = [q["sql"] for q in ctx.captured_queries if 'FROM "employees_employee"' in q["sql"]]
+        self.assertEqual(len(counts), 1)
+        self.assertNotIn("users_customuser", counts[0])
+
+
+@postgres_only
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix="aula-tests-"))
+class EmployeeConcurrentCreationTests(TransactionTestCase):
+    """Envíos simultáneos reales con la misma referencia (requiere PostgreSQL)."""
+
+    def test_simultaneous_submits_with_same_reference(self):
+        seed_sample_data(employees=0, groups=1, categories=0, students=0, enrollments=0)
+        group = Group.objects.get()
+        admin = full_permissions_user()
+        submits = 4
+        barrier = threading.Barrier(submits)
+        statuses = []
+
+        def submit(i):
+            try:
+                client = Client()
+                client.force_login(admin)
+                data = creation_data(group, reference="CARRER", email=f"carrera{i}@aula.mx")
+                data["picture"] = picture_upload()
+                barrier.wait()
+                statuses.append(client.post(reverse("employees:create"), data).status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(submits)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(statuses), [200] * (submits - 1) + [302])
+        self.assertEqual(Employee.objects.filter(reference="CARRER").count(), 1)
+        self.assertEqual(CustomUser.objects.filter(email__startswith="carrera").count(), 1)
@@ -1,5 +1,8 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
+    EmployeeAsyncDetailView,
+    EmployeeAsyncListView,
     EmployeeListView,
     EmployeeCreateView,
     EmployeeUpdateView,
@@ -8,12 +11,16 @@ from .views import (
     EmployeePermissionsUpdateView
 )
 
+# Con ASGI (settings.ASYNC_VIEWS) las vistas de lectura usan el ORM asíncrono
+ListView = EmployeeAsyncListView if settings.ASYNC_VIEWS else EmployeeListView
+DetailView = EmployeeAsyncDetailView if settings.ASYNC_VIEWS else EmployeeDetailView
+
 app_name = 'employees'
 
 urlpatterns = [
-    path('', EmployeeListView.as_view(), name='list'),
+    path('', ListView.as_view(), name='list'),
     path('new/', EmployeeCreateView.as_view(), name='create'),
-    path('view/<int:pk>/', EmployeeDetailView.as_view(), name='detail'),
+    path('view/<int:pk>/', DetailView.as_view(), name='detail'),
     path('edit/<int:pk>/', EmployeeUpdateView.as_view(), name='update'),
     path('delete/<int:pk>/', EmployeeDeleteView.as_view(), name='delete'),
     path('permissions/<int:pk>/', EmployeePermissionsUpdateView.as_view(), name='permissions'),
@@ -1,10 +1,15 @@
 import logging
 import unicodedata
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.shortcuts import redirect
-from django.db import transaction, IntegrityError
+from django.db import connections, transaction, IntegrityError
+from django.views import View
 from django.views.generic import DeleteView, TemplateView
 from django.db.models.functions import Lower
 from django.db.models import Q
@@ -20,9 +25,16 @@ from utils.db_functions import Unaccent
 
 from django.shortcuts import get_object_or_404
 from django.views.generic import FormView
-from utils.permissions import filtered_permissions_qs, group_permissions_by_model
+from utils.permissions import filtered_permissions_qs, permission_catalog
 from .forms import UserPermissionsForm
-from utils.mixins.crud import CreateMixin, DetailMixin, ListMixin, UpdateMixin
+from audit.log import m2m_keys, record
+from audit.mixins import AuditMixin
+from audit.models import AuditEntry
+from enrollments import live
+from utils.mixins.async_crud import AsyncAccessMixin, AsyncDetailMixin, AsyncListMixin
+from utils.mixins.crud import (
+    ActiveObjectMixin, CreateMixin, DetailMixin, ListMixin, StreamingUploadMixin, UpdateMixin,
+)
 from utils.db_functions import Unaccent
 
 
@@ -42,9 +54,16 @@ class EmployeeListView(ListMixin):
         'commission_general_public'
     ]
     default_ordering = ['user__email']
+    bulk_actions = {
+        "activate": ("Activar", "auth.change_group"),
+        "deactivate": ("Desactivar", "auth.change_group"),
+        "archive": ("Archivar", "auth.delete_group"),
+        "delete": ("Eliminar definitivamente", "auth.delete_group"),
+    }
+    bulk_active_field = "user__is_active"
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related('user')
+        qs = super().get_queryset().active().select_related('user')
         self.form = EmployeeSearchForm(self.request.GET)
         if self.form.is_valid():
             q   = self.form.cleaned_data['q']
@@ -82,57 +101,67 @@ class EmployeeListView(ListMixin):
             if act is not None:
                 qs = qs.filter(user__is_active=act)
 
-            ordering = self.request.GET.get('ordering')
-            if ordering:
-                # permitimos "-campo" o "campo"
-                raw = ordering.lstrip('-')
-                if raw in self.allowed_sort_fields:
-                    qs = qs.order_by(ordering)
-                else:
-                    qs = qs.order_by(*self.default_ordering)
+        # También con el formulario inválido (p. ej. ?is_active=foo): la paginación necesita un orden
+        ordering = self.request.GET.get('ordering')
+        if ordering:
+            # permitimos "-campo" o "campo"
+            raw = ordering.lstrip('-')
+            if raw in self.allowed_sort_fields:
+                qs = qs.order_by(ordering)
             else:
                 qs = qs.order_by(*self.default_ordering)
+        else:
+            qs = qs.order_by(*self.default_ordering)
 
         return qs
 
 
-class EmployeeCreateView(CreateMixin):
+class EmployeeAsyncListView(AsyncListMixin, EmployeeListView):
+    """EmployeeListView con el ORM asíncrono (settings.ASYNC_VIEWS)."""
+
+
+class EmployeeCreateView(StreamingUploadMixin, CreateMixin):
     model = Employee
     form_class = EmployeeCreationForm
     template_name = 'employees/form.html'
     active_menu = "employees"
     success_url = reverse_lazy('employees:list')
     permission_required = "auth.add_group"
+    audit_related = ("user",)
     success_message = "Empleado creado correctamente."
     error_message = "Error al crear el empleado."
 
 
-class EmployeeUpdateView(UpdateMixin):
+class EmployeeUpdateView(StreamingUploadMixin, UpdateMixin):
     model = Employee
     form_class = EmployeeUpdateForm
     template_name = 'employees/form.html'
     active_menu = "employees"
     success_url = reverse_lazy('employees:list')
     permission_required = "auth.change_group"
+    audit_related = ("user",)
     success_message = "Empleado actualizado correctamente."
     error_message = "Error al actualizar el empleado."
 
 
-class EmployeeDeleteView(LoginRequiredMixin, DeleteView):
+class EmployeeDeleteView(LoginRequiredMixin, ActiveObjectMixin, AuditMixin, DeleteView):
     model         = Employee
     template_name = 'employees/confirm_delete.html'
     active_menu = "employees"
     context_object_name = 'item'
     success_url   = reverse_lazy('employees:list')
     permission_required = "auth.delete_group"
+    audit_related = ("user",)
 
     def post(self, request, *args, **kwargs):
         try:
             self.object = self.get_object()
-            self.object.delete()
-            messages.success(request, "Empleado eliminado correctamente.")
+            # Archivado: no recorre sus inscripciones (ver bulk "delete" para borrado físico)
+            self.object.archive()
+            self.audit(AuditEntry.ARCHIVE)
+            messages.success(request, "Empleado archivado correctamente.")
         except IntegrityError as e:
-            messages.error(request, "No se pudo eliminar el empleado.")
+            messages.error(request, "No se pudo archivar el empleado.")
         return redirect(self.success_url)
 
 
@@ -143,6 +172,14 @@ class EmployeeDetailView(DetailMixin):
     permission_required = "auth.delete_group"
 
 
+class EmployeeAsyncDetailView(AsyncDetailMixin, EmployeeDetailView):
+    """EmployeeDetailView con el ORM asíncrono (settings.ASYNC_VIEWS)."""
+
+    def get_queryset(self):
+        # La plantilla lee user.*: en la misma consulta en vez de una carga síncrona al renderizar
+        return super().get_queryset().select_related('user')
+
+
 class EmployeePermissionsUpdateView(LoginRequiredMixin, FormView):
     template_name = 'employees/permissions.html'
     active_menu = "employees"
@@ -150,7 +187,7 @@ class EmployeePermissionsUpdateView(LoginRequiredMixin, FormView):
     success_url = reverse_lazy('employees:list')
 
     def dispatch(self, request, *args, **kwargs):
-        self.employee = get_object_or_404(Employee, pk=kwargs['pk'])
+        self.employee = get_object_or_404(Employee.objects.active(), pk=kwargs['pk'])
         return super().dispatch(request, *args, **kwargs)
 
     def get_form_kwargs(self):
@@ -164,9 +201,8 @@ class EmployeePermissionsUpdateView(LoginRequiredMixin, FormView):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        perms_qs = filtered_permissions_qs()
         ctx["employee"] = self.employee
-        ctx["perms_by_model"] = group_permissions_by_model(perms_qs)
+        ctx["perms_by_model"] = permission_catalog()
         # seleccionados (para marcar checks)
         if self.request.method == "POST":
             selected = set(map(int, self.request.POST.getlist("permissions")))
@@ -179,15 +215,79 @@ class EmployeePermissionsUpdateView(LoginRequiredMixin, FormView):
     def form_valid(self, form):
         perms = form.cleaned_data.get("permissions") or []
         user = self.employee.user
+        before = set(m2m_keys(user.user_permissions.all()))
         user.user_permissions.set(perms)  # atómico: reemplaza con lo seleccionado
+        after = set(m2m_keys(user.user_permissions.all()))
+        if before != after:
+            record(self.request, AuditEntry.PERMISSIONS, self.employee, changes={"user.user_permissions": {
+                "added": sorted(after - before), "removed": sorted(before - after),
+            }})
         messages.success(self.request, "Permisos del empleado actualizados correctamente.")
         return redirect(self.get_success_url())
 
 
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = 'dashboard.html'
+    # Inscripciones e importe (y su stream en vivo): solo con este permiso
+    counters_permission = "auth.view_group"
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx['total_empleados'] = Employee.objects.count()
+        ctx['total_empleados'] = Employee.objects.active().count()
+        if self.request.user.has_perm(self.counters_permission):
+            ctx['inscripciones'] = live.counters()
         return ctx
+
+
+class AsyncDashboardView(AsyncAccessMixin, DashboardView):
+    """DashboardView con acount() (settings.ASYNC_VIEWS)."""
+
+    async def get(self, request, *args, **kwargs):
+        # TemplateView.get_context_data sin el conteo síncrono de DashboardView
+        ctx = super(DashboardView, self).get_context_data(**kwargs)
+        ctx['total_empleados'] = await Employee.objects.active().acount()
+        if await request.user.ahas_perm(self.counters_permission):
+            ctx['inscripciones'] = await live.acounters()
+        return self.render_to_response(ctx)
+
+
+class DashboardEventsView(AsyncAccessMixin, PermissionRequiredMixin, View):
+    """
+    Server-Sent Events del dashboard (enrollments.live): snapshot al conectar, luego deltas de
+    inscripciones y un comentario cada LIVE_HEARTBEAT segundos.
+    Solo con ASGI: con WSGI cada dashboard ocuparía un hilo mientras esté abierto; ahí responde
+    204 y EventSource deja de reconectar (el dashboard queda estático).
+    """
+    permission_required = DashboardView.counters_permission
+    # Espera de EventSource antes de reconectar (ms)
+    retry = 5000
+
+    async def get(self, request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+        subscriber = live.broadcaster.subscribe()
+        if subscriber is None:
+            return HttpResponse(status=503, headers={"Retry-After": "60"})
+        try:
+            # Suscrito antes del snapshot: lo que llegue mientras tanto queda retenido y push solo
+            # suma lo que la consulta no vio (first_id mayor que su max(id))
+            counters, last_id = await live.asnapshot()
+            subscriber.push(snapshot=counters, last_id=last_id)
+            # El stream puede durar horas: la conexión a la BD de esta petición se libera ya
+            await sync_to_async(connections.close_all)()
+        except BaseException:
+            live.broadcaster.unsubscribe(subscriber)
+            raise
+        response = StreamingHttpResponse(self.stream(subscriber), content_type="text/event-stream")
+        # Como FileResponse con su archivo: el handler llama a close() al terminar, con o sin desconexión
+        response._resource_closers.append(lambda: live.broadcaster.unsubscribe(subscriber))
+        response["Cache-Control"] = "no-cache"
+        # nginx: sin buffer para esta respuesta
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, subscriber):
+        yield f"retry: {self.retry}\n\n"
+        while True:
+            event = await subscriber.next_event(settings.LIVE_HEARTBEAT)
+            yield ": ping\n\n" if event is None else live.format_event(*event)
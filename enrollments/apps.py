@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class EnrollmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'enrollments'
+    verbose_name = "Inscripciones"
+
+    def ready(self):
+        from .live import connect_signals
+
+        connect_signals()
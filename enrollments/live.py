@@ -0,0 +1,241 @@
+# enrollments/live.py
+# Código en inglés; comentarios en español
+"""
+Contadores de inscripciones en vivo para el dashboard (Server-Sent Events, solo ASGI).
+
+- En PostgreSQL un trigger por sentencia (migración 0003) hace NOTIFY en CHANNEL con lo insertado:
+  cuenta también bulk_create, generate_data y SQL crudo, y llega solo al confirmar la transacción.
+- Cada proceso abre UNA conexión con LISTEN (Broadcaster, un hilo de utils.listen) y reparte los
+  deltas a todos sus dashboards abiertos: miles de clientes cuestan un listener por worker.
+- Contrapresión: cada cliente acumula los deltas pendientes en un solo dict mientras su socket
+  no acepta más datos; un cliente lento recibe la suma, nunca una cola creciente.
+- Al (re)conectar LISTEN se manda un snapshot nuevo a todos (los NOTIFY del intervalo sin
+  conexión se perdieron).
+- Cada snapshot lleva el max(id) que vio su consulta: los deltas que llegan mientras corre se
+  retienen y solo se suman los de first_id mayor (confirmados después de la consulta).
+En otras BDs (SQLite en desarrollo/tests) la señal post_save publica en el proceso actual.
+"""
+import asyncio
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.signals import post_save
+
+from utils.listen import ListenThread
+
+from .models import Enrollment
+
+CHANNEL = "enrollment_inserted"
+# min(id): NOTIFY descarta payloads idénticos dentro de una misma transacción.
+# HAVING: el trigger por sentencia también corre en un INSERT de cero filas (INSERT ... SELECT vacío)
+FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION enrollment_notify() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{CHANNEL}', json_build_object(
+        'first_id', min(id), 'enrollments', count(*), 'revenue', coalesce(sum(price), 0)
+    )::text) FROM inserted HAVING count(*) > 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+TRIGGER_SQL = FUNCTION_SQL + """
+CREATE TRIGGER enrollment_notify AFTER INSERT ON enrollments_enrollment
+    REFERENCING NEW TABLE AS inserted FOR EACH STATEMENT EXECUTE FUNCTION enrollment_notify();
+"""
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS enrollment_notify ON enrollments_enrollment;
+DROP FUNCTION IF EXISTS enrollment_notify();
+"""
+
+
+def create_notify_trigger(apps, schema_editor):
+    """RunPython: trigger de NOTIFY (solo PostgreSQL)."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(TRIGGER_SQL)
+
+
+def replace_notify_function(apps, schema_editor):
+    """RunPython: FUNCTION_SQL sobre una función ya creada (migración 0004)."""
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(FUNCTION_SQL)
+
+
+def drop_notify_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+def uses_notify(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def aggregates():
+    return {"enrollments": Count("id"), "revenue": Sum("price"), "last_id": Max("id")}
+
+
+def snapshot():
+    """(contadores, max(id)) en una consulta: los deltas con first_id <= max(id) ya están incluidos."""
+    values = Enrollment.objects.aggregate(**aggregates())
+    return encode(values), values["last_id"] or 0
+
+
+async def asnapshot():
+    values = await Enrollment.objects.aaggregate(**aggregates())
+    return encode(values), values["last_id"] or 0
+
+
+def counters():
+    """Contadores del dashboard (una consulta)."""
+    return snapshot()[0]
+
+
+async def acounters():
+    return (await asnapshot())[0]
+
+
+def encode(values):
+    """Importe como texto con dos decimales: JSON no tiene Decimal."""
+    return {"enrollments": values["enrollments"], "revenue": f"{Decimal(values['revenue'] or 0):.2f}"}
+
+
+def format_event(event, data):
+    """Un evento SSE: 'event:' y una línea 'data:' con el JSON."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def add_delta(pending, delta):
+    pending["enrollments"] = pending.get("enrollments", 0) + delta["enrollments"]
+    pending["revenue"] = f"{Decimal(pending.get('revenue', 0)) + Decimal(str(delta['revenue'])):.2f}"
+
+
+class Subscriber:
+    """Un dashboard abierto: deltas acumulados hasta que su stream los envíe."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.pending = {}
+        self.snapshot = None
+        # Deltas que llegan mientras se consulta un snapshot (None: ninguna consulta en curso);
+        # al suscribirse ya se espera el primero
+        self.held = []
+        # max(id) del último snapshot aplicado
+        self.last_id = None
+        self.ready = asyncio.Event()
+
+    def hold(self):
+        """Antes de consultar un snapshot: retiene los deltas hasta saber su max(id)."""
+        if self.held is None:
+            self.held = []
+
+    def push(self, delta=None, snapshot=None, last_id=None):
+        # Siempre en self.loop (Broadcaster usa call_soon_threadsafe desde otros hilos)
+        if snapshot is not None:
+            if self.held is None and last_id <= self.last_id:
+                # Nadie lo esperaba y no es más reciente que el aplicado (p. ej. el de la vista y el
+                # del listener al conectar llegaron en desorden): lo pendiente no está en él
+                return
+            # Lo pendiente se confirmó antes de la consulta; de lo retenido, solo lo que ella no vio
+            self.snapshot, self.pending, self.last_id = snapshot, {}, last_id
+            for held in self.held or ():
+                # first_id None: una sentencia sin filas (no suma nada)
+                if held["first_id"] is not None and held["first_id"] > last_id:
+                    add_delta(self.pending, held)
+            self.held = None
+        elif self.held is not None:
+            self.held.append(delta)
+            return
+        else:
+            add_delta(self.pending, delta)
+        self.ready.set()
+
+    async def next_event(self, timeout):
+        """(evento, datos) o None si pasó 'timeout' sin novedades (toca heartbeat)."""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.ready.clear()
+        if self.snapshot is not None:
+            event, data, self.snapshot = "snapshot", self.snapshot, None
+            if self.pending:
+                # Lo que el snapshot no vio sale como delta en seguida
+                self.ready.set()
+        else:
+            event, data, self.pending = "delta", self.pending, {}
+        return event, data
+
+
+class Broadcaster(ListenThread):
+    """Listener de CHANNEL por proceso (utils.listen) y los dashboards suscritos a él."""
+
+    channel = CHANNEL
+    reconnect_setting = "LIVE_RECONNECT"
+
+    def __init__(self):
+        super().__init__()
+        self.subscribers = set()
+
+    def subscribe(self):
+        loop = asyncio.get_running_loop()
+        if len(self.subscribers) >= settings.LIVE_MAX_CLIENTS:
+            return None
+        subscriber = Subscriber(loop)
+        self.subscribers.add(subscriber)
+        if uses_notify():
+            self.ensure_started()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, delta=None, snapshot=None, last_id=None):
+        """Desde cualquier hilo: cada suscriptor lo recibe en su event loop."""
+        self.each(lambda subscriber: subscriber.push(delta, snapshot, last_id))
+
+    def hold(self):
+        self.each(Subscriber.hold)
+
+    def each(self, callback):
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.loop.call_soon_threadsafe(callback, subscriber)
+            except RuntimeError:
+                # Loop cerrado (el worker terminó o un test lo descartó)
+                self.subscribers.discard(subscriber)
+
+    # --- LISTEN (PostgreSQL, hilo de utils.listen) ---
+
+    def on_connect(self):
+        if self.subscribers:
+            # Lo insertado mientras no había LISTEN: un snapshot para todos
+            self.hold()
+            counters, last_id = fresh_snapshot()
+            self.publish(snapshot=counters, last_id=last_id)
+
+    def handle(self, payload):
+        self.publish(delta=json.loads(payload, parse_float=Decimal))
+
+
+def fresh_snapshot():
+    """snapshot() desde el hilo de LISTEN, sin dejarle una conexión abierta."""
+    try:
+        return snapshot()
+    finally:
+        connections.close_all()
+
+
+broadcaster = Broadcaster()
+
+
+def _on_enrollment_saved(sender, instance, created, raw=False, using="default", **kwargs):
+    # En PostgreSQL lo publica el trigger (para todos los procesos)
+    if created and not raw and not uses_notify(using):
+        delta = {"first_id": instance.pk, "enrollments": 1, "revenue": str(instance.price)}
+        transaction.on_commit(lambda: broadcaster.publish(delta=delta), using=using)
+
+
+def connect_signals():
+    post_save.connect(_on_enrollment_saved, sender=Enrollment, dispatch_uid="enrollments.live")
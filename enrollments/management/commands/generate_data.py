@@ -0,0 +1,245 @@
+import csv
+import io
+import itertools
+import random
+import string
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Permission
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from employees.models import Employee
+from enrollments.models import Enrollment
+from modalities.models import Category, SubCategory
+from students.models import Student
+from tracking.versions import mark_changed
+from users.models import CustomUser
+from utils.testing import CATEGORY_NAMES, FIRST_NAMES, LAST_NAMES, SUB_CATEGORY_NAMES
+
+STREETS = ["Calle Peñón", "Av. Cañada", "Privada Ñandú", "Calzada Júpiter", "Callejón Álamo", "Blvd. Acueducto"]
+NEIGHBORHOODS = ["Jardín", "Centro Histórico", "Benito Juárez", "San Sebastián", "Santa Lucía", "García Ginerés"]
+CITIES = ["Mérida", "Cancún", "Querétaro", "León", "Córdoba", "Tlaxcala"]
+BASE36 = string.digits + string.ascii_uppercase
+
+
+def base36(number, width=6):
+    """Código alfanumérico de ancho fijo (referencias de 6 caracteres)."""
+    chars = []
+    while number:
+        number, rem = divmod(number, 36)
+        chars.append(BASE36[rem])
+    return "".join(reversed(chars)).rjust(width, "0")[-width:]
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos (usuarios, empleados, alumnos, categorías, sub categorías "
+        "e inscripciones) con nombres en español. En PostgreSQL usa COPY; en otros motores bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiplica todas las cantidades por defecto.")
+        parser.add_argument("--employees", type=int, default=1_000)
+        parser.add_argument("--students", type=int, default=10_000)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--sub-per-category", type=int, default=5)
+        parser.add_argument("--enrollments", type=int, default=50_000)
+        parser.add_argument("--batch-size", type=int, default=50_000, help="Filas por bloque de COPY/bulk_create.")
+        parser.add_argument("--password", default="aula-286", help="Contraseña de todos los usuarios generados.")
+        parser.add_argument("--admin-email", default="carga@aula.mx",
+                            help="Usuario staff con todos los permisos para pruebas de carga ('' para omitir).")
+        parser.add_argument("--seed", type=int, default=286)
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        if scale <= 0:
+            raise CommandError("--scale debe ser mayor que 0.")
+        counts = {
+            key: max(1, int(options[key] * scale))
+            for key in ("employees", "students", "categories", "enrollments")
+        }
+        self.batch_size = options["batch_size"]
+        self.random = random.Random(options["seed"])
+        self.now = timezone.now()
+        # Un solo hash para todos: generar millones de hashes tardaría horas
+        self.password_hash = make_password(options["password"])
+        self.use_copy = connection.vendor == "postgresql"
+
+        if options["admin_email"]:
+            self._create_admin(options["admin_email"], options["password"])
+
+        employee_ids = self._generate_people(Employee, counts["employees"], "empleado", self._employee_row)
+        student_ids = self._generate_people(Student, counts["students"], "alumno", self._student_row)
+        sub_category_ids = self._generate_catalog(counts["categories"], options["sub_per_category"])
+        self._generate_enrollments(counts["enrollments"], employee_ids, student_ids, sub_category_ids)
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [CustomUser, Employee, Student, Category, SubCategory, Enrollment]
+            ):
+                cursor.execute(sql)
+        # COPY/bulk_create no mandan señales: invalida ETags y cachés de opciones
+        mark_changed(CustomUser, Employee, Student, Category, SubCategory, Enrollment)
+        self.stdout.write(self.style.SUCCESS("Datos generados: " + ", ".join(f"{k}={v}" for k, v in counts.items())))
+
+    # --- Generadores ---
+    def _create_admin(self, email, password):
+        user, created = CustomUser.objects.get_or_create(
+            email=email, defaults={"first_name": "Carga", "last_name": "Pruebas", "is_staff": True}
+        )
+        if created:
+            user.set_password(password)
+            user.save(update_fields=["password"])
+        user.user_permissions.set(Permission.objects.all())
+
+    def _generate_people(self, model, count, prefix, build_row):
+        user_id = self._next_id(CustomUser)
+        profile_id = self._next_id(model)
+        # Por bloques: usuarios primero (FK) sin acumular millones de filas en memoria
+        for chunk_start in range(0, count, self.batch_size):
+            users, profiles = [], []
+            for offset in range(chunk_start, min(count, chunk_start + self.batch_size)):
+                users.append({
+                    "id": user_id + offset,
+                    "password": self.password_hash,
+                    "email": f"{prefix}.{user_id + offset}@aula.mx",
+                    "first_name": self.random.choice(FIRST_NAMES),
+                    "last_name": f"{self.random.choice(LAST_NAMES)} {self.random.choice(LAST_NAMES)}"[:30],
+                    "is_active": self.random.random() > 0.1,
+                    "date_joined": self.now,
+                })
+                profiles.append(build_row(profile_id + offset, user_id + offset))
+            self._write(CustomUser, users)
+            self._write(model, profiles)
+        return range(profile_id, profile_id + count)
+
+    def _person_fields(self, pk, user_id):
+        return {
+            "id": pk,
+            "user_id": user_id,
+            "address": f"{self.random.choice(STREETS)} #{self.random.randint(1, 999)}, "
+                       f"Col. {self.random.choice(NEIGHBORHOODS)}, {self.random.choice(CITIES)}",
+            "birthdate": date(1960, 1, 1) + timedelta(days=self.random.randint(0, 365 * 45)),
+            "phone_number": f"{self.random.randint(0, 9_999_999_999):010d}",
+            "phone_number_2": f"{self.random.randint(0, 9_999_999_999):010d}" if self.random.random() > 0.6 else None,
+        }
+
+    def _employee_row(self, pk, user_id):
+        row = self._person_fields(pk, user_id)
+        row.update({
+            "commission_general_public": self.random.random() > 0.5,
+            "picture": f"employees/empleado-{pk}.jpg",
+            "reference": base36(pk),
+        })
+        return row
+
+    def _student_row(self, pk, user_id):
+        row = self._person_fields(pk, user_id)
+        row["picture"] = f"students/alumno-{pk}.jpg"
+        return row
+
+    def _generate_catalog(self, categories, sub_per_category):
+        category_id = self._next_id(Category)
+        sub_id = self._next_id(SubCategory)
+        category_rows, sub_rows = [], []
+        for offset in range(categories):
+            pk = category_id + offset
+            base = CATEGORY_NAMES[offset % len(CATEGORY_NAMES)]
+            category_rows.append({"id": pk, "name": f"{base} {pk}", "is_active": self.random.random() > 0.2})
+            for level in range(sub_per_category):
+                price = Decimal(self.random.randrange(300, 5000, 50))
+                sub_rows.append({
+                    "id": sub_id + len(sub_rows),
+                    "category_id": pk,
+                    "name": f"{base} {SUB_CATEGORY_NAMES[level % len(SUB_CATEGORY_NAMES)]} {level + 1}"[:50],
+                    "price": price,
+                    "registration_price": Decimal("250.00"),
+                    "tuition_price": price,
+                    "certification_price": Decimal("800.00"),
+                    "exam_price": Decimal("300.00"),
+                    "opening_commission_amount": Decimal("100.00"),
+                    "closing_commission_amount": Decimal("50.00"),
+                    "new_opening_commission_amount": Decimal("150.00"),
+                    "threshold_sales_amount": self.random.randint(5, 30),
+                    "commission_amount_general_public": Decimal("75.00"),
+                    "is_active": self.random.random() > 0.2,
+                    "is_general_public": self.random.random() > 0.5,
+                })
+        self._write(Category, category_rows)
+        self._write(SubCategory, sub_rows)
+        return range(sub_id, sub_id + len(sub_rows))
+
+    def _generate_enrollments(self, count, employee_ids, student_ids, sub_category_ids):
+        start = self._next_id(Enrollment)
+
+        def rows():
+            for pk in range(start, start + count):
+                yield {
+                    "id": pk,
+                    "sub_category_id": self.random.choice(sub_category_ids),
+                    "student_id": self.random.choice(student_ids),
+                    "registered_by_id": self.random.choice(employee_ids),
+                    "reference": base36(pk),
+                    "price": Decimal(self.random.randrange(300, 5000, 50)),
+                    "created_at": self.now - timedelta(minutes=self.random.randint(0, 60 * 24 * 365)),
+                }
+
+        self._write(Enrollment, rows())
+
+    # --- Escritura ---
+    def _next_id(self, model):
+        return (model.objects.aggregate(m=models.Max("pk"))["m"] or 0) + 1
+
+    def _write(self, model, rows):
+        """Escribe filas (dicts por attname) en bloques; campos ausentes toman su default."""
+        fields = [f for f in model._meta.local_concrete_fields]
+        written = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self.batch_size))
+            if not chunk:
+                break
+            with transaction.atomic():
+                if self.use_copy:
+                    self._copy(model, fields, chunk)
+                else:
+                    model.objects.bulk_create(
+                        [model(**{f.attname: self._value(f, row) for f in fields}) for row in chunk]
+                    )
+            written += len(chunk)
+            self.stdout.write(f"  {model._meta.db_table}: {written}", ending="\r")
+        self.stdout.write(f"  {model._meta.db_table}: {written}")
+
+    def _value(self, field, row):
+        if field.attname in row:
+            return row[field.attname]
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            return self.now
+        return field.get_default()
+
+    def _copy(self, model, fields, chunk):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in chunk:
+            writer.writerow([self._csv(self._value(f, row)) for f in fields])
+        buffer.seek(0)
+        columns = ", ".join(connection.ops.quote_name(f.column) for f in fields)
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            # NULL explícito para no confundirlo con cadenas vacías
+            cursor.copy_expert(
+                f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+            )
+
+    @staticmethod
+    def _csv(value):
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        return value
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 11:33
+
+from django.db import migrations
+
+from utils.deletion import add_db_cascade, remove_db_cascade
+
+
+class Migration(migrations.Migration):
+    """ON DELETE CASCADE en la BD para las FKs de utils.deletion.DB_CASCADE (solo PostgreSQL)."""
+
+    dependencies = [
+        ('enrollments', '0001_initial'),
+        ('modalities', '0004_archived_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_db_cascade, remove_db_cascade),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 12:30
+
+from django.db import migrations
+
+from enrollments.live import create_notify_trigger, drop_notify_trigger
+
+
+class Migration(migrations.Migration):
+    """NOTIFY enrollment_inserted en cada INSERT de inscripciones (solo PostgreSQL; enrollments.live)."""
+
+    dependencies = [
+        ('enrollments', '0002_enrollment_db_cascade'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_notify_trigger, drop_notify_trigger),
+    ]
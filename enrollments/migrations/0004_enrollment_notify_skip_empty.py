@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-19 18:10
+
+from django.db import migrations
+
+from enrollments.live import replace_notify_function
+
+
+class Migration(migrations.Migration):
+    """Sin NOTIFY en los INSERT de cero filas (enrollments.live.FUNCTION_SQL)."""
+
+    dependencies = [
+        ('enrollments', '0003_enrollment_notify_trigger'),
+    ]
+
+    operations = [
+        migrations.RunPython(replace_notify_function, migrations.RunPython.noop),
+    ]
@@ -3,9 +3,10 @@ from django.db import models
 from employees.models import Employee
 from modalities.models import SubCategory
 from students.models import Student
+from utils.models import DetailFieldsMixin
 
 
-class Enrollment(models.Model):
+class Enrollment(DetailFieldsMixin, models.Model):
     sub_category = models.ForeignKey(SubCategory, on_delete=models.CASCADE, verbose_name="Sub categoría")
     student = models.ForeignKey(Student, on_delete=models.CASCADE, verbose_name="Estudiante")
     registered_by = models.ForeignKey(Employee, on_delete=models.CASCADE, verbose_name="Registrado por")
@@ -18,6 +19,15 @@ class Enrollment(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
 
+    detail_fields = [
+        ("Referencia", "reference", "text"),
+        ("Sub categoría", "sub_category__name", "text"),
+        ("Estudiante", "student__user__email", "text"),
+        ("Registrado por", "registered_by__user__email", "text"),
+        ("Precio", "price", "decimal"),
+        ("Fecha de creación", "created_at", "datetime"),
+    ]
+
 
     class Meta:
         verbose_name = "Inscripción"
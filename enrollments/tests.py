@@ -1,3 +1,166 @@
-from django.test import TestCase
+import asyncio
+import json
+import select
+import unittest
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from enrollments import live
+from enrollments.models import Enrollment
+from users.models import CustomUser
+from utils.listen import open_listen_connection
+from utils.testing import full_permissions_user, postgres_only, seed_sample_data
+
+
+def enrollment(data, price, reference="LIVE01"):
+    return Enrollment(
+        sub_category=data["sub_category"], student=data["student"], registered_by=data["employee"],
+        reference=reference, price=price,
+    )
+
+
+def parse_event(chunk):
+    """(evento, datos) de un evento SSE."""
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+class LiveDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_sample_data(employees=2, groups=1, categories=1, students=1, enrollments=3)
+        cls.admin = full_permissions_user()
+
+    async def test_subscriber_coalesces_deltas(self):
+        subscriber = live.Subscriber(asyncio.get_running_loop())
+        subscriber.push(snapshot={"enrollments": 0, "revenue": "0.00"}, last_id=0)
+        await subscriber.next_event(1)
+        subscriber.push({"first_id": 1, "enrollments": 1, "revenue": "100.50"})
+        subscriber.push({"first_id": 2, "enrollments": 2, "revenue": Decimal("49.50")})
+        self.assertEqual(await subscriber.next_event(1), ("delta", {"enrollments": 3, "revenue": "150.00"}))
+        self.assertIsNone(await subscriber.next_event(0.01))
+        # Un snapshot reemplaza los deltas pendientes
+        subscriber.push({"first_id": 4, "enrollments": 1, "revenue": "1.00"})
+        subscriber.push(snapshot={"enrollments": 9, "revenue": "9.00"}, last_id=4)
+        self.assertEqual(await subscriber.next_event(1), ("snapshot", {"enrollments": 9, "revenue": "9.00"}))
+
+    async def test_snapshot_keeps_deltas_it_did_not_see(self):
+        subscriber = live.Subscriber(asyncio.get_running_loop())
+        # Llegan mientras corre la consulta del snapshot (max(id) = 10): 8 ya está incluido, 11 no
+        subscriber.push({"first_id": 8, "enrollments": 2, "revenue": "20.00"})
+        subscriber.push({"first_id": 11, "enrollments": 1, "revenue": "5.00"})
+        # Un INSERT sin filas (trigger anterior a la migración 0004)
+        subscriber.push({"first_id": None, "enrollments": 0, "revenue": 0})
+        self.assertIsNone(await subscriber.next_event(0.01))
+        subscriber.push(snapshot={"enrollments": 10, "revenue": "100.00"}, last_id=10)
+        self.assertEqual(await subscriber.next_event(1), ("snapshot", {"enrollments": 10, "revenue": "100.00"}))
+        self.assertEqual(await subscriber.next_event(1), ("delta", {"enrollments": 1, "revenue": "5.00"}))
+        # Otro snapshot (reconexión de LISTEN) retiene de nuevo
+        subscriber.hold()
+        subscriber.push({"first_id": 12, "enrollments": 1, "revenue": "1.00"})
+        subscriber.push(snapshot={"enrollments": 12, "revenue": "106.00"}, last_id=12)
+        self.assertEqual(await subscriber.next_event(1), ("snapshot", {"enrollments": 12, "revenue": "106.00"}))
+        self.assertIsNone(await subscriber.next_event(0.01))
+        # Uno atrasado que nadie esperaba no borra lo pendiente
+        subscriber.push({"first_id": 13, "enrollments": 1, "revenue": "2.00"})
+        subscriber.push(snapshot={"enrollments": 11, "revenue": "105.00"}, last_id=11)
+        self.assertEqual(await subscriber.next_event(1), ("delta", {"enrollments": 1, "revenue": "2.00"}))
+
+    @unittest.skipIf(connection.vendor == "postgresql", "En PostgreSQL publica el trigger (NotifyTriggerTests)")
+    def test_insert_publishes_after_commit(self):
+        with mock.patch.object(live.broadcaster, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                instance = enrollment(self.data, Decimal("120.00"))
+                instance.save()
+                publish.assert_not_called()
+        publish.assert_called_once_with(delta={"first_id": instance.pk, "enrollments": 1, "revenue": "120.00"})
+
+    def test_dashboard_renders_counters(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.context["inscripciones"], live.counters())
+        self.assertContains(response, f'data-live-counter="enrollments">{Enrollment.objects.count()}<')
+
+    def test_counters_require_permission(self):
+        user = CustomUser.objects.create_user(email="sinpermisos@aula.mx", password="x")
+        self.client.force_login(user)
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("inscripciones", response.context)
+        self.assertNotContains(response, "data-live-counter")
+        self.assertEqual(self.client.get(reverse("dashboard_events")).status_code, 403)
+
+    def test_wsgi_has_no_stream(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(reverse("dashboard_events")).status_code, 204)
+
+    @override_settings(LIVE_MAX_CLIENTS=0)
+    async def test_full_process_rejects(self):
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get(reverse("dashboard_events"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "60")
+
+
+class LiveStreamTests(TransactionTestCase):
+    """
+    TransactionTestCase: la vista suelta la conexión a la BD tras el snapshot (connections.close_all)
+    y response.close() manda request_finished; dentro de la transacción de un TestCase eso cerraría
+    la conexión de los tests siguientes.
+    """
+
+    def setUp(self):
+        seed_sample_data(employees=2, groups=1, categories=1, students=1, enrollments=3)
+        self.admin = full_permissions_user()
+        # El listener de PostgreSQL mandaría su propio snapshot al conectar (NotifyTriggerTests lo cubre)
+        patcher = mock.patch.object(live.broadcaster, "ensure_started")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(LIVE_HEARTBEAT=0.05)
+    async def test_stream(self):
+        response = await self.async_client.get(reverse("dashboard_events"))
+        self.assertEqual(response.status_code, 302)
+
+        await self.async_client.aforce_login(self.admin)
+        expected = await live.acounters()
+        response = await self.async_client.get(reverse("dashboard_events"))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+            self.assertEqual(parse_event(await anext(stream)), ("snapshot", expected))
+            live.broadcaster.publish(delta={"first_id": 101, "enrollments": 1, "revenue": "10.00"})
+            live.broadcaster.publish(delta={"first_id": 102, "enrollments": 1, "revenue": "5.50"})
+            self.assertEqual(parse_event(await anext(stream)), ("delta", {"enrollments": 2, "revenue": "15.50"}))
+            self.assertEqual(await anext(stream), b": ping\n\n")
+        finally:
+            # Lo que hace ASGIHandler al terminar la respuesta (también si el cliente se desconecta)
+            await stream.aclose()
+            response.close()
+        self.assertEqual(live.broadcaster.subscribers, set())
+
+
+class NotifyTriggerTests(TransactionTestCase):
+    @postgres_only
+    def test_insert_statement_notifies_once(self):
+        data = seed_sample_data(employees=1, groups=1, categories=1, students=1, enrollments=0)
+        listener = open_listen_connection(live.CHANNEL)
+        try:
+            with connection.cursor() as cursor:
+                # Cero filas: sin NOTIFY
+                cursor.execute("INSERT INTO enrollments_enrollment SELECT * FROM enrollments_enrollment WHERE false")
+            Enrollment.objects.bulk_create([
+                enrollment(data, Decimal("100.00"), "LIVE01"), enrollment(data, Decimal("50.25"), "LIVE02"),
+            ])
+            select.select([listener], [], [], 5)
+            listener.poll()
+            self.assertEqual(len(listener.notifies), 1)
+            payload = json.loads(listener.notifies[0].payload, parse_float=Decimal)
+            self.assertEqual((payload["enrollments"], payload["revenue"]), (2, Decimal("150.25")))
+        finally:
+            listener.close()
@@ -1,5 +1,7 @@
 from django import forms
-from .models import Category, SubCategory
+
+from utils.forms import CachedModelChoiceField
+from .models import DUPLICATE_NAME_MESSAGE, Category, SubCategory
 
 
 class CategoryForm(forms.ModelForm):
@@ -20,6 +22,16 @@ class CategoryForm(forms.ModelForm):
         if not getattr(self.instance, "pk", None):
             self.fields["is_active"].initial = True
 
+    def clean_name(self):
+        # Único solo entre activas (category_active_name_uniq); el error va en el campo, no arriba del form
+        name = self.cleaned_data.get("name")
+        qs = Category.objects.active().filter(name=name)
+        if self.instance.pk:
+            qs = qs.exclude(pk=self.instance.pk)
+        if name and qs.exists():
+            raise forms.ValidationError(DUPLICATE_NAME_MESSAGE)
+        return name
+
 
 class CategorySearchForm(forms.Form):
     q = forms.CharField(
@@ -74,6 +86,8 @@ class SubCategoryForm(forms.ModelForm):
             "is_general_public",
             "is_active"
         ]
+        # Opciones de categoría desde caché; se invalida al guardar/borrar categorías
+        field_classes = {"category": CachedModelChoiceField}
         widgets = {
             "category": forms.Select(attrs={"class": "form-select"}),
             "name": forms.TextInput(attrs={"class": "form-control", "autocomplete": "off", "maxlength": 50}),
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('modalities', '0003_alter_category_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Archivado'),
+        ),
+        migrations.AddField(
+            model_name='subcategory',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Archivado'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['name'], name='category_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subcategory',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['category', 'name'], name='subcategory_active_idx'),
+        ),
+    ]
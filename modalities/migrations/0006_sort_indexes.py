@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-19 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('modalities', '0005_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['is_active', 'name'], name='category_flag_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subcategory',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['name', 'id'], name='subcategory_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subcategory',
+            index=models.Index(condition=models.Q(('archived_at__isnull', True)), fields=['is_active', 'name'], name='subcategory_flag_idx'),
+        ),
+    ]
@@ -1,32 +1,42 @@
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import Q
 
+from utils.models import ArchivableModel, DetailFieldsMixin, TimestampedModel
 
-class Category(models.Model):
-    name = models.CharField(
-        max_length=60,
-        unique=True,
-        error_messages={
-            "unique": "Ya existe una categoría con este nombre."
-        }
-    )
+DUPLICATE_NAME_MESSAGE = "Ya existe una categoría con este nombre."
+
+
+class Category(DetailFieldsMixin, TimestampedModel, ArchivableModel):
+    name = models.CharField(max_length=60)
     is_active = models.BooleanField(verbose_name="Activo")
 
+    archive_updates = {"is_active": False}
+
+    detail_fields = [
+        ("Nombre", "name", "text"),
+        ("Activo", "is_active", "boolean"),
+    ]
+
     class Meta:
+        # Único solo entre activas (también sirve de índice de name): una categoría archivada no retiene su nombre
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name"], condition=Q(archived_at__isnull=True), name="category_active_name_uniq",
+                violation_error_message=DUPLICATE_NAME_MESSAGE,
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["is_active", "name"], condition=Q(archived_at__isnull=True), name="category_flag_idx"),
+        ]
         verbose_name = "Categoría"
         verbose_name_plural = "Categorías"
 
-    def get_detail_fields(self):
-        return [
-            ("Nombre", self.name, "text"),
-            ("Activo", self.is_active, "boolean"),
-        ]
-
     def __str__(self):
         return self.name
 
 
-class SubCategory(models.Model):
+class SubCategory(DetailFieldsMixin, TimestampedModel, ArchivableModel):
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     name = models.CharField(max_length=50, verbose_name="Nombre")
     price = models.DecimalField(
@@ -92,27 +102,36 @@ class SubCategory(models.Model):
         verbose_name="Es público en general"
     )
 
+    archive_updates = {"is_active": False}
+
+    detail_fields = [
+        ("Categoría", "category__name", "text"),
+        ("Nombre", "name", "text"),
+        ("Precio", "price", "decimal"),
+        ("Precio de inscripción", "registration_price", "decimal"),
+        ("Precio de colegiatura", "tuition_price", "decimal"),
+        ("Precio de certificación", "certification_price", "decimal"),
+        ("Precio de Examen", "exam_price", "decimal"),
+        ("Comisión por apertura", "opening_commission_amount", "decimal"),
+        ("Comisión por cierre", "closing_commission_amount", "decimal"),
+        ("Comisión por alcanzar la meta", "new_opening_commission_amount", "decimal"),
+        ("Ventas para alcanzar nueva comisión", "threshold_sales_amount", "decimal"),
+        ("Comisión por público en general", "commission_amount_general_public", "decimal"),
+        ("Es público en general", "is_general_public", "boolean"),
+        ("Activo", "is_active", "boolean"),
+    ]
+
     class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "name"], condition=Q(archived_at__isnull=True), name="subcategory_active_idx"
+            ),
+            # Ordenamientos de la lista (utils.indexes)
+            models.Index(fields=["name", "id"], condition=Q(archived_at__isnull=True), name="subcategory_name_idx"),
+            models.Index(fields=["is_active", "name"], condition=Q(archived_at__isnull=True), name="subcategory_flag_idx"),
+        ]
         verbose_name = "Sub categoría"
         verbose_name_plural = "Sub categorías"
 
-    def get_detail_fields(self):
-        return [
-            ("Categoría", self.category, "text"),
-            ("Nombre", self.name, "text"),
-            ("Precio", self.price, "decimal"),
-            ("Precio de inscripción", self.registration_price, "decimal"),
-            ("Precio de colegiatura", self.tuition_price, "decimal"),
-            ("Precio de certificación", self.certification_price, "decimal"),
-            ("Precio de Examen", self.exam_price, "decimal"),
-            ("Comisión por apertura", self.opening_commission_amount, "decimal"),
-            ("Comisión por cierre", self.closing_commission_amount, "decimal"),
-            ("Comisión por alcanzar la meta", self.new_opening_commission_amount, "decimal"),
-            ("Ventas para alcanzar nueva comisión", self.threshold_sales_amount, "decimal"),
-            ("Comisión por público en general", self.commission_amount_general_public, "decimal"),
-            ("Es público en general", self.is_general_public, "boolean"),
-            ("Activo", self.is_active, "boolean"),
-        ]
-
     def __str__(self):
         return f"<{self.__class__.__name__} id={self.id} name={self.name}>"
@@ -1,3 +1,189 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from users.models import CustomUser
+from tracking.versions import table_versions
+from utils.cache import get_version
+from utils.testing import full_permissions_user, seed_sample_data
+
+from .forms import SubCategoryForm
+from .models import Category
+from .views import CategoryListView
+
+
+class CachedCategoryChoicesTests(TestCase):
+    """Las opciones de categoría salen de la caché y se invalidan al cambiar categorías."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.music = Category.objects.create(name="Música", is_active=True)
+        cls.cooking = Category.objects.create(name="Cocina", is_active=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def render_category(self):
+        return str(SubCategoryForm()["category"])
+
+    def test_second_render_hits_cache(self):
+        with self.assertNumQueries(1):
+            html = self.render_category()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render_category(), html)
+        self.assertIn("Música", html)
+        self.assertNotIn("Cocina", html)
+
+    def test_saving_category_invalidates_choices(self):
+        self.render_category()
+        self.cooking.is_active = True
+        self.cooking.save()
+        with self.assertNumQueries(1):
+            self.assertIn("Cocina", self.render_category())
+
+    def test_submitted_pk_is_validated_against_database(self):
+        self.render_category()
+        # Inactiva sin señales (update): la caché sigue mostrándola, la validación no
+        Category.objects.filter(pk=self.music.pk).update(is_active=False)
+        form = SubCategoryForm(data={"category": self.music.pk})
+        form.is_valid()
+        self.assertIn("category", form.errors)
+
+
+class CategoryBulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = full_permissions_user()
+        cls.categories = [Category.objects.create(name=f"Inglés {i}", is_active=True) for i in range(4)]
+
+    def test_deactivate_updates_rows_and_invalidates_choices(self):
+        self.client.force_login(self.admin)
+        self.assertIn("Inglés 0", str(SubCategoryForm()["category"]))
+        pks = [c.pk for c in self.categories[:3]]
+        self.client.post(reverse("modalities:category_list"), {"action": "deactivate", "selected": pks})
+        self.assertEqual(Category.objects.filter(is_active=True).count(), 1)
+        self.assertNotIn("Inglés 0", str(SubCategoryForm()["category"]))
+
+    def test_hard_delete_invalidates_cascaded_tables(self):
+        # En PostgreSQL subcategorías e inscripciones las borra ON DELETE CASCADE, sin pasar por Django
+        category = seed_sample_data(employees=1, groups=1, categories=1, students=1, enrollments=2)["category"]
+        before = (table_versions(["modalities.subcategory"]), get_version("enrollments.enrollment"))
+        self.client.force_login(self.admin)
+        self.client.post(reverse("modalities:category_list"), {"action": "delete", "selected": [category.pk]})
+        after = (table_versions(["modalities.subcategory"]), get_version("enrollments.enrollment"))
+        self.assertGreater(after[0]["modalities.subcategory"][0], before[0]["modalities.subcategory"][0])
+        self.assertGreater(after[1], before[1])
+
+
+class CategoryArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = full_permissions_user()
+        cls.category = Category.objects.create(name="Danza", is_active=True)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_duplicate_active_name(self):
+        response = self.client.post(reverse("modalities:category_create"), {"name": "Danza", "is_active": "on"})
+        self.assertEqual(response.context["form"].errors["name"], ["Ya existe una categoría con este nombre."])
+
+    def test_archived_category_frees_name_and_is_gone(self):
+        response = self.client.post(reverse("modalities:category_delete", args=[self.category.pk]), follow=True)
+        self.assertEqual([str(m) for m in response.context["messages"]], ["Categoría archivada correctamente."])
+        for name in ("modalities:category_detail", "modalities:category_update", "modalities:category_delete"):
+            self.assertEqual(self.client.get(reverse(name, args=[self.category.pk])).status_code, 404, name)
+        self.client.post(reverse("modalities:category_create"), {"name": "Danza", "is_active": "on"})
+        self.assertEqual(Category.objects.filter(name="Danza").count(), 2)
+        self.assertEqual(Category.objects.active().get(name="Danza").is_active, True)
+
+
+class ConditionalListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = full_permissions_user()
+        cls.category = Category.objects.create(name="Fotografía", is_active=True)
+        CustomUser.objects.create_user(email="otro@aula.mx", password="aula-286")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse("modalities:category_list")
+        # La primera respuesta fija la cookie CSRF, que forma parte del ETag
+        self.client.get(self.url)
+
+    def test_unchanged_list_returns_304_without_list_query(self):
+        etag = self.client.get(self.url)["ETag"]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([q for q in ctx.captured_queries if "modalities_category" in q["sql"]])
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.category.name = "Fotografía Digital"
+        self.category.save()
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_login_does_not_change_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        # update_last_login: save(update_fields=["last_login"]) de otro usuario
+        self.assertTrue(Client().login(email="otro@aula.mx", password="aula-286"))
+        self.assertEqual(self.client.get(self.url, headers={"if-none-match": etag}).status_code, 304)
+
+    def test_bulk_update_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.post(self.url, {"action": "deactivate", "selected": [self.category.pk]})
+        # Primero el mensaje de resumen (sin 304) y luego la nueva versión
+        self.assertEqual(self.client.get(self.url, headers={"if-none-match": etag}).status_code, 200)
+        self.assertEqual(self.client.get(self.url, headers={"if-none-match": etag}).status_code, 200)
+
+    def test_detail_etag_depends_on_user(self):
+        url = reverse("modalities:category_detail", args=[self.category.pk])
+        etag = self.client.get(url)["ETag"]
+        self.client.force_login(full_permissions_user(email="otra@aula.mx"))
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 200)
+
+
+class PaginationTests(TestCase):
+    """Paginación con ventana de páginas ("…"), cuadro "Ir a" y tamaño de página con tope."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = full_permissions_user()
+        Category.objects.bulk_create([Category(name=f"Canto {i:03d}", is_active=True) for i in range(120)])
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse("modalities:category_list")
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(self.url, {"page_size": 10_000})
+        self.assertEqual(response.context["paginator"].per_page, CategoryListView.max_paginate_by)
+        response = self.client.get(self.url, {"page_size": "abc"})
+        self.assertEqual(response.context["paginator"].per_page, CategoryListView.paginate_by)
+
+    def test_out_of_range_page_shows_last_page(self):
+        response = self.client.get(self.url, {"page": 99_999, "q": "Canto"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["page_obj"].number, response.context["paginator"].num_pages)
+        # El cuadro "Ir a" conserva el filtro y el orden
+        self.assertContains(response, '<input type="hidden" name="q" value="Canto">', html=True)
+
+    def test_large_page_count_renders_window(self):
+        page = Paginator(range(100_000), 2).page(25_000)
+        context = {
+            "is_paginated": True, "page_obj": page, "querystring": "q=canto",
+            "page_range": page.paginator.get_elided_page_range(25_000, on_each_side=2, on_ends=1),
+        }
+        html = render_to_string("components/list/pagination.html", context)
+        # Antes: 50 000 <li> (varios MB); ahora anterior/siguiente + 1 … 24998-25002 … 50000.
+        # El tamaño acota el costo sin depender de la velocidad de la máquina (sin tiempos)
+        self.assertEqual(html.count("<li"), 11)
+        self.assertLess(len(html), 5_000)
+        self.assertIn("page=50000", html)
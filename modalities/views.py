@@ -1,14 +1,17 @@
 import unicodedata
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.db import IntegrityError
 from django.db.models import Q
 from django.db.models.functions import Lower
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.views.generic import DeleteView
 
+from audit.mixins import AuditMixin
+from audit.models import AuditEntry
 from utils.db_functions import Unaccent
-from utils.mixins.crud import CreateMixin, DetailMixin, ListMixin, UpdateMixin
+from utils.mixins.crud import ActiveObjectMixin, CreateMixin, DetailMixin, ListMixin, UpdateMixin
 from .forms import CategoryForm, CategorySearchForm, SubCategoryForm, SubCategorySearchForm
 from .models import Category, SubCategory
 
@@ -24,9 +27,15 @@ class CategoryListView(ListMixin):
         'is_active'
     ]
     default_ordering = ['name']
+    bulk_actions = {
+        "activate": ("Activar", "auth.change_group"),
+        "deactivate": ("Desactivar", "auth.change_group"),
+        "archive": ("Archivar", "auth.delete_group"),
+        "delete": ("Eliminar definitivamente", "auth.delete_group"),
+    }
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().active()
         self.form = CategorySearchForm(self.request.GET)
         if self.form.is_valid():
             q = self.form.cleaned_data['q']
@@ -94,7 +103,7 @@ class CategoryDetailView(DetailMixin):
     permission_required = "auth.delete_group"
 
 
-class CategoryDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class CategoryDeleteView(LoginRequiredMixin, PermissionRequiredMixin, ActiveObjectMixin, AuditMixin, DeleteView):
     model = Category
     template_name = "modalities/categories/confirm_delete.html"
     active_menu = "categories"
@@ -105,10 +114,11 @@ class CategoryDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView
     def post(self, request, *args, **kwargs):
         try:
             self.object = self.get_object()
-            self.object.delete()
-            messages.success(request, "Categoría eliminada correctamente.")
+            self.object.archive()
+            self.audit(AuditEntry.ARCHIVE)
+            messages.success(request, "Categoría archivada correctamente.")
         except IntegrityError as e:
-            messages.error(request, "No se pudo eliminar la categoría.")
+            messages.error(request, "No se pudo archivar la categoría.")
         return redirect(self.success_url)
 
 
@@ -123,9 +133,15 @@ class SubCategoryListView(ListMixin):
         'is_active'
     ]
     default_ordering = ['name']
+    bulk_actions = {
+        "activate": ("Activar", "auth.change_group"),
+        "deactivate": ("Desactivar", "auth.change_group"),
+        "archive": ("Archivar", "auth.delete_group"),
+        "delete": ("Eliminar definitivamente", "auth.delete_group"),
+    }
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().active()
         self.form = SubCategorySearchForm(self.request.GET)
         if self.form.is_valid():
             q = self.form.cleaned_data['q']
@@ -187,12 +203,13 @@ class SubCategoryUpdateView(UpdateMixin):
 
 class SubCategoryDetailView(DetailMixin):
     model = SubCategory
+    version_models = ("modalities.category",)
     template_name = 'modalities/sub_categories/detail.html'
     active_menu = "subcategories"
     permission_required = "auth.delete_group"
 
 
-class SubCategoryDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class SubCategoryDeleteView(LoginRequiredMixin, PermissionRequiredMixin, ActiveObjectMixin, AuditMixin, DeleteView):
     model = SubCategory
     template_name = "modalities/sub_categories/confirm_delete.html"
     active_menu = "subcategories"
@@ -203,8 +220,9 @@ class SubCategoryDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteV
     def post(self, request, *args, **kwargs):
         try:
             self.object = self.get_object()
-            self.object.delete()
-            messages.success(request, "Sub categoría eliminada correctamente.")
+            self.object.archive()
+            self.audit(AuditEntry.ARCHIVE)
+            messages.success(request, "Sub categoría archivada correctamente.")
         except IntegrityError as e:
-            messages.error(request, "No se pudo eliminar la sub categoría.")
+            messages.error(request, "No se pudo archivar la sub categoría.")
         return redirect(self.success_url)
@@ -0,0 +1,34 @@
+/* Contadores del dashboard en vivo: Server-Sent Events de /dashboard/events/ (enrollments.live) */
+(function () {
+    var script = document.currentScript;
+    if (!window.EventSource || !script) {
+        return;
+    }
+    var decimals = {revenue: 2};
+
+    function counter(name) {
+        return document.querySelector('[data-live-counter="' + name + '"]');
+    }
+
+    function render(name, value) {
+        var el = counter(name);
+        if (el) {
+            el.textContent = Number(value).toFixed(decimals[name] || 0);
+        }
+    }
+
+    var source = new EventSource(script.dataset.eventsUrl);
+    source.addEventListener('snapshot', function (e) {
+        var data = JSON.parse(e.data);
+        Object.keys(data).forEach(function (name) { render(name, data[name]); });
+    });
+    source.addEventListener('delta', function (e) {
+        var data = JSON.parse(e.data);
+        Object.keys(data).forEach(function (name) {
+            var el = counter(name);
+            if (el) {
+                render(name, Number(el.textContent) + Number(data[name]));
+            }
+        });
+    });
+})();
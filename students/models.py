@@ -1,8 +1,10 @@
 from django.conf import settings
 from django.db import models
 
+from utils.models import DetailFieldsMixin, TimestampedModel
 
-class Student(models.Model):
+
+class Student(DetailFieldsMixin, TimestampedModel):
     user = models.OneToOneField(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -15,6 +17,17 @@ class Student(models.Model):
     phone_number_2 = models.CharField(max_length=10, null=True, verbose_name="Número telefónico 2")
     picture = models.ImageField(upload_to='students', verbose_name="Imagen")
 
+    detail_fields = [
+        ("Imagen", "picture", "image"),
+        ("Correo electrónico", "user__email", "text"),
+        ("Nombre(s)", "user__first_name", "text"),
+        ("Apellidos", "user__last_name", "text"),
+        ("Dirección", "address", "text"),
+        ("Fecha de nacimiento", "birthdate", "date"),
+        ("Número telefónico", "phone_number", "text"),
+        ("Número telefónico 2", "phone_number_2", "text"),
+    ]
+
     class Meta:
         verbose_name = "Estudiante"
         verbose_name_plural = "Estudiantes"
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class TrackingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tracking'
+    verbose_name = "Versiones de tablas"
+
+    def ready(self):
+        from .versions import connect_signals
+
+        connect_signals()
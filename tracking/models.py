@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """Contador de cambios por tabla (app_label.model); lo usan las respuestas 304."""
+    label = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Versión de tabla"
+        verbose_name_plural = "Versiones de tablas"
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
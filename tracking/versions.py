@@ -0,0 +1,99 @@
+# tracking/versions.py
+# Código en inglés; comentarios en español
+"""
+Versión por tabla en la BD (compartida entre procesos), subida en cada escritura.
+
+- Señales post_save/post_delete/m2m_changed de TRACKED_MODELS la suben solas.
+- QuerySet.update()/borrados crudos no mandan señales: llamar mark_changed(model).
+"""
+from django.apps import apps
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+from utils.cache import bump_version, model_label
+
+# Tablas que pintan ListMixin/DetailMixin; Enrollment no (cada inscripción competiría por la misma fila)
+TRACKED_MODELS = [
+    "auth.group",
+    "employees.employee",
+    "modalities.category",
+    "modalities.subcategory",
+    "students.student",
+    "users.customuser",
+]
+
+# Guardados que no cambian nada de lo que se pinta (como audit.log.IGNORED_FIELDS): cada login
+# guarda last_login y, sin esto, invalidaría todas las páginas y competiría por la fila de users.customuser
+IGNORED_UPDATE_FIELDS = {"last_login"}
+
+# Relaciones M2M cuyo cambio cuenta como cambio del modelo dueño
+TRACKED_M2M = [
+    ("users.customuser", "groups"),
+    ("users.customuser", "user_permissions"),
+    ("auth.group", "permissions"),
+]
+
+
+def bump(*labels):
+    from .models import TableVersion
+
+    now = timezone.now()
+    for label in labels:
+        updated = TableVersion.objects.filter(label=label).update(version=F("version") + 1, updated_at=now)
+        if not updated:
+            TableVersion.objects.get_or_create(label=label, defaults={"version": 1, "updated_at": now})
+
+
+def mark_changed(*models):
+    """Para escrituras sin señales: sube la versión en la BD y la de la caché local."""
+    labels = [model_label(model) for model in models]
+    for label in labels:
+        bump_version(label)
+    bump(*[label for label in labels if label in TRACKED_MODELS])
+
+
+def table_versions(labels):
+    """{label: (version, updated_at)} de las tablas que ya tuvieron escrituras (una consulta)."""
+    from .models import TableVersion
+
+    return {
+        label: (version, updated_at)
+        for label, version, updated_at in TableVersion.objects.filter(label__in=labels).values_list(
+            "label", "version", "updated_at"
+        )
+    }
+
+
+async def atable_versions(labels):
+    """table_versions() con el ORM asíncrono (vistas de utils.mixins.async_crud)."""
+    from .models import TableVersion
+
+    return {
+        label: (version, updated_at)
+        async for label, version, updated_at in TableVersion.objects.filter(label__in=labels).values_list(
+            "label", "version", "updated_at"
+        )
+    }
+
+
+def _on_write(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= IGNORED_UPDATE_FIELDS:
+        return
+    bump(model_label(sender))
+
+
+def _on_m2m_change(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        bump(model_label(type(instance)) if not kwargs.get("reverse") else model_label(kwargs["model"]))
+
+
+def connect_signals():
+    for label in TRACKED_MODELS:
+        model = apps.get_model(label)
+        uid = f"tracking.versions:{label}"
+        post_save.connect(_on_write, sender=model, dispatch_uid=uid)
+        post_delete.connect(_on_write, sender=model, dispatch_uid=uid)
+    for label, field_name in TRACKED_M2M:
+        through = apps.get_model(label)._meta.get_field(field_name).remote_field.through
+        m2m_changed.connect(_on_m2m_change, sender=through, dispatch_uid=f"tracking.versions:{label}.{field_name}")
@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-19 13:27
+
+from django.db import migrations, models
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat, StrIndex, Substr
+
+ARCHIVED_EMAIL_PREFIX = "archived:"
+
+
+def split_archived_emails(apps, schema_editor):
+    """"archived:<id>:<correo>" -> email "archived:<id>" y archived_email "<correo>"."""
+    CustomUser = apps.get_model("users", "CustomUser")
+    # Lo que sigue al ":" posterior al id
+    start = len(ARCHIVED_EMAIL_PREFIX) + 1
+    CustomUser.objects.filter(email__startswith=ARCHIVED_EMAIL_PREFIX, archived_email__isnull=True).update(
+        archived_email=Substr("email", StrIndex(Substr("email", start), Value(":")) + start),
+        email=Concat(Value(ARCHIVED_EMAIL_PREFIX), Cast("id", CharField()), output_field=CharField()),
+    )
+
+
+def join_archived_emails(apps, schema_editor):
+    CustomUser = apps.get_model("users", "CustomUser")
+    CustomUser.objects.filter(archived_email__isnull=False).update(
+        email=Concat(
+            Value(ARCHIVED_EMAIL_PREFIX), Cast("id", CharField()), Value(":"), "archived_email",
+            output_field=CharField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='archived_email',
+            field=models.EmailField(editable=False, max_length=255, null=True, verbose_name='Correo antes de archivar'),
+        ),
+        migrations.RunPython(split_archived_emails, join_archived_emails),
+    ]
@@ -4,6 +4,8 @@ from django.contrib.auth.models import (
 )
 from django.utils import timezone
 
+from utils.models import TimestampedModel
+
 class CustomUserManager(BaseUserManager):
     """Manager para CustomUser usando email como identificador."""
     def create_user(self, email, password=None, **extra_fields):
@@ -20,8 +22,10 @@ class CustomUserManager(BaseUserManager):
         extra_fields.setdefault('is_superuser', True)
         return self.create_user(email, password, **extra_fields)
 
-class CustomUser(AbstractBaseUser, PermissionsMixin):
+class CustomUser(AbstractBaseUser, PermissionsMixin, TimestampedModel):
     email = models.EmailField('Correo electrónico', unique=True, max_length=255)
+    # Correo original mientras el empleado está archivado (employees.models.archived_email)
+    archived_email = models.EmailField('Correo antes de archivar', max_length=255, null=True, editable=False)
     first_name = models.CharField('Nombre(s)', max_length=30, blank=True)
     last_name = models.CharField('Apellidos', max_length=30, blank=True)
     is_active = models.BooleanField('¿Activo?', default=True)
@@ -34,6 +38,12 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     REQUIRED_FIELDS = []
 
     class Meta:
+        # Ordenamientos de la lista de empleados (utils.indexes); email ya es único
+        indexes = [
+            models.Index(fields=['first_name', 'last_name', 'id'], name='user_name_idx'),
+            models.Index(fields=['last_name', 'first_name', 'id'], name='user_last_name_idx'),
+            models.Index(fields=['is_active', 'email'], name='user_active_email_idx'),
+        ]
         verbose_name = 'usuario'
         verbose_name_plural = 'usuarios'
 
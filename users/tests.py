@@ -1,3 +1,49 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
 from django.test import TestCase
+from django.urls import reverse
+
+from users.forms import LoginForm
+from users.models import CustomUser
+
+
+class LoginFormTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email="inés@aula.mx", password="contraseña-segura")
+
+    def post_login(self, password):
+        with mock.patch("django.contrib.auth.forms.authenticate", wraps=authenticate) as spy:
+            response = self.client.post(reverse("login"), {"username": self.user.email, "password": password})
+        return response, spy.call_count
+
+    def test_building_bound_form_does_not_validate(self):
+        with mock.patch("django.contrib.auth.forms.authenticate") as spy:
+            form = LoginForm(data={"username": self.user.email, "password": "x"})
+        spy.assert_not_called()
+        self.assertIsNone(form._errors)
+
+    def test_authenticate_runs_once_per_successful_post(self):
+        response, calls = self.post_login("contraseña-segura")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(calls, 1)
+
+    def test_authenticate_runs_once_per_failed_post(self):
+        response, calls = self.post_login("incorrecta")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calls, 1)
+
+    def test_error_class_added_at_render_time(self):
+        form = LoginForm(data={"username": "", "password": ""})
+        self.assertFalse(form.is_valid())
+        html = str(form["username"])
+        self.assertIn('class="form-control form-control-lg error"', html)
+        # El widget compartido no se modifica
+        self.assertNotIn("error", form.fields["username"].widget.attrs["class"])
 
-# Create your tests here.
+    def test_valid_field_has_no_error_class(self):
+        form = LoginForm(data={"username": self.user.email, "password": ""})
+        form.is_valid()
+        self.assertNotIn("error", str(form["username"]))
+        self.assertIn("error", str(form["password"]))
@@ -4,7 +4,7 @@ from django.contrib import messages
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.contrib.auth.models import Group, Permission
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.text import capfirst
@@ -13,8 +13,11 @@ from django.contrib.contenttypes.models import ContentType
 from django.db.models.functions import Lower
 from django.db.models import Q
 
+from audit.mixins import AuditMixin
+from audit.models import AuditEntry
 from utils.db_functions import Unaccent
 from utils.mixins.crud import CreateMixin, DetailMixin, ListMixin, UpdateMixin
+from utils.permissions import permission_catalog
 from .forms import GroupForm, GroupSearchForm
 
 
@@ -99,6 +102,12 @@ def group_permissions_by_model(permissions):
         })
     return result
 
+
+def group_permission_catalog():
+    """group_permissions_by_model(filtered_permissions_qs()) cacheado (utils.permissions.permission_catalog)."""
+    return permission_catalog("group-permission-catalog", filtered_permissions_qs, group_permissions_by_model)
+
+
 class GroupListView(ListMixin):
     model = Group
     search_form = GroupSearchForm
@@ -132,16 +141,17 @@ class GroupListView(ListMixin):
                     Q(name_norm__contains=q_norm)
                 )
 
-            ordering = self.request.GET.get('ordering')
-            if ordering:
-                # permitimos "-campo" o "campo"
-                raw = ordering.lstrip('-')
-                if raw in self.allowed_sort_fields:
-                    qs = qs.order_by(ordering)
-                else:
-                    qs = qs.order_by(*self.default_ordering)
+        # También con el formulario inválido: la paginación necesita un orden
+        ordering = self.request.GET.get('ordering')
+        if ordering:
+            # permitimos "-campo" o "campo"
+            raw = ordering.lstrip('-')
+            if raw in self.allowed_sort_fields:
+                qs = qs.order_by(ordering)
             else:
                 qs = qs.order_by(*self.default_ordering)
+        else:
+            qs = qs.order_by(*self.default_ordering)
 
         return qs
 
@@ -153,6 +163,7 @@ class GroupCreateView(CreateMixin):
     active_menu = "groups"
     success_url = reverse_lazy("users:group_list")
     permission_required = "auth.add_group"
+    audit_m2m = ("permissions",)
     success_message = "Grupo creado correctamente."
     error_message = "Error al crear el grupo."
 
@@ -163,8 +174,7 @@ class GroupCreateView(CreateMixin):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        perms_qs = self.get_form().fields["permissions"].queryset
-        ctx["perms_by_model"] = group_permissions_by_model(perms_qs)
+        ctx["perms_by_model"] = group_permission_catalog()
 
         # IDs seleccionados (para mantener checks tras validación)
         if self.request.method == "POST":
@@ -190,6 +200,7 @@ class GroupUpdateView(UpdateMixin):
     active_menu = "groups"
     success_url = reverse_lazy("users:group_list")
     permission_required = "auth.change_group"
+    audit_m2m = ("permissions",)
     success_message = "Grupo actualizado correctamente."
     error_message = "Error al actualizar el grupo."
 
@@ -200,8 +211,7 @@ class GroupUpdateView(UpdateMixin):
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        perms_qs = self.get_form().fields["permissions"].queryset
-        ctx["perms_by_model"] = group_permissions_by_model(perms_qs)
+        ctx["perms_by_model"] = group_permission_catalog()
 
         if self.request.method == "POST":
             selected = set(map(int, self.request.POST.getlist("permissions")))
@@ -228,11 +238,8 @@ class GroupDetailView(DetailMixin):
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
 
-        # Todos los permisos filtrados como en create/update
-        perms_qs = filtered_permissions_qs()
-
-        # Agrupados por modelo (igual que en create/update)
-        ctx["perms_by_model"] = group_permissions_by_model(perms_qs)
+        # Todos los permisos filtrados y agrupados por modelo (igual que en create/update)
+        ctx["perms_by_model"] = group_permission_catalog()
 
         # IDs de los permisos asignados a este grupo
         ctx["selected_perm_ids"] = set(
@@ -242,21 +249,19 @@ class GroupDetailView(DetailMixin):
         return ctx
 
 
-class GroupDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
+class GroupDeleteView(LoginRequiredMixin, PermissionRequiredMixin, AuditMixin, DeleteView):
     model = Group
     template_name = "users/groups/confirm_delete.html"
     active_menu = "groups"
     success_url = reverse_lazy("users:group_list")
     permission_required = "auth.delete_group"
+    audit_m2m = ("permissions",)
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
 
-        # Todos los permisos filtrados como en create/update
-        perms_qs = filtered_permissions_qs()
-
-        # Agrupados por modelo (igual que en create/update)
-        ctx["perms_by_model"] = group_permissions_by_model(perms_qs)
+        # Todos los permisos filtrados y agrupados por modelo (igual que en create/update)
+        ctx["perms_by_model"] = group_permission_catalog()
 
         # IDs de los permisos asignados a este grupo
         ctx["selected_perm_ids"] = set(
@@ -267,8 +272,11 @@ class GroupDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView):
 
     def post(self, request, *args, **kwargs):
         try:
-            self.object = self.get_object()
-            self.object.delete()
+            with transaction.atomic():
+                self.object = self.get_object()
+                # Antes de delete(), que deja pk en None; el registro se descarta si el borrado falla
+                self.audit(AuditEntry.DELETE)
+                self.object.delete()
             messages.success(request, "Grupo eliminado correctamente.")
         except IntegrityError as e:
             messages.error(request, "No se pudo eliminar el grupo.")
@@ -0,0 +1,77 @@
+# utils/cache.py
+# Código en inglés; comentarios en español
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db.models.signals import post_delete, post_save
+
+from utils import invalidation
+from utils.metrics import record_cache
+
+VERSION_KEY = "cache-version:{label}"
+_registered = set()
+
+
+def model_label(model) -> str:
+    return model._meta.label_lower
+
+
+def get_version(label: str) -> int:
+    """Versión actual de los datos cacheados de un modelo (empieza en 1)."""
+    key = VERSION_KEY.format(label=label)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(label: str) -> None:
+    """
+    Invalida todo lo cacheado para el modelo: las claves viejas dejan de leerse.
+    Con LocMemCache y PostgreSQL también en los demás procesos (utils.invalidation).
+    """
+    bump_local_version(label)
+    invalidation.publish(label)
+
+
+def bump_local_version(label: str) -> None:
+    key = VERSION_KEY.format(label=label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # La clave expiró o nunca existió: cualquier valor distinto de 1 sirve
+        cache.set(key, 2, timeout=None)
+
+
+def get_or_build(model, key: str, builder, timeout=DEFAULT_TIMEOUT):
+    """
+    Lee 'key' de la caché versionada por modelo; si no existe lo construye con builder().
+    Registra el acierto/fallo en las métricas de la petición.
+    Si la caché local no es confiable (utils.invalidation) construye sin leer ni guardar.
+    """
+    if not invalidation.local_cache_usable():
+        record_cache(False)
+        return builder()
+    label = model_label(model)
+    full_key = f"{key}:{label}:v{get_version(label)}:e{invalidation.epoch()}"
+    value = cache.get(full_key)
+    record_cache(value is not None)
+    if value is None:
+        value = builder()
+        cache.set(full_key, value, timeout)
+    return value
+
+
+def _bump_for_sender(sender, **kwargs):
+    bump_version(model_label(sender))
+
+
+def invalidate_on_change(model) -> None:
+    """Sube la versión del modelo en cada alta, cambio o baja (idempotente)."""
+    label = model_label(model)
+    if label in _registered:
+        return
+    _registered.add(label)
+    uid = f"utils.cache.invalidate:{label}"
+    post_save.connect(_bump_for_sender, sender=model, dispatch_uid=uid)
+    post_delete.connect(_bump_for_sender, sender=model, dispatch_uid=uid)
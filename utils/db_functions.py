@@ -1,9 +1,31 @@
 # utils/db_functions.py
+import unicodedata
+
 from django.db.models import Func, TextField
 
+
+def unaccent(text):
+    """Versión Python de unaccent(): quita diacríticos (á -> a, ñ -> n)."""
+    if text is None:
+        return None
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """
+    Receptor de connection_created: en SQLite registra unaccent() como función
+    Python para que Unaccent funcione igual que con la extensión de PostgreSQL.
+    """
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function('unaccent', 1, unaccent, deterministic=True)
+
+
 class Unaccent(Func):
     """
-    Funcion UNACCENT de PostgreSQL para quitar acentos.
+    Funcion UNACCENT para quitar acentos.
+    - PostgreSQL: extensión unaccent (migración employees/0003).
+    - SQLite: función Python registrada al abrir la conexión (register_sqlite_functions).
     Uso: annotate(field_unaccent=Unaccent('campo'))
     """
     function = 'unaccent'
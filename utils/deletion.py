@@ -0,0 +1,101 @@
+# utils/deletion.py
+# Código en inglés; comentarios en español
+"""
+Borrado físico por conjuntos sin el Collector de Django.
+
+Collector carga en memoria cada fila dependiente (p. ej. todas las inscripciones de
+un vendedor) y borra por lotes. Aquí cada relación es un DELETE ... WHERE fk IN (subconsulta)
+y, en PostgreSQL, las FKs de DB_CASCADE llevan ON DELETE CASCADE: la BD borra sola.
+
+No dispara señales pre/post_delete ni borra archivos; usar solo en rutas masivas.
+"""
+from django.db import connections, models
+from django.db.models.deletion import get_candidate_relations_to_delete
+
+from tracking.versions import mark_changed
+
+# (app_label.Model, campo) con ON DELETE CASCADE en la BD (migración enrollments 0002)
+DB_CASCADE = {
+    ("enrollments.Enrollment", "registered_by"),
+    ("enrollments.Enrollment", "student"),
+    ("enrollments.Enrollment", "sub_category"),
+    ("modalities.SubCategory", "category"),
+}
+
+
+def has_db_cascade(field, using) -> bool:
+    return (
+        connections[using].vendor == "postgresql"
+        and (field.model._meta.label, field.name) in DB_CASCADE
+    )
+
+
+def db_cascade_models(model, using):
+    """Modelos cuyas filas borra la BD en cascada al borrar 'model' (DB_CASCADE, recursivo)."""
+    found = []
+    for rel in get_candidate_relations_to_delete(model._meta):
+        if has_db_cascade(rel.field, using):
+            for related in [rel.related_model, *db_cascade_models(rel.related_model, using)]:
+                if related not in found:
+                    found.append(related)
+    return found
+
+
+def raw_cascade_delete(queryset) -> int:
+    """
+    Borra el queryset y sus dependientes CASCADE con un DELETE por relación.
+    Si alguna relación no es CASCADE/DO_NOTHING (PROTECT, SET_NULL...) usa queryset.delete().
+    Devuelve las filas borradas del modelo del queryset.
+    """
+    using = queryset.db
+    relations = list(get_candidate_relations_to_delete(queryset.model._meta))
+    if any(rel.on_delete not in (models.CASCADE, models.DO_NOTHING) for rel in relations):
+        return queryset.delete()[1].get(queryset.model._meta.label, 0)
+
+    cascaded = []
+    for rel in relations:
+        if rel.on_delete is models.DO_NOTHING:
+            continue
+        # Las FKs de DB_CASCADE y sus descendientes (también en DB_CASCADE) los borra la BD;
+        # sus versiones sí hay que subirlas aquí
+        if has_db_cascade(rel.field, using):
+            cascaded += [rel.related_model, *db_cascade_models(rel.related_model, using)]
+            continue
+        dependents = rel.related_model._base_manager.using(using).filter(
+            **{f"{rel.field.name}__in": queryset.values(rel.field.target_field.attname)}
+        )
+        raw_cascade_delete(dependents)
+
+    count = queryset._raw_delete(using)
+    # Sin señales: versiones de tabla y caché se suben aquí
+    mark_changed(queryset.model, *dict.fromkeys(cascaded))
+    return count
+
+
+def _recreate_foreign_keys(apps, schema_editor, on_delete_sql):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    for label, field_name in sorted(DB_CASCADE):
+        model = apps.get_model(label)
+        field = model._meta.get_field(field_name)
+        target = field.target_field
+        for name in schema_editor._constraint_names(model, [field.column], foreign_key=True):
+            schema_editor.execute(
+                f"ALTER TABLE {quote(model._meta.db_table)} DROP CONSTRAINT {quote(name)}, "
+                f"ADD CONSTRAINT {quote(name)} FOREIGN KEY ({quote(field.column)}) "
+                f"REFERENCES {quote(target.model._meta.db_table)} ({quote(target.column)})"
+                f"{on_delete_sql} DEFERRABLE INITIALLY DEFERRED"
+            )
+
+
+def add_db_cascade(apps, schema_editor):
+    """
+    RunPython: recrea las FKs de DB_CASCADE con ON DELETE CASCADE (solo PostgreSQL).
+    Un AlterField posterior sobre estas FKs las recrea sin la cláusula: repetir esta operación.
+    """
+    _recreate_foreign_keys(apps, schema_editor, " ON DELETE CASCADE")
+
+
+def remove_db_cascade(apps, schema_editor):
+    _recreate_foreign_keys(apps, schema_editor, "")
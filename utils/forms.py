@@ -1,50 +1,103 @@
 # utils/forms.py
+import hashlib
+
 from django import forms
+from django.forms.boundfield import BoundField
+from django.forms.models import ModelChoiceIterator
+
+from utils.cache import get_or_build, invalidate_on_change
+
+
+class ErrorBoundField(BoundField):
+    """
+    Añade la clase de error del form al widget al momento de renderizar.
+    Usa solo errores ya calculados (form._errors): nunca dispara la validación.
+    """
+
+    def build_widget_attrs(self, attrs, widget=None):
+        attrs = super().build_widget_attrs(attrs, widget)
+        errors = self.form._errors
+        if not errors or self.name not in errors:
+            return attrs
+
+        widget = widget or self.field.widget
+        error_attr = self.form.error_attr
+        # attrs sustituye a widget.attrs al renderizar: partimos de las clases del widget
+        existing = attrs.get(error_attr) or widget.attrs.get(error_attr, "")
+        classes = existing.split()
+        if self.form.widget_error_class not in classes:
+            classes.append(self.form.widget_error_class)
+        attrs[error_attr] = " ".join(classes)
+        return attrs
+
 
 class ErrorClassMixin:
     """
-    Añade 'error_class' al atributo 'class' de los widgets con error.
+    Añade 'widget_error_class' al atributo 'class' de los widgets con error.
     - No agrega clases base ni data-*.
     - Respeta las clases que ya tengas en cada widget.
+    - Se aplica al renderizar (ErrorBoundField); construir el form no lo valida.
+    - No se llama 'error_class': BaseForm usa ese nombre para la clase ErrorList.
     """
-    error_class = "error"
+    widget_error_class = "error"
     error_attr  = "class"
+    bound_field_class = ErrorBoundField
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+class ErrorForm(ErrorClassMixin, forms.Form):
+    pass
 
-        if not self.is_bound:
-            return
+class ErrorModelForm(ErrorClassMixin, forms.ModelForm):
+    pass
 
-        # Fuerza validación una vez
-        _ = self.errors
 
-        for name, field in self.fields.items():
-            if name not in self.errors:
-                continue
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """Opciones (pk, etiqueta) desde la caché; no consulta la BD si ya están cacheadas."""
 
-            w = field.widget
-            existing = w.attrs.get(self.error_attr, "")
-            classes = existing.split()
-            # if isinstance(existing, str):
-            #     classes = existing.split()
-            # elif isinstance(existing, (list, tuple, set)):
-            #     classes = [str(x) for x in existing]
-            # else:
-            #     classes = [str(existing)] if existing else []
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self.field.cached_choices()
 
-            if self.error_class not in classes:
-                classes.append(self.error_class)
+    def __len__(self):
+        return len(self.field.cached_choices()) + (self.field.empty_label is not None)
 
-            w.attrs[self.error_attr] = " ".join(
-                c for c in classes if isinstance(c, str) and c
-            )
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.cached_choices())
 
-class ErrorForm(ErrorClassMixin, forms.Form):
-    pass
 
-class ErrorModelForm(ErrorClassMixin, forms.ModelForm):
-    pass
+class CachedModelChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField cuyas opciones se guardan en caché versionada por modelo.
+    - La versión sube en cada post_save/post_delete del modelo (utils.cache).
+    - 'cache_key' es opcional: por defecto se deriva del SQL del queryset, así
+      cambiar el queryset (filtros, limit_choices_to) usa otra entrada.
+    - La validación sigue yendo a la BD: una consulta por pk enviado.
+    """
+    iterator = CachedModelChoiceIterator
+
+    def __init__(self, queryset, *, cache_key=None, **kwargs):
+        self.cache_key = cache_key
+        super().__init__(queryset, **kwargs)
+
+    def _set_queryset(self, queryset):
+        super()._set_queryset(queryset)
+        if queryset is not None:
+            invalidate_on_change(queryset.model)
+
+    queryset = property(forms.ModelChoiceField._get_queryset, _set_queryset)
+
+    def get_cache_key(self):
+        if self.cache_key:
+            return f"choices:{self.cache_key}"
+        sql = str(self.queryset.query).encode()
+        return f"choices:{hashlib.md5(sql, usedforsecurity=False).hexdigest()}"
+
+    def cached_choices(self):
+        return get_or_build(
+            self.queryset.model,
+            self.get_cache_key(),
+            lambda: [(obj.pk, self.label_from_instance(obj)) for obj in self.queryset],
+        )
 
 
 
@@ -0,0 +1,71 @@
+# utils/indexes.py
+# Código en inglés; comentarios en español
+"""
+Plan de índices para los ordenamientos de las listas.
+
+Cada ListMixin declara allowed_sort_fields y default_ordering; cada uno debe tener un
+índice cuya primera columna sea ese campo, en la tabla dueña de la columna
+('user__email' -> users_customuser.email). Cuentan: pk, unique, db_index, FKs,
+Meta.indexes (también parciales: las listas filtran .active()) y UniqueConstraint.
+"""
+from django.db import models
+from django.urls import get_resolver
+
+
+def leading_index_columns(model):
+    """{campo: nombre del índice} de los campos que encabezan algún índice del modelo."""
+    opts = model._meta
+    leading = {}
+    for field in opts.concrete_fields:
+        if field.primary_key:
+            leading[field.name] = "pk"
+        elif field.unique:
+            leading[field.name] = "unique"
+        elif field.db_index:
+            leading[field.name] = "db_index"
+    for index in opts.indexes:
+        if index.fields:
+            leading.setdefault(index.fields[0].lstrip("-"), index.name)
+    for constraint in opts.constraints:
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            leading.setdefault(constraint.fields[0], constraint.name)
+    for fields in opts.unique_together:
+        leading.setdefault(fields[0], "unique_together")
+    return leading
+
+
+def resolve_sort_field(model, path):
+    """('user__email') -> (CustomUser, 'email'): modelo dueño de la columna y campo."""
+    *relations, name = path.lstrip("-").split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model, model._meta.get_field(name).name
+
+
+def list_views():
+    """Subclases concretas de ListMixin (se importan al cargar el URLconf)."""
+    from utils.mixins.crud import ListMixin
+
+    get_resolver().url_patterns
+    pending, found = list(ListMixin.__subclasses__()), []
+    while pending:
+        view = pending.pop()
+        pending.extend(view.__subclasses__())
+        if view.model is not None:
+            found.append(view)
+    return sorted(found, key=lambda view: f"{view.__module__}.{view.__qualname__}")
+
+
+def sort_index_plan(views=None):
+    """[(vista, ruta, modelo, campo, índice o None)] por cada campo ordenable declarado."""
+    plan = []
+    for view in views if views is not None else list_views():
+        declared = [*getattr(view, "allowed_sort_fields", []), *getattr(view, "default_ordering", [])]
+        for path in dict.fromkeys(path.lstrip("-") for path in declared):
+            model, name = resolve_sort_field(view.model, path)
+            plan.append((view, path, model, name, leading_index_columns(model).get(name)))
+    return plan
+
+
+def missing_sort_indexes(views=None):
+    return [row for row in sort_index_plan(views) if row[4] is None]
@@ -0,0 +1,133 @@
+# utils/invalidation.py
+# Código en inglés; comentarios en español
+"""
+Bus de invalidación entre procesos para la caché local (LocMemCache) con LISTEN/NOTIFY de PostgreSQL.
+
+- utils.cache.bump_version() sube la versión local y publica el label en CHANNEL dentro de la
+  transacción de la escritura: llega a todos los workers al confirmar (y a ninguno si se revierte).
+- Cada worker tiene un hilo (Listener) con su propia conexión LISTEN que sube la versión local de
+  cada label recibido: las claves viejas dejan de leerse y el LRU de LocMemCache las expulsa.
+- Mientras el listener no está conectado la caché local no se usa (get_or_build construye siempre);
+  cada (re)conexión abre una época nueva, así lo cacheado antes de un corte no se vuelve a leer.
+- Read-your-writes: quien escribe recibe la cookie CACHE_FENCE_COOKIE y, mientras dure, el worker
+  que atienda sus peticiones espera a haber procesado todo lo confirmado hasta ese momento
+  (Listener.sync: un NOTIFY propio de ida y vuelta; PostgreSQL entrega en orden de commit).
+Solo activo con PostgreSQL y una caché por proceso: con Redis/Memcached la versión ya es compartida.
+"""
+import os
+import threading
+import uuid
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+from utils.listen import ListenThread
+
+CHANNEL = "cache_invalidate"
+SYNC_PREFIX = "sync:"
+
+# Labels escritos en la petición actual (CacheFenceMiddleware); None fuera de una petición
+_writes = ContextVar("cache_writes", default=None)
+# La petición no puede confiar en la caché local (el fence no se pudo confirmar)
+_bypass = ContextVar("cache_bypass", default=False)
+
+
+def enabled(using="default"):
+    return (
+        getattr(settings, "CACHE_BUS", True)
+        and connections[using].vendor == "postgresql"
+        and isinstance(caches["default"], LocMemCache)
+    )
+
+
+def publish(label, using="default"):
+    """NOTIFY en la transacción actual de 'using': se entrega al confirmar."""
+    if not enabled(using):
+        return
+    written = _writes.get()
+    if written is not None:
+        written.add(label)
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, label])
+
+
+def local_cache_usable():
+    """¿Puede la petición actual leer la caché local? Arranca el listener del proceso si falta."""
+    if not enabled():
+        return True
+    listener.ensure_started()
+    return listener.connected.is_set() and not _bypass.get()
+
+
+def epoch():
+    return listener.epoch
+
+
+def start_request():
+    """Para CacheFenceMiddleware: (labels escritos, tokens para finish_request)."""
+    written = set()
+    return written, (_writes.set(written), _bypass.set(False))
+
+
+def finish_request(tokens):
+    writes_token, bypass_token = tokens
+    _writes.reset(writes_token)
+    _bypass.reset(bypass_token)
+
+
+def fence(timeout):
+    """Read-your-writes: espera al listener; si no llega a tiempo la petición no usa la caché local."""
+    listener.ensure_started()
+    if not listener.sync(timeout):
+        _bypass.set(True)
+
+
+class Listener(ListenThread):
+    """Hilo por proceso (utils.listen) que sube la versión local de cada label recibido."""
+
+    channel = CHANNEL
+    reconnect_setting = "CACHE_BUS_RECONNECT"
+
+    def __init__(self):
+        super().__init__()
+        self.epoch = 0
+        self.waiters = {}
+
+    def start(self):
+        self.waiters = {}
+        super().start()
+
+    def on_connect(self):
+        # Lo cacheado antes de esta conexión pudo perder avisos
+        self.epoch += 1
+
+    def handle(self, payload):
+        if payload.startswith(SYNC_PREFIX):
+            waiter = self.waiters.pop(payload, None)
+            if waiter is not None:
+                waiter.set()
+            return
+        from utils.cache import bump_local_version
+
+        bump_local_version(payload)
+
+    def sync(self, timeout):
+        """True cuando este proceso ya recibió todo lo confirmado antes de la llamada."""
+        # Dentro de una transacción el NOTIFY esperaría al commit
+        if not self.connected.wait(timeout) or connections["default"].in_atomic_block:
+            return False
+        token = f"{SYNC_PREFIX}{os.getpid()}:{uuid.uuid4().hex}"
+        waiter = self.waiters[token] = threading.Event()
+        try:
+            # Conexión propia de la petición, en autocommit: el NOTIFY sale de inmediato
+            with connections["default"].cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, token])
+            return waiter.wait(timeout)
+        finally:
+            self.waiters.pop(token, None)
+
+
+listener = Listener()
@@ -0,0 +1,129 @@
+# utils/listen.py
+# Código en inglés; comentarios en español
+"""
+Conexiones LISTEN de PostgreSQL con un hilo por proceso (utils.invalidation, enrollments.live).
+
+- La conexión es propia, fuera del pool de Django: autocommit y sin cierres al final de la petición.
+- ListenThread se reconecta sola (reconnect_setting segundos entre intentos fallidos) y prueba la
+  conexión cuando no hay tráfico para detectar un corte silencioso.
+- Los NOTIFY de un intervalo sin conexión se pierden: on_connect() es el lugar para recuperarlos.
+- Tras un fork el hilo y la conexión del padre no existen en el hijo: ensure_started() la reinicia.
+- stop_all() cierra las conexiones (el runner de tests lo llama antes de borrar la BD de prueba).
+"""
+import logging
+import os
+import select
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Segundos sin tráfico antes de probar la conexión con SELECT 1
+KEEPALIVE = 60
+
+# Listeners iniciados en este proceso (stop_all)
+_started = set()
+
+
+def open_listen_connection(channel, using="default"):
+    # Fuera del pool de Django: autocommit y sin CONN_MAX_AGE ni cierres al final de la petición
+    wrapper = connections[using]
+    connection = wrapper.get_new_connection(wrapper.get_connection_params())
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {channel}")
+    return connection
+
+
+class ListenThread:
+    """Hilo con la conexión LISTEN de 'channel'; las subclases implementan handle(payload)."""
+
+    channel = None
+    # Nombre del setting con la espera entre reconexiones (s)
+    reconnect_setting = None
+
+    def __init__(self):
+        self.pid = None
+        self.lock = threading.Lock()
+        self.connected = threading.Event()
+        self.thread = None
+        self.stopped = None
+        # Extremo de escritura del pipe que despierta a select() en stop()
+        self.wakeup = None
+
+    def ensure_started(self):
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.start()
+
+    def start(self):
+        self.pid = os.getpid()
+        self.connected.clear()
+        self.stopped = threading.Event()
+        wakeup, self.wakeup = os.pipe()
+        self.thread = threading.Thread(
+            target=self.run, args=(self.stopped, wakeup), name=f"listen-{self.channel}", daemon=True,
+        )
+        self.thread.start()
+        _started.add(self)
+
+    def stop(self, timeout=5):
+        """Termina el hilo y cierra su conexión; el siguiente ensure_started() abre otra."""
+        with self.lock:
+            if self.thread is None or self.pid != os.getpid():
+                return
+            thread, self.thread, self.pid = self.thread, None, None
+            self.stopped.set()
+            os.write(self.wakeup, b"x")
+            os.close(self.wakeup)
+        thread.join(timeout)
+
+    def run(self, stopped, wakeup):
+        pid = self.pid
+        try:
+            while pid == os.getpid() and not stopped.is_set():
+                try:
+                    connection = open_listen_connection(self.channel)
+                except Exception:
+                    logger.exception("No se pudo abrir la conexión de LISTEN %s; reintentando", self.channel)
+                    stopped.wait(getattr(settings, self.reconnect_setting))
+                    continue
+                try:
+                    self.on_connect()
+                    self.connected.set()
+                    self.listen(connection, wakeup)
+                except Exception:
+                    logger.exception("Se perdió la conexión de LISTEN %s; reconectando", self.channel)
+                finally:
+                    self.connected.clear()
+                    connection.close()
+        finally:
+            os.close(wakeup)
+
+    def listen(self, connection, wakeup):
+        while True:
+            readable, _w, _x = select.select([connection, wakeup], [], [], KEEPALIVE)
+            if wakeup in readable:
+                return
+            if not readable:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            connection.poll()
+            while connection.notifies:
+                self.handle(connection.notifies.pop(0).payload)
+
+    def on_connect(self):
+        """Antes de escuchar en una conexión nueva (la primera o tras un corte)."""
+
+    def handle(self, payload):
+        raise NotImplementedError
+
+
+def stop_all():
+    while _started:
+        _started.pop().stop()
@@ -0,0 +1,176 @@
+# utils/log.py
+# Código en inglés; comentarios en español
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+_request_id = contextvars.ContextVar("request_id", default="-")
+
+# Atributos estándar de LogRecord; lo demás se considera "extra"
+_RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+def get_request_id() -> str:
+    """Devuelve el request id del contexto actual ('-' fuera de una petición)."""
+    return _request_id.get()
+
+
+def set_request_id(value: str) -> contextvars.Token:
+    """Fija el request id del contexto actual; devuelve el token para restaurarlo."""
+    return _request_id.set(value)
+
+
+def reset_request_id(token: contextvars.Token) -> None:
+    _request_id.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Copia el request id del contexto al registro.
+    Debe ir en el handler de cola: se ejecuta en el hilo que hace el log,
+    no en el hilo del listener (donde el contextvar ya no existe).
+    """
+
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Muestrea loggers ruidosos: deja pasar solo una fracción de sus registros.
+    - rates: {"django.db.backends": 0.01, ...}; aplica también a sub-loggers.
+    - WARNING o superior siempre pasa.
+    """
+
+    def __init__(self, rates=None, name=""):
+        super().__init__(name)
+        self.rates = dict(rates or {})
+
+    def _rate_for(self, logger_name):
+        name = logger_name
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._rate_for(record.name)
+        if rate is None or rate >= 1:
+            return True
+        return random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON (incluye request_id, pid y extras)."""
+
+    def format(self, record):
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "pid": record.process,
+            "module": record.module,
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class ProcessRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler con un archivo por proceso.
+    'filename' acepta el marcador {pid}; el nombre se recalcula si el proceso
+    cambia (fork de gunicorn), así cada worker rota su propio archivo.
+    """
+
+    def __init__(self, filename, mode="a", maxBytes=0, backupCount=0, encoding="utf-8", delay=True):
+        self._template = os.fspath(filename)
+        self._pid = os.getpid()
+        super().__init__(self._template.format(pid=self._pid), mode, maxBytes, backupCount, encoding, delay)
+
+    def emit(self, record):
+        if os.getpid() != self._pid:
+            self._reopen_for_current_process()
+        super().emit(record)
+
+    def _reopen_for_current_process(self):
+        self._pid = os.getpid()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = os.path.abspath(self._template.format(pid=self._pid))
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Handler no bloqueante: encola el registro y un QueueListener (hilo propio)
+    lo entrega a los handlers reales (archivo, consola...).
+    - handlers: lista de handlers ya configurados (en dictConfig: 'cfg://handlers.<nombre>').
+    - queue_size: si la cola se llena se descarta el registro en vez de bloquear la petición.
+    - Se reinicia solo tras un fork para no depender del hilo del proceso padre.
+    """
+
+    def __init__(self, handlers, queue_size=10000, respect_handler_level=True):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        # ConvertingList (dictConfig) solo resuelve 'cfg://' al indexar
+        self.handlers = [handlers[i] for i in range(len(handlers))]
+        self.queue_size = queue_size
+        self.respect_handler_level = respect_handler_level
+        self.dropped = 0
+        self._pid = None
+        self.listener = None
+        self._start()
+        atexit.register(self.stop)
+
+    def _start(self):
+        self._pid = os.getpid()
+        self.listener = QueueListener(
+            self.queue, *self.handlers, respect_handler_level=self.respect_handler_level
+        )
+        self.listener.start()
+
+    def stop(self):
+        """Vacía la cola y detiene el hilo del listener (idempotente)."""
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def prepare(self, record):
+        # Formatea el mensaje y la traza aquí (hilo del log); el listener solo serializa
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            # Tras fork el hilo del padre no existe: cola y listener nuevos
+            self.queue = queue.Queue(maxsize=self.queue_size)
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,151 @@
+"""
+Entrega de MEDIA_ROOT detrás de permisos (utils.views.MediaView).
+
+- MEDIA_ACCEL='nginx': X-Accel-Redirect a una location internal (MEDIA_ACCEL_PREFIX) que apunta a MEDIA_ROOT.
+- MEDIA_ACCEL='sendfile': X-Sendfile con la ruta absoluta (Apache mod_xsendfile, lighttpd).
+- Sin proxy: FileResponse con ETag/Last-Modified, 304 y un rango 'bytes=' (206/416). Con gunicorn
+  el archivo va por wsgi.file_wrapper (sendfile) desde la posición del rango y con su Content-Length.
+"""
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+
+from utils.storage import is_content_addressed
+
+# Privado: el acceso depende de permisos. Nombre por contenido (utils.storage): no cambia nunca
+REVALIDATE = "private, no-cache"
+IMMUTABLE = "private, max-age=31536000, immutable"
+
+
+def resolve(path):
+    """Ruta absoluta de un archivo bajo MEDIA_ROOT; Http404 si sale de MEDIA_ROOT o no existe."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return full_path
+
+
+def media_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    (inicio, fin) inclusivo de un único rango 'bytes='; None si no hay rango utilizable
+    (varios rangos o sintaxis desconocida: se responde completo). ValueError si no se puede satisfacer.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:
+        # Sufijo: los últimos N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError
+    return start, end
+
+
+class RangeFile:
+    """
+    Vista de solo lectura de [inicio, fin] de un archivo ya posicionado en 'inicio'.
+    Expone fileno() para que wsgi.file_wrapper use sendfile; sin tell(), FileResponse
+    no recalcula Content-Length.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def accel_response(full_path, content_type):
+    """Respuesta vacía; el proxy envía el archivo (y resuelve Range/ETag por su cuenta)."""
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_ACCEL == "nginx":
+        relative = os.path.relpath(full_path, settings.MEDIA_ROOT).replace(os.sep, "/")
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + quote(relative)
+    else:
+        response["X-Sendfile"] = full_path
+    return response
+
+
+def serve(request, full_path):
+    """Entrega full_path (ya autorizado) por el proxy o con FileResponse + Range/ETag."""
+    cache_control = IMMUTABLE if is_content_addressed(full_path.replace(os.sep, "/")) else REVALIDATE
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    if settings.MEDIA_ACCEL:
+        response = accel_response(full_path, content_type)
+        response["Cache-Control"] = cache_control
+        return response
+
+    stat = os.stat(full_path)
+    etag = media_etag(stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = file_response(request, full_path, stat, etag, content_type)
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    response["Cache-Control"] = cache_control
+    response["X-Content-Type-Options"] = "nosniff"
+    return response
+
+
+def file_response(request, full_path, stat, etag, content_type):
+    size = stat.st_size
+    span = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    # If-Range con otro validador: el archivo cambió, va completo
+    if range_header and (not if_range or etag in parse_etags(if_range) or if_range == http_date(int(stat.st_mtime))):
+        try:
+            span = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    file = open(full_path, "rb")
+    if span is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = span
+        file.seek(start)
+        response = FileResponse(RangeFile(file, end - start + 1), content_type=content_type, status=206)
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    # Se muestra en línea (<img>); el nombre del archivo no aporta nada
+    if "Content-Disposition" in response:
+        del response["Content-Disposition"]
+    return response
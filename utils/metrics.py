@@ -0,0 +1,176 @@
+# utils/metrics.py
+# Código en inglés; comentarios en español
+import threading
+import time
+from contextvars import ContextVar
+
+# Límites (segundos) del histograma de duración por ruta
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Tiempos y contadores de una sola petición (total, BD, plantillas, caché)."""
+    __slots__ = ("start", "db_time", "queries", "template_time", "cache_hits", "cache_misses", "_template_start")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_time = 0.0
+        self.queries = 0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._template_start = None
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """Para connection.execute_wrapper(): mide cada consulta."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    def template_started(self):
+        self._template_start = time.perf_counter()
+
+    def template_finished(self, *args):
+        if self._template_start is not None:
+            self.template_time += time.perf_counter() - self._template_start
+            self._template_start = None
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def server_timing(self, total):
+        """Valor del header Server-Timing (duraciones en ms)."""
+        parts = [
+            f"total;dur={total * 1000:.1f}",
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+        ]
+        if self.template_time:
+            parts.append(f"tpl;dur={self.template_time * 1000:.1f}")
+        if self.cache_hits or self.cache_misses:
+            parts.append(f'cache;desc="hits={self.cache_hits} misses={self.cache_misses}"')
+        return ", ".join(parts)
+
+
+def start_request():
+    """Crea las métricas de la petición actual; devuelve (metrics, token)."""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def current_metrics():
+    """Métricas de la petición en curso o None (fuera de una petición)."""
+    return _current.get()
+
+
+def record_cache(hit: bool) -> None:
+    """Para código con caché propia: registra un acierto/fallo en la petición actual."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+class _RouteStats:
+    __slots__ = ("buckets", "count", "total", "db_time", "queries", "template_time", "cache_hits", "cache_misses", "statuses")
+
+    def __init__(self, n_buckets):
+        self.buckets = [0] * n_buckets
+        self.count = 0
+        self.total = 0.0
+        self.db_time = 0.0
+        self.queries = 0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.statuses = {}
+
+
+class MetricsRegistry:
+    """
+    Agregado en memoria por ruta (por proceso: cada worker expone lo suyo).
+    Se publica en formato de texto de Prometheus.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route, status, metrics, total):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = _RouteStats(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if total <= bound:
+                    stats.buckets[i] += 1
+                    break
+            stats.count += 1
+            stats.total += total
+            stats.db_time += metrics.db_time
+            stats.queries += metrics.queries
+            stats.template_time += metrics.template_time
+            stats.cache_hits += metrics.cache_hits
+            stats.cache_misses += metrics.cache_misses
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                "# HELP http_request_duration_seconds Duración total de la petición por ruta.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for route, stats in routes:
+                label = _label(route)
+                cumulative = 0
+                for bound, count in zip(self.buckets, stats.buckets):
+                    cumulative += count
+                    lines.append(f'http_request_duration_seconds_bucket{{route="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_bucket{{route="{label}",le="+Inf"}} {stats.count}')
+                lines.append(f'http_request_duration_seconds_sum{{route="{label}"}} {stats.total:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{route="{label}"}} {stats.count}')
+
+            counters = (
+                ("http_requests_total", "Peticiones por ruta y código de estado.", None),
+                ("http_request_db_seconds_total", "Tiempo acumulado en la base de datos.", "db_time"),
+                ("http_request_db_queries_total", "Consultas SQL ejecutadas.", "queries"),
+                ("http_request_template_seconds_total", "Tiempo acumulado renderizando plantillas.", "template_time"),
+                ("http_request_cache_hits_total", "Aciertos de caché registrados.", "cache_hits"),
+                ("http_request_cache_misses_total", "Fallos de caché registrados.", "cache_misses"),
+            )
+            for name, help_text, attr in counters:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for route, stats in routes:
+                    label = _label(route)
+                    if attr is None:
+                        for status, count in sorted(stats.statuses.items()):
+                            lines.append(f'{name}{{route="{label}",status="{status}"}} {count}')
+                    else:
+                        value = getattr(stats, attr)
+                        lines.append(f'{name}{{route="{label}"}} {value:.6f}' if isinstance(value, float) else f'{name}{{route="{label}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
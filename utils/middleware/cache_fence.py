@@ -0,0 +1,56 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils import invalidation
+
+
+class CacheFenceMiddleware:
+    """
+    Read-your-writes para la caché local con el bus de utils.invalidation.
+    - Si la petición invalidó algo (bump_version) la respuesta lleva la cookie CACHE_FENCE_COOKIE
+      por CACHE_FENCE_SECONDS.
+    - Con esa cookie, antes de la vista se espera (hasta CACHE_FENCE_TIMEOUT) a que el listener de
+      este worker procese lo ya confirmado; si no alcanza, la petición no lee la caché local.
+    Sin PostgreSQL o con una caché compartida no se usa.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not invalidation.enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        written, tokens = invalidation.start_request()
+        try:
+            if settings.CACHE_FENCE_COOKIE in request.COOKIES:
+                invalidation.fence(settings.CACHE_FENCE_TIMEOUT)
+            response = self.get_response(request)
+        finally:
+            invalidation.finish_request(tokens)
+        return self.finish(response, written)
+
+    async def __acall__(self, request):
+        written, tokens = invalidation.start_request()
+        try:
+            if settings.CACHE_FENCE_COOKIE in request.COOKIES:
+                # Espera bloqueante y la consulta del NOTIFY: en el hilo de la petición
+                await sync_to_async(invalidation.fence)(settings.CACHE_FENCE_TIMEOUT)
+            response = await self.get_response(request)
+        finally:
+            invalidation.finish_request(tokens)
+        return self.finish(response, written)
+
+    def finish(self, response, written):
+        if written:
+            response.set_cookie(
+                settings.CACHE_FENCE_COOKIE, "1", max_age=settings.CACHE_FENCE_SECONDS,
+                httponly=True, samesite="Lax", secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
@@ -0,0 +1,54 @@
+# utils/middleware/concurrency.py
+# Código en inglés; comentarios en español
+"""
+Tope de peticiones en curso por worker ASGI (envuelve la aplicación en config.asgi).
+
+Cada petición en curso puede tener su hilo de sync_to_async y su conexión a PostgreSQL: por encima
+de settings.ASGI_MAX_REQUESTS se responde 503 sin entrar a Django. Las rutas de
+settings.ASGI_STREAMING_PATHS (SSE del dashboard) cuentan solo hasta enviar sus cabeceras: para
+entonces ya soltaron su conexión y su número lo limita LIVE_MAX_CLIENTS.
+A diferencia de limit_concurrency de uvicorn, que cuenta conexiones abiertas y no distingue un
+stream de una petición normal.
+"""
+
+
+class ConcurrencyLimitMiddleware:
+    def __init__(self, app, limit, streaming_paths=()):
+        self.app = app
+        self.limit = limit
+        self.streaming_paths = tuple(streaming_paths)
+        # Un solo event loop por worker: un contador simple basta
+        self.active = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.limit:
+            return await self.app(scope, receive, send)
+        if self.active >= self.limit:
+            return await self.reject(send)
+        self.active += 1
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                self.active -= 1
+
+        async def send_streaming(message):
+            if message["type"] == "http.response.start":
+                release()
+            await send(message)
+
+        streaming = scope["path"].startswith(self.streaming_paths)
+        try:
+            await self.app(scope, receive, send_streaming if streaming else send)
+        finally:
+            release()
+
+    async def reject(self, send):
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"retry-after", b"1")],
+        })
+        await send({"type": "http.response.body", "body": b"Service Unavailable"})
@@ -0,0 +1,49 @@
+import re
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from utils.log import reset_request_id, set_request_id
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """
+    Asigna un request id a cada petición (reusa X-Request-ID del proxy si es válido),
+    lo deja en request.request_id y en el contexto de logging, y lo devuelve en la respuesta.
+    """
+    header = "HTTP_X_REQUEST_ID"
+    response_header = "X-Request-ID"
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_request_id(token)
+        response[self.response_header] = request.request_id
+        return response
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_request_id(token)
+        response[self.response_header] = request.request_id
+        return response
+
+    def start(self, request):
+        incoming = request.META.get(self.header, "")
+        request.request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        return set_request_id(request.request_id)
@@ -0,0 +1,150 @@
+import json
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+# Preferencia del servidor; el cliente decide con Accept-Encoding
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^/.]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=0, must-revalidate"
+
+
+@dataclass
+class StaticFile:
+    path: str
+    size: int
+    mtime: float
+    content_type: str
+    immutable: bool
+    # {"br": (ruta, tamaño), "gzip": ...}
+    variants: dict = field(default_factory=dict)
+
+    def etag(self, encoding=None):
+        suffix = f"-{encoding}" if encoding else ""
+        return f'"{self.size:x}-{int(self.mtime):x}{suffix}"'
+
+
+def build_index(root, url_prefix, hashed_names=()):
+    """{url: StaticFile} de todo lo que hay bajo root; los .br/.gz quedan como variantes."""
+    index = {}
+    hashed_names = set(hashed_names)
+    compressed = tuple(ext for _encoding, ext in ENCODINGS)
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            # .br/.gz como variantes; los ocultos (estado de collectstatic_incremental) no se sirven
+            if name.endswith(compressed) or name.startswith("."):
+                continue
+            path = os.path.join(dirpath, name)
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            stat = os.stat(path)
+            content_type, _ = mimetypes.guess_type(name)
+            static_file = StaticFile(
+                path=path, size=stat.st_size, mtime=stat.st_mtime,
+                content_type=content_type or "application/octet-stream",
+                immutable=relative in hashed_names or bool(HASHED_NAME.search(name)),
+            )
+            for encoding, ext in ENCODINGS:
+                if os.path.exists(path + ext):
+                    static_file.variants[encoding] = (path + ext, os.path.getsize(path + ext))
+            index[url_prefix + relative] = static_file
+    return index
+
+
+def accepted_encodings(header):
+    """Codificaciones aceptadas (q > 0) de Accept-Encoding."""
+    accepted = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """
+    Sirve STATIC_ROOT desde el proceso (WSGI y ASGI) sin pasar por URLs ni vistas.
+    - Indexa los archivos al arrancar: collectstatic requiere reiniciar los workers.
+    - FileResponse: con gunicorn usa wsgi.file_wrapper (sendfile).
+    - Elige la variante .br/.gz según Accept-Encoding (Vary: Accept-Encoding).
+    - Nombres con hash (manifest): caché de un año e immutable; el resto ETag/Last-Modified y 304.
+    En DEBUG no se usa: staticfiles_urlpatterns sirve directo de los finders.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.DEBUG or not getattr(settings, "STATIC_SERVE", True) or not os.path.isdir(settings.STATIC_ROOT):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith("/") else f"/{settings.STATIC_URL}"
+        self.index = build_index(str(settings.STATIC_ROOT), self.prefix, self.manifest_names())
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def manifest_names(self):
+        manifest = os.path.join(settings.STATIC_ROOT, "staticfiles.json")
+        try:
+            with open(manifest, encoding="utf-8") as fh:
+                return json.load(fh).get("paths", {}).values()
+        except (OSError, ValueError):
+            return ()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        static_file = self.lookup(request)
+        if static_file is not None:
+            return self.serve(request, static_file)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        # serve() solo abre el archivo (sin BD): no vale la pena un hilo
+        static_file = self.lookup(request)
+        if static_file is not None:
+            return self.serve(request, static_file)
+        return await self.get_response(request)
+
+    def lookup(self, request):
+        if request.method in ("GET", "HEAD") and request.path_info.startswith(self.prefix):
+            return self.index.get(request.path_info)
+        return None
+
+    def serve(self, request, static_file):
+        encoding, path = None, static_file.path
+        if static_file.variants:
+            accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+            for candidate, _ext in ENCODINGS:
+                if candidate in accepted and candidate in static_file.variants:
+                    encoding = candidate
+                    path, _size = static_file.variants[candidate]
+                    break
+
+        etag = static_file.etag(encoding)
+        last_modified = int(static_file.mtime)
+        response = None
+        if not static_file.immutable:
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = FileResponse(open(path, "rb"), content_type=static_file.content_type)
+            # No es una descarga; además delataría el nombre .br/.gz
+            del response["Content-Disposition"]
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if static_file.variants:
+            response["Vary"] = "Accept-Encoding"
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = IMMUTABLE if static_file.immutable else REVALIDATE
+        response["X-Content-Type-Options"] = "nosniff"
+        return response
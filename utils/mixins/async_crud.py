@@ -0,0 +1,100 @@
+"""
+Versiones asíncronas de las vistas de lectura (settings.ASYNC_VIEWS, servidas con ASGI).
+
+Todo el acceso a la BD de la vista se hace con el ORM asíncrono (acount, aiterator, aget) antes de
+construir el contexto: la plantilla recibe listas ya evaluadas y la renderiza el handler.
+El POST (acciones masivas) sigue siendo síncrono y corre en un hilo (sync_to_async).
+Con WSGI funcionan igual, pero cada petición abre un event loop (async_to_sync): solo convienen con ASGI.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import AccessMixin
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.views import View
+
+from utils.mixins.crud import DetailMixin, ListMixin
+
+
+class AsyncAccessMixin(AccessMixin):
+    """
+    LoginRequiredMixin/PermissionRequiredMixin con request.auser() y user.ahas_perms().
+    Deja el usuario resuelto en request.user; ahas_perms() carga su caché de permisos, así plantillas
+    ('perms') y mixins síncronos (get_bulk_actions) no vuelven a consultar.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        user = await request.auser()
+        request.user = user
+        if not user.is_authenticated:
+            return self.handle_no_permission()
+        if getattr(self, "permission_required", None) is not None:
+            if not await user.ahas_perms(self.get_permission_required()):
+                return self.handle_no_permission()
+        # View.dispatch directo: LoginRequiredMixin/PermissionRequiredMixin ya se resolvieron aquí
+        return await View.dispatch(self, request, *args, **kwargs)
+
+
+class AsyncConditionalMixin:
+    """ConditionalViewMixin.get con las versiones de tabla leídas de forma asíncrona."""
+
+    async def get(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_validators()
+        if etag:
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+        response = await self.aget_response(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+
+class AsyncListMixin(AsyncAccessMixin, AsyncConditionalMixin, ListMixin):
+    """ListMixin asíncrono: COUNT con acount() y la página con aiterator()."""
+
+    async def aget_response(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.page_result = await self.apaginate_queryset(self.object_list, page_size)
+        else:
+            self.object_list = [obj async for obj in self.object_list.aiterator()]
+        return self.render_to_response(self.get_context_data())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # count es cached_property: con el valor ya puesto Paginator no consulta
+        paginator.count = await queryset.acount()
+        page = paginator.get_page(self.get_page_number(paginator))
+        # chunk_size: aiterator() solo aplica prefetch_related con él
+        page.object_list = [obj async for obj in page.object_list.aiterator(chunk_size=page_size)]
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def paginate_queryset(self, queryset, page_size):
+        # get_context_data (síncrono) recibe la página que ya se leyó en aget_response
+        return self.page_result
+
+    async def post(self, request, *args, **kwargs):
+        return await sync_to_async(super().post)(request, *args, **kwargs)
+
+
+class AsyncDetailMixin(AsyncAccessMixin, AsyncConditionalMixin, DetailMixin):
+    """DetailMixin asíncrono: el objeto con aget()."""
+
+    async def aget_response(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+    async def aget_object(self, queryset=None):
+        queryset = self.get_queryset() if queryset is None else queryset
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        slug = self.kwargs.get(self.slug_url_kwarg)
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        if slug is not None and (pk is None or self.query_pk_and_slug):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No se encontró {queryset.model._meta.verbose_name}.")
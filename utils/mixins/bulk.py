@@ -0,0 +1,90 @@
+from django.contrib import messages
+from django.core.exceptions import PermissionDenied
+from django.db import IntegrityError, transaction
+from django.shortcuts import redirect
+
+from audit.log import record
+from audit.models import AuditEntry
+from tracking.versions import mark_changed
+from utils.models import touch
+
+
+class BulkActionMixin:
+    """
+    Acciones masivas sobre los registros marcados en una lista (POST).
+    - bulk_actions: {"accion": ("Etiqueta", "app.permiso")}; cada acción llama a bulk_<accion>(queryset).
+    - Cada acción es un solo UPDATE/DELETE por conjunto, dentro de una transacción.
+    - bulk_active_field puede cruzar una relación ("user__is_active"): se actualiza el modelo relacionado.
+    - Un solo mensaje de resumen y redirección a la misma lista (conserva filtros y página).
+    """
+    bulk_actions = {}
+    bulk_active_field = "is_active"
+    bulk_field_name = "selected"
+
+    def get_bulk_actions(self):
+        """Acciones que el usuario puede ejecutar (para pintar el selector)."""
+        user = self.request.user
+        return [(name, label) for name, (label, perm) in self.bulk_actions.items() if user.has_perm(perm)]
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx["bulk_actions"] = self.get_bulk_actions()
+        return ctx
+
+    def post(self, request, *args, **kwargs):
+        if not self.bulk_actions:
+            return self.http_method_not_allowed(request, *args, **kwargs)
+        action = request.POST.get("action")
+        if action not in self.bulk_actions:
+            messages.error(request, "Selecciona una acción válida.")
+            return redirect(request.get_full_path())
+        label, perm = self.bulk_actions[action]
+        if not request.user.has_perm(perm):
+            raise PermissionDenied
+
+        pks = [pk for pk in request.POST.getlist(self.bulk_field_name) if pk.isdigit()]
+        if not pks:
+            messages.warning(request, "Selecciona al menos un registro.")
+            return redirect(request.get_full_path())
+
+        queryset = self.model._default_manager.filter(pk__in=pks)
+        try:
+            with transaction.atomic():
+                count = getattr(self, f"bulk_{action}")(queryset)
+        except IntegrityError:
+            # ProtectedError/RestrictedError heredan de IntegrityError
+            messages.error(request, f"{label}: no se pudo completar la acción; no se modificó ningún registro.")
+        else:
+            record(request, AuditEntry.BULK, model=self.model, object_repr=label,
+                   changes={"action": action, "selected": sorted(map(int, pks)), "count": count})
+            messages.success(request, f"{label}: {count} de {len(pks)} registro(s) seleccionados.")
+        return redirect(request.get_full_path())
+
+    # --- Acciones ---
+    def bulk_activate(self, queryset):
+        return self.set_active(queryset, True)
+
+    def bulk_deactivate(self, queryset):
+        return self.set_active(queryset, False)
+
+    def bulk_archive(self, queryset):
+        return queryset.archive()
+
+    def bulk_delete(self, queryset):
+        # Modelos archivables: borrado físico sin Collector (ON DELETE en la BD)
+        if hasattr(queryset, "hard_delete"):
+            return queryset.hard_delete()
+        _total, per_model = queryset.delete()
+        return per_model.get(queryset.model._meta.label, 0)
+
+    def set_active(self, queryset, value):
+        """UPDATE ... SET <campo> = value solo en las filas que cambian; devuelve cuántas."""
+        relation, _, attr = self.bulk_active_field.rpartition("__")
+        target = queryset
+        if relation:
+            related_model = queryset.model._meta.get_field(relation).related_model
+            target = related_model._default_manager.filter(pk__in=queryset.values(relation))
+        count = target.exclude(**{attr: value}).update(**{attr: value}, **touch(target.model))
+        # update() no dispara señales: versiones de tabla y caché a mano
+        mark_changed(target.model)
+        return count
@@ -0,0 +1,67 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from tracking.versions import atable_versions, table_versions
+from utils.cache import model_label
+
+
+class ConditionalViewMixin:
+    """
+    GET condicional con las versiones de tabla (tracking.versions).
+    - ETag: versiones de self.model + version_models + base_version_models, usuario,
+      cookie CSRF y DJANGO_RELEASE. Last-Modified: la escritura más reciente de esas tablas.
+    - Si el cliente ya tiene esa versión responde 304 sin consultar la lista ni renderizar.
+    - Con mensajes pendientes no hay 304: se perderían.
+    """
+    version_models = ()
+    # El menú depende de los permisos del usuario y de sus grupos
+    base_version_models = ("users.customuser", "auth.group")
+
+    def get_version_labels(self):
+        return sorted({model_label(self.model), *self.version_models, *self.base_version_models})
+
+    def get_validators(self):
+        if len(get_messages(self.request)):
+            return None, None
+        labels = self.get_version_labels()
+        return self.build_validators(labels, table_versions(labels))
+
+    async def aget_validators(self):
+        if len(get_messages(self.request)):
+            return None, None
+        labels = self.get_version_labels()
+        return self.build_validators(labels, await atable_versions(labels))
+
+    def build_validators(self, labels, versions):
+        parts = [f"{label}={versions.get(label, (0, None))[0]}" for label in labels]
+        parts += [
+            str(self.request.user.pk),
+            self.request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+            settings.RELEASE,
+        ]
+        etag = '"%s"' % hashlib.md5("|".join(parts).encode(), usedforsecurity=False).hexdigest()
+        timestamps = [updated_at for _version, updated_at in versions.values()]
+        last_modified = int(max(timestamps).timestamp()) if timestamps else None
+        return etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if etag:
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+        response = super().get(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+    def add_validators(self, response, etag, last_modified):
+        if etag and response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            # Página con datos del usuario: solo caché del navegador y siempre revalidada
+            response["Cache-Control"] = "private, no-cache"
+        return response
@@ -1,24 +1,67 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.db import IntegrityError
+from django.utils.decorators import method_decorator
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.generic import CreateView, DetailView, ListView, UpdateView
+
+from audit.mixins import AuditMixin
 from utils.mixins.active_menu import ActiveMenuMixin
+from utils.mixins.bulk import BulkActionMixin
+from utils.mixins.conditional import ConditionalViewMixin
 from utils.mixins.message import SuccessErrorMessageMixin
 
 
 class ListMixin(
     LoginRequiredMixin,
     PermissionRequiredMixin,
+    BulkActionMixin,
+    ConditionalViewMixin,
     ActiveMenuMixin,
     ListView
 ):
     """
-    Vista base para lista de objetos con login y permisos
+    Vista base para lista de objetos con login y permisos,
+    acciones masivas opcionales (bulk_actions) y respuestas 304.
+    Tamaño de página: paginate_by por vista, ?page_size= hasta max_paginate_by.
     """
     context_object_name = "objects"
     paginate_by = 2
+    max_paginate_by = 100
+    page_size_kwarg = "page_size"
+    # Páginas visibles alrededor de la actual y en cada extremo (get_elided_page_range)
+    pages_on_each_side = 2
+    pages_on_ends = 1
+
+    def get_paginate_by(self, queryset):
+        try:
+            size = int(self.request.GET.get(self.page_size_kwarg, self.paginate_by))
+        except ValueError:
+            size = self.paginate_by
+        return max(1, min(size, self.max_paginate_by))
+
+    def paginate_queryset(self, queryset, page_size):
+        # Página fuera de rango o no numérica (p. ej. desde el cuadro "Ir a"): la más cercana, no 404
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        page = paginator.get_page(self.get_page_number(paginator))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_page_number(self, paginator):
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg)
+        return paginator.num_pages if page_number == "last" else page_number
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx['search_form'] = getattr(self, 'form', self.search_form)
+        page = ctx.get('page_obj')
+        if page is not None:
+            # Ventana de páginas con "…" en lugar de un enlace por página
+            ctx['page_range'] = page.paginator.get_elided_page_range(
+                page.number, on_each_side=self.pages_on_each_side, on_ends=self.pages_on_ends,
+            )
 
         # Tomamos TODOS los GET params excepto 'page'
         params = self.request.GET.copy()
@@ -26,6 +69,8 @@ class ListMixin(
 
         # Lo guardamos en el contexto como string ya codificado
         ctx['querystring'] = params.urlencode()
+        # Para el cuadro "Ir a página" (form GET): los demás parámetros como campos ocultos
+        ctx['querystring_items'] = [(key, value) for key in params for value in params.getlist(key)]
 
         params_no_order = params.copy()
         params_no_order.pop('ordering', None)
@@ -35,15 +80,78 @@ class ListMixin(
         ctx['current_order'] = self.request.GET.get('ordering', '')
         return ctx
 
+class ActiveObjectMixin:
+    """
+    Detalle, edición y archivado: un registro archivado responde 404, como uno borrado.
+    Solo filtra modelos archivables (ArchivableQuerySet).
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return queryset.active() if hasattr(queryset, "active") else queryset
+
+
+class IntegrityErrorFormMixin:
+    """
+    Si form.save() falla por una restricción de la BD (p. ej. dos envíos simultáneos
+    con el mismo valor único), y el form sabe traducirla con handle_integrity_error(),
+    se responde como form inválido en lugar de un error 500.
+    """
+
+    def form_valid(self, form):
+        try:
+            return super().form_valid(form)
+        except IntegrityError:
+            handler = getattr(form, "handle_integrity_error", None)
+            if handler is None or not handler():
+                raise
+            return self.form_invalid(form)
+
+
+class UploadErrorsFormMixin:
+    """
+    Muestra en el formulario los archivos que utils.uploads.StreamingUploadHandler rechazó
+    (request.upload_errors); sin esto el campo solo aparecería como vacío.
+    """
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        for field, message in getattr(self.request, "upload_errors", {}).items():
+            if field in form.fields:
+                # Sí se envió un archivo: 'Este campo es obligatorio' no aplica
+                form.errors.pop(field, None)
+            form.add_error(field if field in form.fields else None, message)
+        return form
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class StreamingUploadMixin:
+    """
+    Instala utils.uploads.StreamingUploadHandler solo en esta vista (el resto del sitio,
+    admin incluido, conserva los manejadores de Django y acepta cualquier archivo).
+    CsrfViewMiddleware ya leería request.POST y fijaría los manejadores: la vista queda exenta
+    y la validación CSRF se hace aquí, después de cambiarlos.
+    Va antes de CreateMixin/UpdateMixin en las bases.
+    """
+    upload_handlers = ("utils.uploads.StreamingUploadHandler",)
+
+    def dispatch(self, request, *args, **kwargs):
+        request.upload_handlers = [import_string(path)(request) for path in self.upload_handlers]
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
+
+
 class CreateMixin(
     LoginRequiredMixin,
     PermissionRequiredMixin,
+    AuditMixin,
+    IntegrityErrorFormMixin,
+    UploadErrorsFormMixin,
     SuccessErrorMessageMixin,
     ActiveMenuMixin,
     CreateView
 ):
     """
-    Vista base para crear objetos con login, permisos y mensajes de éxito y error
+    Vista base para crear objetos con login, permisos, bitácora y mensajes de éxito y error
     """
     pass
 
@@ -51,12 +159,16 @@ class CreateMixin(
 class UpdateMixin(
     LoginRequiredMixin,
     PermissionRequiredMixin,
+    ActiveObjectMixin,
+    AuditMixin,
+    IntegrityErrorFormMixin,
+    UploadErrorsFormMixin,
     SuccessErrorMessageMixin,
     ActiveMenuMixin,
     UpdateView
 ):
     """
-    Vista base para editar objetos con login, permisos y mensajes de éxito y error
+    Vista base para editar objetos con login, permisos, bitácora y mensajes de éxito y error
     """
     pass
 
@@ -64,10 +176,12 @@ class UpdateMixin(
 class DetailMixin(
     LoginRequiredMixin,
     PermissionRequiredMixin,
+    ActiveObjectMixin,
+    ConditionalViewMixin,
     ActiveMenuMixin,
     DetailView
 ):
     """
-    Vista base para ver detalle de un objeto con login y permisos
+    Vista base para ver detalle de un objeto con login, permisos y respuestas 304
     """
     context_object_name = 'item'
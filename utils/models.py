@@ -0,0 +1,92 @@
+# utils/models.py
+# Código en inglés; comentarios en español
+from django.db import models
+from django.utils import timezone
+
+from tracking.versions import mark_changed
+from utils.deletion import raw_cascade_delete
+
+
+def touch(model, when=None):
+    """Campos extra para update(): update() no aplica auto_now."""
+    names = {field.name for field in model._meta.concrete_fields}
+    return {"updated_at": when or timezone.now()} if "updated_at" in names else {}
+
+
+class TimestampedModel(models.Model):
+    """Fechas de creación y última modificación (las usan ETag/Last-Modified)."""
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Fecha de creación")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
+    class Meta:
+        abstract = True
+
+
+class DetailFieldsMixin:
+    """
+    detail_fields: [(etiqueta, ruta ORM, tipo)] declarado en el modelo.
+    Las plantillas de detalle usan get_detail_fields(); la API usa las rutas con values().
+    """
+    detail_fields = []
+
+    def get_detail_fields(self):
+        return [(label, self.resolve_path(path), kind) for label, path, kind in self.detail_fields]
+
+    def resolve_path(self, path):
+        value = self
+        for part in path.split("__"):
+            if value is None:
+                return None
+            value = getattr(value, part)
+        return value
+
+
+class ArchivableQuerySet(models.QuerySet):
+    """
+    Archivado (borrado lógico) por conjuntos.
+    - archive()/restore(): un UPDATE; nunca recorre dependientes.
+    - hard_delete(): borrado físico sin Collector (utils.deletion).
+    - archive_updates (en el modelo): campos extra a fijar al archivar, p. ej. is_active=False.
+    """
+
+    def active(self):
+        return self.filter(archived_at__isnull=True)
+
+    def archived(self):
+        return self.filter(archived_at__isnull=False)
+
+    def archive(self, when=None):
+        when = when or timezone.now()
+        count = self.active().update(archived_at=when, **self.model.archive_updates, **touch(self.model, when))
+        mark_changed(self.model)
+        return count
+
+    def restore(self):
+        count = self.archived().update(archived_at=None, **touch(self.model))
+        mark_changed(self.model)
+        return count
+
+    def hard_delete(self):
+        return raw_cascade_delete(self)
+
+
+class ArchivableModel(models.Model):
+    """Modelo con fecha de archivado; las listas muestran solo .active()."""
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Archivado")
+
+    archive_updates = {}
+
+    objects = ArchivableQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @property
+    def is_archived(self):
+        return self.archived_at is not None
+
+    def archive(self):
+        self.archived_at = timezone.now()
+        type(self)._default_manager.filter(pk=self.pk).archive(when=self.archived_at)
+        for name, value in self.archive_updates.items():
+            setattr(self, name, value)
@@ -4,8 +4,11 @@ from collections import defaultdict
 from django.conf import settings
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_migrate
 from django.utils.text import capfirst
 
+from utils.cache import bump_version, get_or_build, invalidate_on_change, model_label
+
 EXCLUDED_APP_LABELS = {"admin", "contenttypes", "sessions"}  # ignorar contrib
 ACTION_ORDER = {"view": 1, "add": 2, "change": 3, "delete": 4}
 ACTION_ES = {"view": "Ver", "add": "Crear", "change": "Editar", "delete": "Eliminar"}
@@ -49,3 +52,21 @@ def group_permissions_by_model(perms):
         items.sort(key=lambda it: (it["action_order"], it["label"]))
         result.append({"app_label": app_label, "model_label": model_label, "items": items})
     return result
+
+
+def permission_catalog(key="permission-catalog", queryset=filtered_permissions_qs, group=group_permissions_by_model):
+    """
+    group(queryset()) desde la caché local (utils.cache): los permisos solo cambian con migrate.
+    connect_signals() la invalida en todos los workers (utils.invalidation).
+    """
+    return get_or_build(Permission, key, lambda: group(queryset()))
+
+
+def _bump_catalog(**kwargs):
+    # create_permissions usa bulk_create: sin post_save
+    bump_version(model_label(Permission))
+
+
+def connect_signals():
+    invalidate_on_change(Permission)
+    post_migrate.connect(_bump_catalog, dispatch_uid="utils.permissions.catalog")
@@ -0,0 +1,128 @@
+# utils/static.py
+# Código en inglés; comentarios en español
+"""
+Paquetes (bundles) de CSS/JS para base.html.
+
+- settings.STATIC_BUNDLES: {nombre: [archivos estáticos en orden]}; el tag {% bundle %}
+  (utils.templatetags.bundles) pinta el paquete si está en el manifest, o los archivos sueltos.
+- build_bundle(): concatena, reescribe url() de CSS relativas a static/bundles/ y minifica.
+  Minificación con rcssmin/rjsmin si están instalados; si no, CSS con un minificador
+  conservador y JS solo concatenado (gzip/brotli se llevan la mayor parte).
+- compress(): hermanos .gz y .br (brotli opcional) para servirlos precomprimidos.
+"""
+import gzip
+import posixpath
+import re
+
+from django.contrib.staticfiles import finders
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+BUNDLE_DIR = "bundles"
+
+# Cadenas o comentarios de CSS, en orden de aparición
+CSS_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/', re.S)
+CSS_URL = re.compile(r"""url\(\s*(['"]?)(.*?)\1\s*\)""")
+CSS_PUNCTUATION = re.compile(r"\s*([{};,])\s*")
+CSS_CHARSET = re.compile(r'@charset\s+"[^"]*";\s*', re.I)
+SOURCE_MAP = re.compile(r"^\s*(?://|/\*)[#@] sourceMappingURL=.*$", re.M)
+
+
+def bundle_kind(name):
+    return "css" if name.endswith(".css") else "js"
+
+
+def find_source(path):
+    found = finders.find(path)
+    if not found:
+        raise FileNotFoundError(f"No se encontró el estático '{path}'.")
+    return found
+
+
+def rewrite_css_urls(css, source_path, bundle_path):
+    """url(../fonts/x.woff) de source_path -> ruta relativa desde bundle_path."""
+    source_dir = posixpath.dirname(source_path)
+    bundle_dir = posixpath.dirname(bundle_path)
+
+    def replace(match):
+        quote, url = match.groups()
+        if not url or url.startswith(("data:", "#", "/", "http:", "https:")):
+            return match.group(0)
+        # ?v=4.7#iefix se conserva tal cual
+        split = re.search(r"[?#]", url)
+        path, suffix = (url[:split.start()], url[split.start():]) if split else (url, "")
+        target = posixpath.normpath(posixpath.join(source_dir, path))
+        return f"url({quote}{posixpath.relpath(target, bundle_dir)}{suffix}{quote})"
+
+    return CSS_URL.sub(replace, css)
+
+
+def minify_css(css):
+    if rcssmin is not None:
+        return rcssmin.cssmin(css)
+    parts, last = [], 0
+    for match in CSS_TOKEN.finditer(css):
+        parts.append(compact_css(css[last:match.start()]))
+        token = match.group(0)
+        # Comentarios fuera; se conservan los de licencia (/*!)
+        if not token.startswith("/*") or token.startswith("/*!"):
+            parts.append(token)
+        last = match.end()
+    parts.append(compact_css(css[last:]))
+    return "".join(parts).strip()
+
+
+def compact_css(text):
+    return CSS_PUNCTUATION.sub(r"\1", re.sub(r"\s+", " ", text))
+
+
+def minify_js(js):
+    return rjsmin.jsmin(js) if rjsmin is not None else js.strip()
+
+
+def build_bundle(name, sources):
+    """Contenido del paquete 'name' (p. ej. 'base.css') a partir de sus archivos fuente."""
+    bundle_path = f"{BUNDLE_DIR}/{name}"
+    chunks = []
+    for source in sources:
+        with open(find_source(source), encoding="utf-8") as fh:
+            text = SOURCE_MAP.sub("", fh.read())
+        if bundle_kind(name) == "css":
+            # @charset solo vale al inicio del archivo: uno para todo el paquete
+            text = CSS_CHARSET.sub("", text)
+            chunks.append(minify_css(rewrite_css_urls(text, source, bundle_path)))
+        else:
+            # ';' por si un archivo no termina su última sentencia
+            chunks.append(minify_js(text).rstrip().rstrip(";") + ";")
+    header = ['@charset "UTF-8";'] if bundle_kind(name) == "css" else []
+    return "\n".join(header + chunks) + "\n"
+
+
+def compress(path):
+    """Escribe path.gz (y path.br con brotli); devuelve {extensión: bytes}."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    sizes = {}
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(f"{path}.gz", "wb") as fh:
+        fh.write(gz)
+    sizes["gz"] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        with open(f"{path}.br", "wb") as fh:
+            fh.write(br)
+        sizes["br"] = len(br)
+    return sizes
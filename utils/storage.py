@@ -0,0 +1,123 @@
+# utils/storage.py
+# Código en inglés; comentarios en español
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.apps import apps
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+
+# <upload_to>/ab/<sha256>.<ext>: el contenido nunca cambia bajo ese nombre
+CONTENT_NAME = re.compile(r"(?:^|/)([0-9a-f]{2})/\1[0-9a-f]{62}(?:\.[A-Za-z0-9]+)?$")
+TEMP_PREFIX = ".upload-"
+
+
+class StaticStorage(ManifestStaticFilesStorage):
+    """
+    Nombres con hash (staticfiles.json) tolerante a lo que el vendor no trae:
+    - referencias en CSS/JS a archivos inexistentes (p. ej. *.map) se dejan sin hash;
+    - sin collectstatic (tests, desarrollo) {% static %} devuelve el nombre original.
+    """
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            if content is not None:
+                raise
+            return name
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_NAME.search(name))
+
+
+def file_fields(storage_class=None):
+    """(modelo, nombre del campo) de cada FileField/ImageField concreto, opcionalmente por storage."""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField) and (storage_class is None or isinstance(field.storage, storage_class)):
+                yield model, field.name
+
+
+def referenced_names(storage_class=None):
+    """Nombres de archivo guardados en la base de datos (todas las filas de todos los FileField)."""
+    names = set()
+    for model, field in file_fields(storage_class):
+        names.update(model._base_manager.exclude(**{field: ""}).values_list(field, flat=True).distinct().iterator())
+    return names
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    MEDIA_ROOT con nombres por contenido: '<upload_to>/ab/<sha256>.<ext>'.
+    - El hash se calcula mientras el archivo se escribe a un temporal del mismo directorio;
+      al terminar se renombra (os.replace, atómico) o se descarta si el blob ya existe.
+    - Dos filas con la misma imagen comparten archivo; el conteo de referencias es el número de
+      filas que lo nombran (reference_count), así no hay un contador aparte que se desincronice.
+    - delete() no borra un blob que otra fila sigue usando; los huérfanos (imagen reemplazada,
+      formulario que falló después de guardar el archivo) los borra 'manage.py gc_media'.
+    - Un nombre por contenido permite 'Cache-Control: immutable' (utils.media.serve).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Un nombre repetido es el mismo contenido: no se agregan sufijos
+        return name
+
+    def content_name(self, name, digest):
+        directory = posixpath.dirname(name.replace("\\", "/"))
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def _save(self, name, content):
+        # Subida ya en disco y con hash (utils.uploads.StreamingUploadHandler): solo se mueve
+        if hasattr(content, "temporary_file_path") and getattr(content, "sha256", None):
+            return self.store(content.temporary_file_path(), self.content_name(name, content.sha256))
+        directory = os.path.dirname(self.path(name))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    fh.write(chunk)
+            return self.store(temp_path, self.content_name(name, digest.hexdigest()))
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def store(self, temp_path, name):
+        """Mueve temp_path a name salvo que el blob ya exista (mismo hash, mismo contenido)."""
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            try:
+                # Blob huérfano que vuelve a usarse: mtime nuevo para que gc_media respete el periodo
+                # de gracia hasta que la fila se confirme
+                os.utime(full_path)
+                return name
+            except FileNotFoundError:
+                # gc_media lo acaba de borrar: se guarda esta copia
+                pass
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # file_move_safe: rename si es el mismo sistema de archivos, copia si no (FILE_UPLOAD_TEMP_DIR)
+        file_move_safe(temp_path, full_path, allow_overwrite=True)
+        os.chmod(full_path, self.file_permissions_mode or 0o644)
+        return name
+
+    def reference_count(self, name):
+        return sum(
+            model._base_manager.filter(**{field: name}).count()
+            for model, field in file_fields(type(self))
+        )
+
+    def delete(self, name):
+        if is_content_addressed(name) and self.reference_count(name):
+            return
+        super().delete(name)
@@ -0,0 +1,29 @@
+# utils/templatetags/bundles.py
+# Código en inglés; comentarios en español
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.html import format_html_join
+
+from utils.static import BUNDLE_DIR, bundle_kind
+
+register = template.Library()
+
+TAGS = {
+    "css": '<link rel="stylesheet" href="{}">',
+    "js": '<script src="{}" defer></script>',
+}
+
+
+def bundle_urls(name):
+    """El paquete con hash si build_static lo generó; si no (o en DEBUG), sus archivos sueltos."""
+    bundled = f"{BUNDLE_DIR}/{name}"
+    if not settings.DEBUG and bundled in getattr(staticfiles_storage, "hashed_files", {}):
+        return [staticfiles_storage.url(bundled)]
+    return [staticfiles_storage.url(source) for source in settings.STATIC_BUNDLES[name]]
+
+
+@register.simple_tag
+def bundle(name):
+    """{% bundle "base.css" %}: <link>/<script defer> de un paquete de settings.STATIC_BUNDLES."""
+    return format_html_join("\n", TAGS[bundle_kind(name)], ((url,) for url in bundle_urls(name)))
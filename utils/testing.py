@@ -0,0 +1,169 @@
+# utils/testing.py
+# Código en inglés; comentarios en español
+"""Utilidades compartidas por los tests: datos de ejemplo y recorrido de URLs."""
+import itertools
+import re
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test import tag
+from django.test.runner import DiscoverRunner
+from django.urls import URLPattern, URLResolver, get_resolver
+
+FIRST_NAMES = [
+    "José", "María", "Ángel", "Sofía", "Iñaki", "Lucía", "Raúl", "Mónica",
+    "Andrés", "Begoña", "Óscar", "Zoé", "Jesús", "Inés", "Nicolás", "Fátima",
+]
+LAST_NAMES = [
+    "Pérez", "Núñez", "Gómez", "Martínez", "Hernández", "López", "Ibáñez", "Sánchez",
+    "Rodríguez", "Díaz", "Álvarez", "Muñoz", "Jiménez", "Gutiérrez", "Ramírez", "Peña",
+]
+CATEGORY_NAMES = [
+    "Inglés", "Computación", "Música", "Matemáticas", "Educación Física",
+    "Diseño Gráfico", "Programación", "Cocina", "Fotografía", "Química",
+]
+SUB_CATEGORY_NAMES = ["Básico", "Intermedio", "Avanzado", "Certificación", "Intensivo"]
+
+
+class TestRunner(DiscoverRunner):
+    """DiscoverRunner que cierra las conexiones LISTEN (utils.listen) antes de borrar la BD de prueba."""
+
+    def teardown_databases(self, old_config, **kwargs):
+        from utils.listen import stop_all
+
+        stop_all()
+        super().teardown_databases(old_config, **kwargs)
+
+
+def postgres_only(test_item):
+    """
+    Marca tests que necesitan PostgreSQL real (índices, extensiones, LISTEN/NOTIFY).
+    Se omiten con DJANGO_TEST_DB=sqlite; se pueden seleccionar con --tag postgres.
+    """
+    skip = unittest.skipUnless(connection.vendor == "postgresql", "Requiere PostgreSQL")
+    return tag("postgres")(skip(test_item))
+
+
+def full_permissions_user(email="admin@aula.mx", password="aula-admin-286", **extra):
+    """Usuario staff (no superusuario) con todos los permisos asignados directamente."""
+    from users.models import CustomUser
+
+    extra.setdefault("first_name", "Adrián")
+    extra.setdefault("last_name", "Gómez")
+    user = CustomUser.objects.create_user(email=email, password=password, is_staff=True, **extra)
+    user.user_permissions.set(Permission.objects.all())
+    return user
+
+
+def seed_sample_data(employees=12, groups=5, categories=6, sub_per_category=3, students=10, enrollments=30):
+    """
+    Crea un conjunto de datos realista (nombres con acentos) para tests de vistas.
+    Devuelve un dict con una instancia de cada tipo y las cantidades creadas.
+    """
+    from employees.models import Employee
+    from enrollments.models import Enrollment
+    from modalities.models import Category, SubCategory
+    from students.models import Student
+    from users.models import CustomUser
+
+    names = itertools.cycle(itertools.product(FIRST_NAMES, LAST_NAMES))
+    perms = list(Permission.objects.filter(content_type__app_label__in=["employees", "modalities", "students"]))
+
+    group_objs = []
+    for i in range(groups):
+        group = Group.objects.create(name=f"Grupo {CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i}")
+        group.permissions.set(perms[i::groups] or perms)
+        group_objs.append(group)
+
+    employee_objs = []
+    for i in range(employees):
+        first, last = next(names)
+        user = CustomUser.objects.create_user(
+            email=f"empleado{i}@aula.mx", password=None,
+            first_name=first, last_name=last, is_active=i % 5 != 0,
+        )
+        employee_objs.append(Employee.objects.create(
+            user=user,
+            address=f"Calle Peñón #{i}, Col. Jardín, Mérida",
+            birthdate=date(1980 + i % 20, 1 + i % 12, 1 + i % 28),
+            commission_general_public=i % 2 == 0,
+            phone_number=f"999{i:07d}",
+            phone_number_2=f"998{i:07d}" if i % 3 else None,
+            picture=f"employees/empleado{i}.jpg",
+            reference=f"R{i:05d}",
+        ))
+
+    category_objs = [
+        Category.objects.create(name=CATEGORY_NAMES[i % len(CATEGORY_NAMES)] + (f" {i}" if i >= len(CATEGORY_NAMES) else ""),
+                                is_active=i % 4 != 3)
+        for i in range(categories)
+    ]
+    sub_category_objs = []
+    for category in category_objs:
+        for j in range(sub_per_category):
+            price = Decimal(500 + 100 * j)
+            sub_category_objs.append(SubCategory.objects.create(
+                category=category,
+                name=f"{category.name} {SUB_CATEGORY_NAMES[j % len(SUB_CATEGORY_NAMES)]}",
+                price=price, registration_price=Decimal("250.00"), tuition_price=price,
+                certification_price=Decimal("800.00"), exam_price=Decimal("300.00"),
+                opening_commission_amount=Decimal("100.00"), closing_commission_amount=Decimal("50.00"),
+                new_opening_commission_amount=Decimal("150.00"), threshold_sales_amount=10,
+                commission_amount_general_public=Decimal("75.00"),
+                is_active=j % 3 != 2, is_general_public=j % 2 == 0,
+            ))
+
+    student_objs = []
+    for i in range(students):
+        first, last = next(names)
+        user = CustomUser.objects.create_user(
+            email=f"alumno{i}@aula.mx", password=None, first_name=first, last_name=last,
+        )
+        student_objs.append(Student.objects.create(
+            user=user, address=f"Av. Cañada #{i}, Mérida", birthdate=date(2000 + i % 10, 1 + i % 12, 1 + i % 28),
+            phone_number=f"997{i:07d}", picture=f"students/alumno{i}.jpg",
+        ))
+
+    if employee_objs and student_objs and sub_category_objs:
+        Enrollment.objects.bulk_create([
+            Enrollment(
+                sub_category=sub_category_objs[i % len(sub_category_objs)],
+                student=student_objs[i % len(student_objs)],
+                registered_by=employee_objs[i % len(employee_objs)],
+                reference=f"I{i:05d}",
+                price=sub_category_objs[i % len(sub_category_objs)].price,
+            )
+            for i in range(enrollments)
+        ])
+
+    return {
+        "group": group_objs[0] if group_objs else None,
+        "employee": employee_objs[0] if employee_objs else None,
+        "category": category_objs[0] if category_objs else None,
+        "sub_category": sub_category_objs[0] if sub_category_objs else None,
+        "student": student_objs[0] if student_objs else None,
+    }
+
+
+def iter_named_urls(resolver=None, namespace=None):
+    """Recorre el URLconf y produce (nombre_completo, patrón) de cada URL con nombre."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            ns = pattern.namespace
+            child_ns = f"{namespace}:{ns}" if namespace and ns else (ns or namespace)
+            yield from iter_named_urls(pattern, child_ns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield (f"{namespace}:{pattern.name}" if namespace else pattern.name), pattern
+
+
+_SERVER_TIMING_TPL = re.compile(r"(?:^|,\s*)tpl;dur=([\d.]+)")
+
+
+def template_time_ms(response):
+    """Tiempo de render de plantillas reportado en Server-Timing (0 si no hubo)."""
+    match = _SERVER_TIMING_TPL.search(response.get("Server-Timing", ""))
+    return float(match.group(1)) if match else 0.0
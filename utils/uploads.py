@@ -0,0 +1,181 @@
+"""
+Subidas de imágenes sin cargarlas en memoria (vistas con utils.mixins.crud.StreamingUploadMixin).
+
+- Cada trozo va directo a un archivo temporal mientras se calcula su SHA-256
+  (utils.storage.ContentAddressedStorage lo mueve sin volver a leerlo).
+- El tipo se detecta por los primeros bytes (no por la extensión ni el Content-Type del cliente)
+  y las dimensiones por la cabecera de la imagen, sin decodificarla.
+- Límites (UPLOAD_MAX_BYTES, UPLOAD_MAX_PIXELS, UPLOAD_ALLOWED_TYPES):
+  - si el Content-Length de la petición ya los excede se corta la conexión sin leer el archivo
+    (los campos que vienen después del archivo se pierden);
+  - si se excede al recibir (tipo, píxeles o tamaño real) se descarta el resto del archivo
+    y el formulario conserva los demás campos.
+  El motivo queda en request.upload_errors ({campo: mensaje}); UploadErrorsFormMixin lo muestra.
+"""
+import hashlib
+import os
+import struct
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopUpload
+from django.template.defaultfilters import filesizeformat
+
+# (firma, desplazamiento, tipo, extensión)
+SIGNATURES = (
+    (b"\xff\xd8\xff", 0, "image/jpeg", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", 0, "image/png", ".png"),
+    (b"GIF87a", 0, "image/gif", ".gif"),
+    (b"GIF89a", 0, "image/gif", ".gif"),
+    (b"WEBP", 8, "image/webp", ".webp"),
+)
+# Cabeceras JPEG con EXIF/miniaturas pueden empujar el SOF hasta aquí
+HEAD_LIMIT = 256 * 1024
+# Multipart: límites, cabeceras de cada parte y los campos de texto del formulario
+FORM_OVERHEAD = 64 * 1024
+INVALID_TYPE = "El archivo no es una imagen válida (JPEG, PNG, GIF o WebP)."
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def sniff_type(head):
+    """(tipo, extensión) por la firma de los primeros bytes; None si no es una imagen conocida."""
+    for signature, offset, content_type, extension in SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if content_type == "image/webp" and head[:4] != b"RIFF":
+                continue
+            return content_type, extension
+    return None
+
+
+def image_size(head, content_type):
+    """(ancho, alto) leído de la cabecera; None si todavía no hay bytes suficientes."""
+    try:
+        if content_type == "image/png":
+            return struct.unpack(">II", head[16:24]) if len(head) >= 24 else None
+        if content_type == "image/gif":
+            return struct.unpack("<HH", head[6:10]) if len(head) >= 10 else None
+        if content_type == "image/webp":
+            return webp_size(head)
+        if content_type == "image/jpeg":
+            return jpeg_size(head)
+    except struct.error:
+        return None
+    return None
+
+
+def webp_size(head):
+    if len(head) < 30:
+        return None
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+
+def jpeg_size(head):
+    """Recorre los segmentos hasta el SOF (Start Of Frame)."""
+    position = 2
+    while position + 9 <= len(head):
+        if head[position] != 0xFF:
+            return None
+        marker = head[position + 1]
+        if marker == 0xFF:
+            position += 1
+            continue
+        if marker in JPEG_SOF:
+            height, width = struct.unpack(">HH", head[position + 5:position + 9])
+            return width, height
+        (length,) = struct.unpack(">H", head[position + 2:position + 4])
+        position += 2 + length
+    return None
+
+
+class StreamingUploadHandler(FileUploadHandler):
+    """Reemplaza a MemoryFileUploadHandler/TemporaryFileUploadHandler: todo va a disco y se valida al vuelo."""
+
+    request_length = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # new_file() usa content_length para el de cada parte
+        self.request_length = content_length
+        if not hasattr(self.request, "upload_errors"):
+            self.request.upload_errors = {}
+
+    def reject(self, message, stop=False):
+        self.request.upload_errors[self.field_name] = message
+        if stop:
+            raise StopUpload(connection_reset=True)
+        raise SkipFile
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.max_bytes = settings.UPLOAD_MAX_BYTES
+        # Antes de validar: el parser cierra (y borra) self.file al descartar
+        self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.digest = hashlib.sha256()
+        self.head = bytearray()
+        self.sniffed = None
+        self.dimensions = None
+        # El cuerpo completo ya no cabe: se responde sin leer el archivo
+        if (self.content_length or 0) > self.max_bytes or (self.request_length or 0) > self.max_bytes + FORM_OVERHEAD:
+            self.reject(self.too_big_message(), stop=True)
+
+    def too_big_message(self):
+        return f"El archivo excede el tamaño máximo de {filesizeformat(self.max_bytes)}."
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_bytes:
+            self.reject(self.too_big_message())
+        if self.dimensions is None:
+            self.inspect(raw_data)
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def inspect(self, raw_data):
+        """Tipo con los primeros bytes; dimensiones en cuanto la cabecera las incluya."""
+        self.head += raw_data[:HEAD_LIMIT - len(self.head)]
+        if self.sniffed is None and len(self.head) >= 16:
+            self.sniffed = sniff_type(bytes(self.head[:16]))
+            if self.sniffed is None or self.sniffed[0] not in settings.UPLOAD_ALLOWED_TYPES:
+                self.reject(INVALID_TYPE)
+        if self.sniffed is None:
+            return
+        self.dimensions = image_size(bytes(self.head), self.sniffed[0])
+        if self.dimensions is None:
+            if len(self.head) >= HEAD_LIMIT:
+                self.reject("No se pudo leer el tamaño de la imagen.")
+            return
+        width, height = self.dimensions
+        if width * height > settings.UPLOAD_MAX_PIXELS:
+            self.reject(f"La imagen ({width}×{height}) excede el máximo de "
+                        f"{settings.UPLOAD_MAX_PIXELS / 1_000_000:g} megapíxeles.")
+        self.head = None
+
+    def file_complete(self, file_size):
+        if self.dimensions is None:
+            # Archivo más corto que su propia cabecera; aquí SkipFile ya no aplica
+            self.file.close()
+            self.request.upload_errors[self.field_name] = (
+                "No se pudo leer el tamaño de la imagen." if self.sniffed else INVALID_TYPE
+            )
+            return None
+        content_type, extension = self.sniffed
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.content_type = content_type
+        # La extensión sigue al contenido: el storage la usa en el nombre y MediaView en el Content-Type
+        self.file.name = os.path.splitext(self.file_name)[0] + extension
+        self.file.sha256 = self.digest.hexdigest()
+        self.file.image_size = self.dimensions
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self.file.close()
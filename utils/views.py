@@ -0,0 +1,46 @@
+import posixpath
+
+from django.conf import settings
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+from django.views import View
+
+from utils import media
+from utils.metrics import registry
+
+
+class MetricsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """
+    Métricas por ruta en formato de texto de Prometheus (solo staff).
+    Cada proceso expone sus propios contadores.
+    """
+    raise_exception = True
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            registry.render_prometheus(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+class MediaView(LoginRequiredMixin, View):
+    """
+    Archivos subidos (MEDIA_URL) solo para usuarios con el permiso de su carpeta
+    (settings.MEDIA_PERMISSIONS); la entrega la hace utils.media.serve.
+    """
+    raise_exception = True
+
+    def get(self, request, path):
+        # 'employees/../students/x.jpg' debe pedir el permiso de students
+        path = posixpath.normpath(path).lstrip("/")
+        folder = path.split("/", 1)[0]
+        permission = settings.MEDIA_PERMISSIONS.get(folder)
+        if permission is None:
+            raise Http404
+        if not request.user.has_perm(permission):
+            raise PermissionDenied
+        return media.serve(request, media.resolve(path))